@@ -23,6 +23,29 @@ let MOVEMENT_META = [];
 let MODULE_IMPORTS = [];
 let VARS_BY_REF = new Map(); // key: 'ns.name' or 'ns.name@vX' -> [varNames]
 let MODULE_PATHS = new Map(); // key: 'ns.name' -> filepath
+let LANGUAGE_CLIENT = null; // `wodc lsp` client when wodcraft.languageServer is enabled
+
+function startLanguageServer(context) {
+  const cfg = vscode.workspace.getConfiguration('wodcraft');
+  if (!cfg.get('languageServer', false)) return null;
+  let lc;
+  try {
+    lc = require('vscode-languageclient/node');
+  } catch (e) {
+    vscode.window.showWarningMessage('WODCraft: vscode-languageclient is not installed; falling back to CLI validation.');
+    return null;
+  }
+  const { cliExec, modulesPath, catalog } = getConfig();
+  const serverOptions = { command: cliExec, args: ['lsp', '--modules-path', modulesPath] };
+  const clientOptions = {
+    documentSelector: [{ language: 'wodcraft' }],
+    initializationOptions: { modulesPath, catalogPath: catalog || undefined },
+  };
+  const client = new lc.LanguageClient('wodcraft', 'WODCraft Language Server', serverOptions, clientOptions);
+  client.start();
+  context.subscriptions.push({ dispose: () => client.stop() });
+  return client;
+}
 
 function loadCatalog(catalogPath) {
   try {
@@ -124,6 +147,8 @@ function findRanges(doc, issue) {
 }
 
 function activate(context) {
+  // Diagnostics and movement/module completion come from `wodc lsp` when it runs
+  LANGUAGE_CLIENT = startLanguageServer(context);
   const collection = vscode.languages.createDiagnosticCollection('wodcraft');
   context.subscriptions.push(collection);
 
@@ -134,7 +159,7 @@ function activate(context) {
   };
 
   async function validate(doc) {
-    if (!doc || doc.languageId !== 'wodcraft') return;
+    if (!doc || doc.languageId !== 'wodcraft' || LANGUAGE_CLIENT) return;
     const cfg = getConfig();
     // Load catalog suggestions if available
     if (cfg.catalog && cfg.catalog !== LAST_CATALOG) loadCatalog(cfg.catalog);
@@ -340,6 +365,7 @@ function activate(context) {
         }
       } catch {}
       // Combine keyword + modules + movements
+      if (LANGUAGE_CLIENT) return [...keywordItems, ...contextItems];
       return [...keywordItems, ...moduleItems, ...contextItems, ...movementItems];
     }
   }, ['.', '@', '"', ':']);
@@ -488,6 +514,8 @@ function getVarsForRef(refId) {
   return [];
 }
 
-function deactivate() {}
+function deactivate() {
+  return LANGUAGE_CLIENT ? LANGUAGE_CLIENT.stop() : undefined;
+}
 
 module.exports = { activate, deactivate };
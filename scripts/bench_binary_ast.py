@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Binary AST vs JSON loading benchmarks.
+
+Usage:
+  python scripts/bench_binary_ast.py [--corpus '**/*.wod'] [--copies 1,50] [--repeat 10]
+
+Builds one bundle document holding ``--copies`` x every parseable corpus file
+(module ids suffixed so each copy stays addressable) and reports, per size:
+  size            JSON (indent=2 and compact) vs binary bytes
+  full load       json.loads of the compact text (orjson.loads when installed)
+                  vs binary_ast.loads_ast of the bytes
+  one module      load the whole JSON and pick the module vs
+                  ASTReader(path).module(id) (mmap, decodes that module only)
+Best of ``--repeat`` runs.
+"""
+import argparse
+import copy
+import glob
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from wodcraft.binary_ast import ASTReader, dump_ast, dumps_ast, loads_ast  # noqa: E402
+from wodcraft.core import WODCraftError, parse_vnext  # noqa: E402
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    orjson = None
+
+
+def load_asts(pattern: str):
+    asts = []
+    for name in sorted(glob.glob(str(ROOT / pattern), recursive=True)):
+        try:
+            asts.append(parse_vnext(Path(name).read_text(encoding="utf-8")))
+        except WODCraftError:
+            continue
+    return asts
+
+
+def bundle(asts, copies: int):
+    document = {"modules": [], "sessions": []}
+    for k in range(copies):
+        for ast in asts:
+            for module in ast.get("modules", []):
+                document["modules"].append(dict(copy.deepcopy(module), id=f"{module['id']}.c{k}"))
+            document["sessions"].extend(copy.deepcopy(ast.get("sessions", [])))
+    return document
+
+
+def best(fn, repeat: int) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = min(elapsed, time.perf_counter() - started)
+    return elapsed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="WODCraft binary AST benchmarks")
+    ap.add_argument("--corpus", default="**/*.wod", help="Glob relative to the repository root")
+    ap.add_argument("--copies", default="1,50", help="Comma-separated bundle sizes (corpus copies)")
+    ap.add_argument("--repeat", type=int, default=10, help="Timing repetitions (best is kept)")
+    args = ap.parse_args(argv)
+
+    asts = load_asts(args.corpus)
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in (int(n) for n in args.copies.split(",")):
+            document = bundle(asts, copies)
+            pretty = json.dumps(document, indent=2)
+            compact = json.dumps(document, separators=(",", ":"))
+            binary = dumps_ast(document)
+            path = dump_ast(document, Path(tmp) / "bundle.wodast")
+            assert loads_ast(binary) == document
+            target = document["modules"][len(document["modules"]) // 2]["id"]
+
+            def json_module():
+                loaded = json.loads(compact)
+                return next(m for m in loaded["modules"] if m["id"] == target)
+
+            def binary_module():
+                with ASTReader(path) as reader:
+                    return reader.module(target)
+
+            rows = {"json.loads": lambda: json.loads(compact)}
+            if orjson is not None:
+                rows["orjson.loads"] = lambda: orjson.loads(compact)
+            rows["loads_ast"] = lambda: loads_ast(binary)
+            rows["json module"] = json_module
+            rows["mmap module"] = binary_module
+            times = {name: best(fn, args.repeat) for name, fn in rows.items()}
+
+            print(f"\nbundle: {len(document['modules'])} modules, {len(document['sessions'])} sessions "
+                  f"({copies} x {len(asts)} files)")
+            print(f"size KiB   json indent2 {len(pretty) / 1024:.1f}   json compact {len(compact) / 1024:.1f}"
+                  f"   binary {len(binary) / 1024:.1f} ({len(binary) / len(compact):.2f}x compact)")
+            base = times["json.loads"]
+            for name, elapsed in times.items():
+                print(f"{name:<14}{elapsed * 1000:>10.3f} ms{base / elapsed:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+BundleResolver (.wodpack) vs FileSystemResolver (modules directory) benchmarks.
+
+Usage:
+  python scripts/bench_bundle.py [--modules 5000] [--sessions 500] [--repeat 3]
+
+Generates a tree of ``--modules`` module files (four namespaces, about a
+fifth of the names with a v1 and a v2 file block), packs it with
+``build_bundle`` and reports, per resolver (best of ``--repeat`` runs, each
+with a fresh resolver):
+  open+first      construct the resolver and resolve one module
+                  (the directory resolver builds its index here)
+  resolve all     resolve every module once (after open)
+  resolve warm    resolve every module again (served from memory)
+  list            list every module
+  compile         compile ``--sessions`` sessions importing random modules
+                  with a fresh SessionCompiler (bundle ASTs are pre-parsed)
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from wodcraft.bundle import BundleResolver, build_bundle  # noqa: E402
+from wodcraft.core import FileSystemResolver, ModuleRef, SessionCompiler, parse_vnext  # noqa: E402
+
+NAMESPACES = ("wod", "warmup", "strength", "skill")
+MOVEMENTS = ("Thrusters", "Pull_ups", "Burpees", "Air_Squats", "Push_ups", "Box_Jumps", "Wall_Balls")
+
+
+def module_block(namespace: str, name: str, version: str, rng: random.Random) -> str:
+    lines = "\n".join(f"    {rng.randint(5, 30)} {rng.choice(MOVEMENTS)}" for _ in range(rng.randint(2, 6)))
+    if namespace == "wod":
+        return f"module wod.{name} {version} {{\n  wod AMRAP {rng.randint(5, 20)}:00 {{\n{lines}\n  }}\n}}\n"
+    if namespace == "warmup":
+        return f'module warmup.{name} {version} {{\n  warmup "{name}" {{\n    block "Main" {{\n{lines}\n    }}\n  }}\n}}\n'
+    work = f"sets {rng.randint(3, 6)} reps {rng.randint(1, 8)} @ {rng.randint(60, 85)}%1RM"
+    return f'module {namespace}.{name} {version} {{\n  {namespace} "{name}" {{\n    work {{\n      {work}\n    }}\n    cues {{\n      "Brace"\n    }}\n  }}\n}}\n'
+
+
+def generate_tree(base: Path, count: int, rng: random.Random):
+    refs = []
+    for i in range(count):
+        namespace = NAMESPACES[i % len(NAMESPACES)]
+        name = f"m{i:05d}"
+        directory = base / namespace / f"group{i % 50:02d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        versions = ["v1", "v2"] if i % 5 == 0 else ["v1"]
+        text = "\n".join(module_block(namespace, f"group{i % 50:02d}.{name}", v, rng) for v in versions)
+        (directory / f"{name}.wod").write_text(text, encoding="utf-8")
+        refs.extend((namespace, f"group{i % 50:02d}.{name}", v) for v in versions)
+    return refs
+
+
+def sessions_for(refs, count: int, rng: random.Random):
+    lines = []
+    for i in range(count):
+        namespace, name, version = rng.choice(refs)
+        lines.append(f'session "S{i}" {{ components {{ {namespace} import {namespace}.{name}@{version} }} '
+                     f'scoring {{ wod AMRAP reps }} }}')
+    return parse_vnext("\n".join(lines))["sessions"]
+
+
+def best(fn, repeat: int) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        elapsed = min(elapsed, time.perf_counter() - started)
+    return elapsed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="WODCraft module bundle benchmarks")
+    ap.add_argument("--modules", type=int, default=5000, help="Module files in the generated tree")
+    ap.add_argument("--sessions", type=int, default=500, help="Sessions compiled by the compile row")
+    ap.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is kept)")
+    ap.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = ap.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "modules"
+        refs = generate_tree(base, args.modules, rng)
+        module_refs = [ModuleRef(*ref) for ref in refs]
+        sessions = sessions_for(refs, args.sessions, rng)
+
+        stats = build_bundle(base, Path(tmp) / "modules.wodpack")
+        lean = build_bundle(base, Path(tmp) / "sources.wodpack", asts=False)
+        tree_bytes = sum(p.stat().st_size for p in base.rglob("*.wod"))
+        print(f"tree: {args.modules} files, {len(refs)} module versions, {tree_bytes / 1024:.0f} KiB")
+        print(f"bundle: {stats['bytes'] / 1024:.0f} KiB with ASTs ({stats['build_ms'] / 1000:.1f} s to build), "
+              f"{lean['bytes'] / 1024:.0f} KiB sources only ({lean['build_ms'] / 1000:.1f} s)")
+        if stats["failed"]:
+            print(f"warning: {len(stats['failed'])} modules did not parse")
+
+        factories = {
+            "directory": lambda: FileSystemResolver(base),
+            "bundle": lambda: BundleResolver(Path(tmp) / "modules.wodpack"),
+        }
+        times = {}
+        for label, factory in factories.items():
+            row = {}
+
+            def open_first():
+                factory().resolve(module_refs[0])
+
+            def resolve_all():
+                resolver = factory()
+                started = time.perf_counter()
+                for ref in module_refs:
+                    resolver.resolve(ref)
+                return resolver, time.perf_counter() - started
+
+            row["open+first"] = best(open_first, args.repeat)
+            row["resolve all"] = min(resolve_all()[1] for _ in range(args.repeat))
+            warm, _ = resolve_all()
+            row["resolve warm"] = best(lambda: [warm.resolve(ref) for ref in module_refs], args.repeat)
+            row["list"] = best(warm.list, args.repeat)
+            row["compile"] = best(lambda: SessionCompiler(factory(), cache_size=args.sessions)
+                                  .compile_many(sessions), args.repeat)
+            times[label] = row
+
+        print(f"\n{'':<14}{'directory':>14}{'bundle':>14}{'speedup':>10}")
+        for name in times["directory"]:
+            fs, pack = times["directory"][name], times["bundle"][name]
+            print(f"{name:<14}{fs * 1000:>11.2f} ms{pack * 1000:>11.2f} ms{fs / pack:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+JSON output benchmarks on large compiled sessions.
+
+Usage:
+  python scripts/bench_output.py [--events 5000,20000] [--repeat 5]
+
+Compares, per session size (realized events), writing the compiled session
+to /dev/null as:
+  indent2-print   print(json.dumps(doc, indent=2))  (previous behaviour)
+  indent2-stream  jsonio.write_json  (same bytes, encoded in chunks)
+  compact-stdlib  jsonio.write_json(compact=True) with WODCRAFT_JSON=stdlib
+  compact-orjson  same with orjson (skipped when not installed)
+  jsonl           jsonio.write_jsonl(iter_records(doc)), selected backend
+Reports best wall time and tracemalloc peak.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from wodcraft import jsonio  # noqa: E402
+from wodcraft.core import FileSystemResolver, SessionCompiler, parse_vnext  # noqa: E402
+
+
+def session_source(events: int) -> str:
+    lines = [
+        f'    {{ at: "{i // 60:02d}:{i % 60:02d}", athlete: "ath#{i % 4}", movement: "row_cal", value: {i % 20} }}'
+        for i in range(events)
+    ]
+    return (
+        'session "Large" {\n  components {}\n  scoring { wod AMRAP rounds+reps }\n'
+        '  realized {\n    scoring: "amrap_reps",\n    source: "self",\n    unit: "event",\n'
+        '    events: [\n' + ",\n".join(lines) + "\n    ]\n  }\n}\n"
+    )
+
+
+def compiled_session(events: int):
+    ast = parse_vnext(session_source(events))
+    compiler = SessionCompiler(FileSystemResolver(ROOT / "modules"))
+    return compiler.compile_session(ast["sessions"][0])
+
+
+def measure(fn, repeat: int):
+    best = float("inf")
+    with open(os.devnull, "w", encoding="utf-8") as out:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn(out)
+            best = min(best, time.perf_counter() - started)
+        tracemalloc.start()
+        try:
+            fn(out)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak
+
+
+def with_backend(name, fn):
+    def run(out):
+        previous = os.environ.get(jsonio.JSON_BACKEND_ENV)
+        os.environ[jsonio.JSON_BACKEND_ENV] = name
+        try:
+            fn(out)
+        finally:
+            if previous is None:
+                os.environ.pop(jsonio.JSON_BACKEND_ENV, None)
+            else:
+                os.environ[jsonio.JSON_BACKEND_ENV] = previous
+    return run
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="WODCraft JSON output benchmarks")
+    ap.add_argument("--events", default="5000,20000", help="Comma-separated realized event counts")
+    ap.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is kept)")
+    args = ap.parse_args(argv)
+
+    modes = {
+        "indent2-print": lambda out: print(json.dumps(doc, indent=2), file=out),
+        "indent2-stream": lambda out: jsonio.write_json(doc, out),
+        "compact-stdlib": with_backend("stdlib", lambda out: jsonio.write_json(doc, out, compact=True)),
+    }
+    if jsonio._orjson is not None:
+        modes["compact-orjson"] = with_backend("orjson", lambda out: jsonio.write_json(doc, out, compact=True))
+    modes["jsonl"] = lambda out: jsonio.write_jsonl(jsonio.iter_records(doc), out)
+
+    print(f"backend: {jsonio.backend_name()}")
+    for events in (int(n) for n in args.events.split(",")):
+        doc = compiled_session(events)
+        rows = {name: measure(fn, args.repeat) for name, fn in modes.items()}
+        base_time, base_peak = rows["indent2-print"]
+        print(f"\n{events} realized events")
+        print(f"{'mode':<16}{'time':>12}{'speedup':>10}{'peak KiB':>12}{'vs base':>10}")
+        for name, (elapsed, peak) in rows.items():
+            print(f"{name:<16}{elapsed * 1000:>9.2f} ms{base_time / elapsed:>9.2f}x"
+                  f"{peak / 1024:>12.1f}{peak / base_peak:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Parser benchmarks over a corpus of .wod files.
+
+Usage:
+  python scripts/bench_parser.py passes [--corpus 'examples/wods/**/*.wod'] [--repeat 20] [--scale 10]
+  python scripts/bench_parser.py ast-memory [--corpus 'examples/wods/**/*.wod'] [--copies 200]
+  python scripts/bench_parser.py ast-size [--corpus '**/*.wod'] [--repeat 20]
+  python scripts/bench_parser.py incremental [--corpus 'examples/wods/**/*.wod'] [--repeat 20]
+  python scripts/bench_parser.py quick-check [--corpus '**/*.wod'] [--repeat 20] [--seed 0]
+  python scripts/bench_parser.py grammar [--corpus 'examples/wods/**/*.wod'] [--repeat 5]
+
+Subcommands:
+  passes   Two-pass (tree + ToASTvNext) vs single-pass (inline LALR transformer):
+           wall time per corpus pass and tracemalloc peak memory.
+  ast-memory
+           Memory retained by an in-memory library of ``--copies`` x corpus
+           ASTs: nested dicts without string interning (no-intern), nested
+           dicts, the lean dict AST and the slotted typed AST (typed_ast).
+           ``--seed-catalog`` pre-loads movement names before the run.
+  ast-size Serialized size and json.dumps time (pretty and compact) of the
+           full vs the lean (``parse_vnext(lean=True)``) AST.
+  incremental
+           One document made of the whole corpus; an edit inside one block is
+           re-parsed in full (parse_vnext) vs by an IncrementalParser that
+           only re-parses the changed block.
+  quick-check
+           ``quick_check`` vs the full parse on the valid corpus and on an
+           invalid corpus derived from it (chat answers wrapping the source,
+           truncated files, stray characters and braces): time per document,
+           share of invalid documents rejected early, and the cost of
+           ``validate --fast`` (pre-check, then full parse) on each corpus.
+  grammar  The hot grammar (GRAMMAR_VNEXT) vs the same grammar with the legacy
+           rules still inlined: LALR build time from source, defined and
+           compiled rules/terminals, parse states and parse throughput; plus
+           the one-off cost of building the on-demand legacy parser.
+"""
+import argparse
+import gc
+import glob
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from lark import Lark  # noqa: E402
+
+from wodcraft.core import GRAMMAR_LEGACY, GRAMMAR_VNEXT, STRING_TABLE, WODCraftError, parse_vnext  # noqa: E402
+from wodcraft.incremental import IncrementalParser, split_blocks  # noqa: E402
+from wodcraft.quickcheck import quick_check  # noqa: E402
+from wodcraft.typed_ast import to_typed  # noqa: E402
+
+DEFAULT_CORPUS = "examples/wods/**/*.wod"
+
+
+def load_corpus(pattern: str):
+    """Return the texts of every corpus file that parses cleanly."""
+    texts = []
+    for name in sorted(glob.glob(str(ROOT / pattern), recursive=True)):
+        text = Path(name).read_text(encoding="utf-8")
+        try:
+            parse_vnext(text)
+        except WODCraftError:
+            continue
+        texts.append(text)
+    if not texts:
+        raise SystemExit(f"No parseable files match {pattern}")
+    return texts
+
+
+def time_pass(fn, texts, repeat: int) -> float:
+    """Best wall time (seconds) of ``repeat`` runs of fn over the whole corpus."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def peak_memory(fn, text: str) -> int:
+    """tracemalloc peak (bytes) while parsing ``text``."""
+    tracemalloc.start()
+    try:
+        fn(text)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def report(rows, baseline: str):
+    base_time = rows[baseline]["time"]
+    base_peak = rows[baseline]["peak"]
+    print(f"{'mode':<14}{'time/pass':>14}{'speedup':>10}{'peak KiB':>12}{'vs base':>10}")
+    for name, row in rows.items():
+        print(
+            f"{name:<14}{row['time'] * 1000:>11.2f} ms{base_time / row['time']:>9.2f}x"
+            f"{row['peak'] / 1024:>12.1f}{row['peak'] / base_peak:>9.2f}x"
+        )
+
+
+def bench_passes(args):
+    texts = load_corpus(args.corpus)
+    modes = {
+        "two-pass": lambda text: parse_vnext(text),
+        "single-pass": lambda text: parse_vnext(text, single_pass=True),
+    }
+    for fn in modes.values():  # warm the parser registry
+        fn(texts[0])
+    # Peak memory is measured on the whole corpus concatenated (``--scale`` times) into one document
+    document = "\n".join(texts * args.scale)
+    rows = {
+        name: {"time": time_pass(fn, texts, args.repeat), "peak": peak_memory(fn, document)}
+        for name, fn in modes.items()
+    }
+    print(f"corpus: {len(texts)} files ({args.corpus}), best of {args.repeat}; "
+          f"peak over one {len(document) // 1024} KiB document")
+    report(rows, "two-pass")
+    return 0
+
+
+def retained_memory(build, texts, copies: int):
+    """(bytes retained by the built library, build seconds) per tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        library = [build(text) for _ in range(copies) for text in texts]
+        elapsed = time.perf_counter() - started
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del library
+    return retained, elapsed
+
+
+def without_interning(text: str):
+    """parse_vnext with the shared string table temporarily disabled."""
+    max_size, STRING_TABLE.max_size = STRING_TABLE.max_size, 0
+    try:
+        return parse_vnext(text)
+    finally:
+        STRING_TABLE.max_size = max_size
+
+
+def bench_ast_memory(args):
+    texts = load_corpus(args.corpus)
+    STRING_TABLE.clear()
+    if args.seed_catalog:
+        STRING_TABLE.seed_from_catalog()
+    modes = {
+        "no-intern": without_interning,
+        "dict": lambda text: parse_vnext(text),
+        "lean": lambda text: parse_vnext(text, lean=True),
+        "typed": lambda text: to_typed(parse_vnext(text)),
+    }
+    documents = len(texts) * args.copies
+    rows = {name: retained_memory(fn, texts, args.copies) for name, fn in modes.items()}
+    base = rows["no-intern"][0]
+    print(f"library: {documents} ASTs ({len(texts)} files x {args.copies})")
+    print(f"{'mode':<10}{'retained MiB':>14}{'bytes/AST':>12}{'vs base':>10}{'build s':>10}")
+    for name, (retained, elapsed) in rows.items():
+        print(f"{name:<10}{retained / 2**20:>14.2f}{retained / documents:>12.0f}{retained / base:>9.2f}x{elapsed:>10.2f}")
+    print(f"interning: {STRING_TABLE.stats()}")
+    return 0
+
+
+def bench_ast_size(args):
+    texts = load_corpus(args.corpus)
+    dumps = {
+        "pretty": lambda ast: json.dumps(ast, indent=2),
+        "compact": lambda ast: json.dumps(ast, separators=(",", ":")),
+    }
+    asts = {
+        "full": [parse_vnext(text) for text in texts],
+        "lean": [parse_vnext(text, lean=True) for text in texts],
+    }
+    print(f"corpus: {len(texts)} files ({args.corpus}), best of {args.repeat}")
+    print(f"{'ast':<6}{'format':<9}{'KiB':>10}{'vs full':>9}{'dumps':>12}{'speedup':>9}")
+    for fmt, dump in dumps.items():
+        base_size = base_time = None
+        for name, library in asts.items():
+            size = sum(len(dump(ast)) for ast in library)
+            elapsed = time_pass(dump, library, args.repeat)
+            base_size = base_size or size
+            base_time = base_time or elapsed
+            print(f"{name:<6}{fmt:<9}{size / 1024:>10.1f}{size / base_size:>8.2f}x"
+                  f"{elapsed * 1000:>9.2f} ms{base_time / elapsed:>8.2f}x")
+    return 0
+
+
+def bench_incremental(args):
+    document = "\n\n".join(load_corpus(args.corpus))
+    blocks = split_blocks(document)
+    target = blocks[len(blocks) // 2]
+    digit = next(i for i, c in enumerate(target.text) if c.isdigit())
+    # Two edits of the same block, alternated so every incremental call has one changed block
+    edits = [document[:target.offset + digit] + d + document[target.offset + digit:] for d in "12"]
+    parser = IncrementalParser()
+    parser.parse(document)
+    assert parser.parse(edits[0]) == parse_vnext(edits[0])
+    rows = {"full": parse_vnext, "incremental": parser.parse}
+    print(f"document: {len(blocks)} top-level blocks, {len(document) / 1024:.1f} KiB, "
+          f"edit in block at line {target.line}, best of {args.repeat}")
+    base = None
+    for name, fn in rows.items():
+        elapsed = time_pass(fn, edits, args.repeat) / len(edits)
+        base = base or elapsed
+        print(f"{name:<12}{elapsed * 1000:>9.2f} ms/edit{base / elapsed:>8.2f}x")
+    print(f"incremental: {parser.stats()}")
+    return 0
+
+
+def invalid_corpus(texts, seed: int):
+    """Broken variants of every valid text: chat-wrapped, truncated, and with stray characters."""
+    rng = random.Random(seed)
+    broken = []
+    for text in filter(str.strip, texts):
+        broken.append(f"Sure! Here is the workout you asked for:\n\n```wodcraft\n{text}\n```\nHave fun!")
+        broken.append(text[:rng.randrange(len(text) // 4, len(text) * 3 // 4 + 1)])
+        for junk in ("}", "{", "@@", "#", "'"):
+            i = rng.randrange(len(text))
+            broken.append(text[:i] + junk + text[i:])
+    return [text for text in broken if not _parses(text)]
+
+
+def _parses(text: str) -> bool:
+    try:
+        parse_vnext(text)
+        return True
+    except WODCraftError:
+        return False
+
+
+def bench_quick_check(args):
+    valid = load_corpus(args.corpus)
+    invalid = invalid_corpus(valid, args.seed)
+    fast = lambda text: quick_check(text) is not None or _parses(text)  # noqa: E731
+    quick_check(valid[0])  # build the lexer regex
+    print(f"valid: {len(valid)} files ({args.corpus}), invalid: {len(invalid)} derived, best of {args.repeat}")
+    print(f"{'corpus':<10}{'full parse':>14}{'quick_check':>14}{'--fast':>14}{'rejected':>10}")
+    for name, texts in (("valid", valid), ("invalid", invalid)):
+        rejected = sum(quick_check(text) is not None for text in texts)
+        full, quick, both = (time_pass(fn, texts, args.repeat) / len(texts) * 1e6
+                             for fn in (_parses, quick_check, fast))
+        print(f"{name:<10}{full:>11.1f} us{quick:>11.1f} us{both:>11.1f} us{rejected / len(texts):>9.0%}")
+    return 0
+
+
+def best_build(grammar: str, repeat: int, **options):
+    """Fastest of ``repeat`` Lark builds from grammar source, and the parser."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parser = Lark(grammar, **options)
+        best = min(best, time.perf_counter() - started)
+    return best, parser
+
+
+def bench_grammar(args):
+    texts = load_corpus(args.corpus)
+    grammars = {"with-legacy": GRAMMAR_VNEXT + GRAMMAR_LEGACY, "core": GRAMMAR_VNEXT}
+    Lark(GRAMMAR_VNEXT, parser="lalr")  # first build also loads Lark's own grammars
+    print(f"corpus: {len(texts)} files ({args.corpus}), best of {args.repeat}")
+    print(f"{'grammar':<13}{'build':>10}{'rules':>12}{'terminals':>12}{'states':>8}{'parse/pass':>13}")
+    for name, grammar in grammars.items():
+        build, parser = best_build(grammar, args.repeat, parser="lalr")
+        parse = time_pass(parser.parse, texts, args.repeat)
+        states = len(parser.parser.parser.parser.parse_table.states)
+        print(f"{name:<13}{build * 1000:>7.1f} ms"
+              f"{len(parser.grammar.rule_defs):>5}/{len(parser.rules):<6}"
+              f"{len(parser.grammar.term_defs):>5}/{len(parser.terminals):<6}"
+              f"{states:>8}{parse * 1000:>10.2f} ms")
+    print("(rules and terminals: defined in the grammar text / kept after pruning unreachable ones)")
+    build, _ = best_build(GRAMMAR_VNEXT + GRAMMAR_LEGACY, args.repeat, parser="earley", start="legacy_wod")
+    print(f"legacy parser (Earley, built by --mode legacy only): {build * 1000:.1f} ms")
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="WODCraft parser benchmarks")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p_passes = sub.add_parser("passes", help="Two-pass vs single-pass parse+transform")
+    p_passes.add_argument("--corpus", default=DEFAULT_CORPUS, help="Glob relative to the repository root")
+    p_passes.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best is kept)")
+    p_passes.add_argument("--scale", type=int, default=10, help="Corpus copies in the peak-memory document")
+    p_passes.set_defaults(func=bench_passes)
+
+    p_mem = sub.add_parser("ast-memory", help="Retained memory: interning, lean AST and slotted typed AST")
+    p_mem.add_argument("--corpus", default=DEFAULT_CORPUS, help="Glob relative to the repository root")
+    p_mem.add_argument("--copies", type=int, default=200, help="Times the corpus is held in memory")
+    p_mem.add_argument("--seed-catalog", action="store_true", help="Seed the string table from the bundled movements catalog")
+    p_mem.set_defaults(func=bench_ast_memory)
+
+    p_size = sub.add_parser("ast-size", help="JSON size and serialization time: full vs lean AST")
+    p_size.add_argument("--corpus", default="**/*.wod", help="Glob relative to the repository root")
+    p_size.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best is kept)")
+    p_size.set_defaults(func=bench_ast_size)
+
+    p_inc = sub.add_parser("incremental", help="Full re-parse vs per-block incremental re-parse after an edit")
+    p_inc.add_argument("--corpus", default=DEFAULT_CORPUS, help="Glob relative to the repository root")
+    p_inc.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best is kept)")
+    p_inc.set_defaults(func=bench_incremental)
+
+    p_quick = sub.add_parser("quick-check", help="Lexer/brace pre-check vs full parse on valid and invalid input")
+    p_quick.add_argument("--corpus", default="**/*.wod", help="Glob relative to the repository root")
+    p_quick.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best is kept)")
+    p_quick.add_argument("--seed", type=int, default=0, help="Seed for the generated invalid corpus")
+    p_quick.set_defaults(func=bench_quick_check)
+
+    p_gram = sub.add_parser("grammar", help="Hot grammar vs grammar with the legacy rules inlined")
+    p_gram.add_argument("--corpus", default=DEFAULT_CORPUS, help="Glob relative to the repository root")
+    p_gram.add_argument("--repeat", type=int, default=5, help="Timing repetitions (best is kept)")
+    p_gram.set_defaults(func=bench_grammar)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
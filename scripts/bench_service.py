@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Service throughput benchmarks: a warm worker vs spawning the CLI per call.
+
+Usage:
+  python scripts/bench_service.py stdio [--requests 200] [--spawn-requests 20]
+  python scripts/bench_service.py http [--requests 400] [--concurrency 8] [--workers 1,2,4]
+
+Subcommands:
+  stdio    Requests/sec of `wodc serve` (one long-lived process, JSON lines)
+           vs `python -m wodcraft.cli <command> file` spawned for every call,
+           for validate, lint, session and run.
+  http     Requests/sec and p50/p99 of `wodc http` under concurrent /compile
+           clients, for several worker-pool sizes.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+ENV = dict(os.environ, PYTHONPATH=str(ROOT / "src"), PYTHONWARNINGS="ignore")
+CLI = [sys.executable, "-m", "wodcraft.cli"]
+
+# (method, file, extra CLI args)
+WORKLOAD = [
+    ("validate", "examples/language/team_realized_session.wod", []),
+    ("lint", "modules/warmup/full_body_10m.wod", []),
+    ("session", "examples/language/team_realized_session.wod", ["--modules-path", "modules"]),
+    ("run", "examples/language/team_realized_session.wod", ["--modules-path", "modules", "--format", "json"]),
+]
+
+
+def spawn_rate(method: str, path: str, extra, n: int) -> float:
+    """Requests/sec when every request is a fresh CLI process."""
+    started = time.perf_counter()
+    for _ in range(n):
+        subprocess.run(CLI + [method, path] + extra, cwd=ROOT, env=ENV,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return n / (time.perf_counter() - started)
+
+
+def serve_rate(method: str, path: str, n: int) -> float:
+    """Requests/sec against one warm `wodc serve` process (start-up excluded)."""
+    proc = subprocess.Popen(CLI + ["serve"], cwd=ROOT, env=ENV, text=True,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        def call(rid):
+            proc.stdin.write(json.dumps({"id": rid, "method": method, "params": {"path": path}}) + "\n")
+            proc.stdin.flush()
+            response = json.loads(proc.stdout.readline())
+            if response["id"] != rid:
+                raise SystemExit(f"Out-of-order response: {response}")
+            return response
+
+        call(0)  # warm up parser, resolver and compiler
+        started = time.perf_counter()
+        for rid in range(1, n + 1):
+            call(rid)
+        return n / (time.perf_counter() - started)
+    finally:
+        proc.stdin.close()
+        proc.wait()
+
+
+def bench_stdio(args):
+    print(f"{'method':<10}{'spawn req/s':>14}{'serve req/s':>14}{'speedup':>10}")
+    for method, path, extra in WORKLOAD:
+        spawned = spawn_rate(method, path, extra, args.spawn_requests)
+        served = serve_rate(method, path, args.requests)
+        print(f"{method:<10}{spawned:>14.1f}{served:>14.1f}{served / spawned:>9.1f}x")
+    return 0
+
+
+def _post(base: str, path: str, payload) -> dict:
+    req = urllib.request.Request(base + path, data=json.dumps(payload).encode("utf-8"),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+def http_run(workers: int, n: int, concurrency: int):
+    """(requests/sec, metrics) for n concurrent /compile calls against a fresh `wodc http`."""
+    proc = subprocess.Popen(CLI + ["http", "--port", "0", "--workers", str(workers)], cwd=ROOT, env=ENV,
+                            text=True, stdout=subprocess.PIPE)
+    try:
+        banner = proc.stdout.readline()  # "wodc http listening on http://host:port (...)"
+        base = banner.split()[4]
+        payload = {"path": WORKLOAD[2][1]}
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(lambda _: _post(base, "/compile", payload), range(workers * 2)))  # warm every worker
+            started = time.perf_counter()
+            list(pool.map(lambda _: _post(base, "/compile", payload), range(n)))
+            elapsed = time.perf_counter() - started
+        with urllib.request.urlopen(base + "/metrics", timeout=10) as resp:
+            metrics = json.loads(resp.read())
+        return n / elapsed, metrics
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def bench_http(args):
+    print(f"{'workers':<10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'hit rate':>10}")
+    for workers in (int(w) for w in args.workers.split(",")):
+        rate, metrics = http_run(workers, args.requests, args.concurrency)
+        lat = metrics["latency"]["/compile"]
+        print(f"{workers:<10}{rate:>10.1f}{lat['p50_ms']:>10.2f}{lat['p99_ms']:>10.2f}"
+              f"{metrics['cache']['hit_rate']:>10.2f}")
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="WODCraft service benchmarks")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p_stdio = sub.add_parser("stdio", help="wodc serve vs spawn-per-call")
+    p_stdio.add_argument("--requests", type=int, default=200, help="Requests sent to the warm worker")
+    p_stdio.add_argument("--spawn-requests", type=int, default=20, help="CLI processes spawned per method")
+    p_stdio.set_defaults(func=bench_stdio)
+
+    p_http = sub.add_parser("http", help="wodc http throughput and latency per pool size")
+    p_http.add_argument("--requests", type=int, default=400, help="Timed /compile requests per pool size")
+    p_http.add_argument("--concurrency", type=int, default=8, help="Concurrent client threads")
+    p_http.add_argument("--workers", default="1,2,4", help="Comma-separated pool sizes")
+    p_http.set_defaults(func=bench_http)
+
+    args = ap.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ Build a unified movements catalog from:
 - mcp/data/movements.json
 - all .wod files under repository (heuristic extraction)
 
-Writes data/movements_catalog.json
+Writes data/movements_catalog.json (and the copy shipped in the wodcraft package)
 """
 import json
 import re
@@ -19,6 +19,7 @@ MCP = ROOT / "mcp" / "data" / "movements.json"
 SEEDS = ROOT / "data" / "movements_seeds.json"
 CROSSFIT_WARMUP = ROOT / "crossfit_warmup_movements.json"
 OUTPUT = ROOT / "data" / "movements_catalog.json"
+PACKAGED = ROOT / "src" / "wodcraft" / "movements_catalog.json"
 
 KEYWORDS = set(
     k.lower()
@@ -153,9 +154,11 @@ def extract_from_wod(catalog: dict):
 def main():
     catalog = load_sources()
     extract_from_wod(catalog)
-    OUTPUT.parent.mkdir(parents=True, exist_ok=True)
-    OUTPUT.write_text(json.dumps(catalog, indent=2, ensure_ascii=False) + "\n")
-    print(f"Wrote {OUTPUT}")
+    text = json.dumps(catalog, indent=2, ensure_ascii=False) + "\n"
+    for path in (OUTPUT, PACKAGED):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        print(f"Wrote {path}")
 
 if __name__ == "__main__":
     main()
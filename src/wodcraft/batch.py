@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Batch validation/parsing of whole WOD libraries (``wodc validate|parse`` with
+several files, globs or directories).
+
+Inputs are expanded to ``.wod``/``.wodcraft`` files and checked by a
+``multiprocessing`` pool whose workers each keep a warm parser. Results come
+back in input order (``ordered=True``) or as soon as they finish, and can be
+folded into a summary whose ``exit_code`` reflects the worst result:
+0 all valid, 1 at least one syntax error, 2 at least one unreadable file.
+"""
+from __future__ import annotations
+
+import glob
+import multiprocessing
+import os
+import time
+from collections import Counter
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from .core import WODCraftError, get_parser, parse_vnext, parse_vnext_recover
+from .quickcheck import quick_check
+
+SOURCE_SUFFIXES = (".wod", ".wodcraft")
+EXIT_CODES = {"valid": 0, "invalid": 1, "error": 2}
+
+
+def expand_inputs(inputs: Iterable[str]) -> List[Path]:
+    """Files as given, directories searched recursively, globs expanded; duplicates dropped"""
+    seen = set()
+    files: List[Path] = []
+
+    def add(path: Path):
+        key = os.path.normpath(str(path))
+        if key not in seen:
+            seen.add(key)
+            files.append(path)
+
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            for found in sorted(p for p in path.rglob("*") if p.suffix in SOURCE_SUFFIXES and p.is_file()):
+                add(found)
+        elif not path.exists() and glob.has_magic(item):
+            for found in sorted(glob.glob(item, recursive=True)):
+                if Path(found).is_file():
+                    add(Path(found))
+        else:
+            add(path)  # missing files are reported by check_file
+    return files
+
+
+def _error_record(e: WODCraftError) -> Dict[str, Any]:
+    return {
+        "type": type(e).__name__,
+        "message": str(e),
+        "summary": e.args[0] if e.args else str(e),
+        "line": e.line,
+        "column": e.column,
+        "suggestion": e.suggestion,
+    }
+
+
+def check_file(path: str, parse: bool = False, lean: bool = False, all_errors: bool = False,
+               fast: bool = False) -> Dict[str, Any]:
+    """Validate (and optionally parse) one file into a JSON-friendly record
+
+    With ``all_errors`` the parser recovers from syntax errors and the record
+    also lists every diagnostic under ``errors`` (``error`` is the first one).
+    With ``fast`` obviously malformed files are rejected by ``quickcheck``
+    without running the parser.
+    """
+    record: Dict[str, Any] = {"file": str(path), "ok": False, "status": "error", "error": None}
+    try:
+        text = Path(path).read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as e:
+        record["error"] = {"type": type(e).__name__, "message": str(e)}
+        return record
+    rejected = quick_check(text) if fast else None
+    try:
+        if rejected is not None:
+            ast, errors = None, [rejected]
+        elif all_errors:
+            ast, errors = parse_vnext_recover(text)
+        else:
+            ast, errors = parse_vnext(text, lean=lean), []
+    except WODCraftError as e:
+        errors = [e]
+    if errors:
+        record["status"] = "invalid"
+        record["error"] = _error_record(errors[0])
+        if all_errors:
+            record["errors"] = [_error_record(e) for e in errors]
+        return record
+    record.update(ok=True, status="valid")
+    if parse:
+        record["ast"] = ast
+    return record
+
+
+def _warm_worker():
+    get_parser()
+
+
+def run_batch(files: Iterable[Path], jobs: int = 1, ordered: bool = True,
+              parse: bool = False, lean: bool = False, all_errors: bool = False,
+              fast: bool = False) -> Iterator[Dict[str, Any]]:
+    """Yield one record per file, checked by ``jobs`` worker processes"""
+    paths = [str(f) for f in files]
+    check = partial(check_file, parse=parse, lean=lean, all_errors=all_errors, fast=fast)
+    jobs = max(1, min(jobs, len(paths)))
+    if jobs == 1:
+        for path in paths:
+            yield check(path)
+        return
+    chunksize = max(1, min(64, len(paths) // (jobs * 4)))
+    with multiprocessing.get_context().Pool(jobs, initializer=_warm_worker) as pool:
+        results = pool.imap(check, paths, chunksize) if ordered else pool.imap_unordered(check, paths, chunksize)
+        yield from results
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+class BatchSummary:
+    """Counts, most frequent error messages and the worst-result exit code"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.counts: Counter = Counter()
+        self.messages: Counter = Counter()
+
+    def add(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        self.counts[record["status"]] += 1
+        if record.get("error"):
+            error = record["error"]
+            self.messages[error.get("summary") or error["message"].splitlines()[0]] += 1
+        return record
+
+    @property
+    def exit_code(self) -> int:
+        return max((EXIT_CODES[status] for status in self.counts), default=0)
+
+    def as_dict(self, top: int = 10) -> Dict[str, Any]:
+        return {
+            "files": sum(self.counts.values()),
+            "valid": self.counts["valid"],
+            "invalid": self.counts["invalid"],
+            "unreadable": self.counts["error"],
+            "seconds": round(time.perf_counter() - self.started, 3),
+            "top_errors": [{"message": m, "count": c} for m, c in self.messages.most_common(top)],
+            "exit_code": self.exit_code,
+        }
+
+    def format_text(self, top: int = 10) -> str:
+        data = self.as_dict(top)
+        lines = [
+            f"{data['files']} file(s): {data['valid']} valid, {data['invalid']} invalid, "
+            f"{data['unreadable']} unreadable ({data['seconds']}s)"
+        ]
+        for item in data["top_errors"]:
+            lines.append(f"  {item['count']:>5} × {item['message']}")
+        return "\n".join(lines)
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Compact binary encoding of parsed ASTs, readable in place through mmap.
+
+  sdk.dump_ast(ast, "lib.wodast")          # or dumps_ast(ast) -> bytes
+  ast = sdk.load_ast("lib.wodast")         # whole document
+  with ASTReader("lib.wodast") as lib:     # one node, nothing else decoded
+      fran = lib.module("wod.fran")
+      sess = lib.get("sessions", 3)
+
+Layout (little-endian, sections 8-byte aligned):
+
+  header      magic "WODAST", format, sha256 of the grammar, wodcraft
+              version (UTF-8, 32 bytes, NUL-padded), section counts
+  strings     u32 offsets + UTF-8 blob; every distinct string is stored once
+  shapes      dict key tuples (u32 string ids); dicts with the same keys share one
+  roots       per top-level node: section, index, lookup key, record range
+  records     flat array of u32 (4-bit tag, 28-bit arg) in pre-order
+  numbers     f64 pool for floats, i64 pool for ints outside int32
+
+A dict record's arg is its shape and its values follow in key order; a
+list record's arg is its length; strings, floats and large ints point into
+their tables. Files carry the grammar hash and the wodcraft version: an
+AST dumped under another grammar or by another release (whose transformer
+may build other shapes) is refused instead of being decoded into a shape
+the compiler no longer expects.
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .cache import wodcraft_version
+from .core import GRAMMAR_VNEXT, WODCraftError, grammar_hash
+
+BINARY_AST_MAGIC = b"WODAST"
+BINARY_AST_FORMAT = 2
+
+_HEADER = struct.Struct("<6sH32s32s8I")
+_NONE = 0xFFFFFFFF
+_ARG_BITS = 28
+_ARG_MASK = (1 << _ARG_BITS) - 1
+_INT_MIN, _INT_MAX = -(1 << (_ARG_BITS - 1)), (1 << (_ARG_BITS - 1)) - 1
+_ROOT_FIELDS = 5  # section, index, key, first record, end record
+
+NULL, FALSE, TRUE, INT, INT64, FLOAT, STR, LIST, DICT = (tag << _ARG_BITS for tag in range(9))
+
+
+def _version_field() -> bytes:
+    return wodcraft_version().encode("utf-8")[:32]
+
+
+def _pad(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.shapes: Dict[Tuple[str, ...], int] = {}
+        self.floats: Dict[bytes, int] = {}
+        self.f64 = array("d")
+        self.i64 = array("q")
+        self.records = array("I")
+
+    def string(self, value: str) -> int:
+        sid = self.strings.get(value)
+        if sid is None:
+            sid = self.strings[value] = len(self.strings)
+        return sid
+
+    def index(self, arg: int) -> int:
+        if arg > _ARG_MASK:
+            raise ValueError("AST too large for the binary format (table or list over 2**28 entries)")
+        return arg
+
+    def value(self, value: Any):
+        records = self.records
+        if isinstance(value, str):
+            records.append(STR | self.index(self.string(value)))
+        elif isinstance(value, dict):
+            keys = tuple(value)
+            shape = self.shapes.get(keys)
+            if shape is None:
+                for key in keys:
+                    if not isinstance(key, str):
+                        raise TypeError(f"AST keys must be strings, not {type(key).__name__}")
+                    self.string(key)
+                shape = self.shapes[keys] = len(self.shapes)
+            records.append(DICT | self.index(shape))
+            for item in value.values():
+                self.value(item)
+        elif isinstance(value, (list, tuple)):
+            records.append(LIST | self.index(len(value)))
+            for item in value:
+                self.value(item)
+        elif value is None:
+            records.append(NULL)
+        elif value is True or value is False:
+            records.append(TRUE if value else FALSE)
+        elif isinstance(value, int):
+            if _INT_MIN <= value <= _INT_MAX:
+                records.append(INT | (value & _ARG_MASK))
+            else:
+                records.append(INT64 | self.index(len(self.i64)))
+                self.i64.append(value)
+        elif isinstance(value, float):
+            key = struct.pack("<d", value)
+            index = self.floats.get(key)
+            if index is None:
+                index = self.floats[key] = len(self.f64)
+                self.f64.append(value)
+            records.append(FLOAT | self.index(index))
+        else:
+            raise TypeError(f"Cannot encode {type(value).__name__} in a binary AST")
+
+
+def _root_key(node: Any) -> Optional[str]:
+    # Lookup key stored in the root index: "id@version" for modules, the title for sessions
+    if not isinstance(node, dict):
+        return None
+    if node.get("type") == "MODULE" and isinstance(node.get("id"), str):
+        version = node.get("version")
+        return f"{node['id']}@{version}" if isinstance(version, str) else node["id"]
+    if node.get("type") == "SESSION" and isinstance(node.get("title"), str):
+        return node["title"]
+    return None
+
+
+def _le(values: array) -> bytes:
+    if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def dumps_ast(ast: Dict[str, Any], grammar: str = GRAMMAR_VNEXT) -> bytes:
+    """Encode a parsed AST document (``{"modules": [...], "sessions": [...], ...}``)"""
+    if not isinstance(ast, dict):
+        raise TypeError("A binary AST document must be a dict of sections")
+    encoder = _Encoder()
+    roots = array("I")
+    for section, value in ast.items():
+        # Non-empty lists get one root per item; anything else (including []) is a single root
+        items = list(enumerate(value)) if isinstance(value, list) and value else [(_NONE, value)]
+        section_id = encoder.string(section)
+        for index, node in items:
+            key = _root_key(node)
+            start = len(encoder.records)
+            encoder.value(node)
+            roots.extend((section_id, index, _NONE if key is None else encoder.string(key),
+                          start, len(encoder.records)))
+
+    blob = bytearray()
+    offsets = array("I", [0])
+    for text in encoder.strings:
+        blob += text.encode("utf-8")
+        offsets.append(len(blob))
+    shape_offsets = array("I", [0])
+    shape_keys = array("I")
+    for keys in encoder.shapes:
+        shape_keys.extend(encoder.strings[key] for key in keys)
+        shape_offsets.append(len(shape_keys))
+
+    header = _HEADER.pack(
+        BINARY_AST_MAGIC, BINARY_AST_FORMAT, bytes.fromhex(grammar_hash(grammar)), _version_field(),
+        len(encoder.strings), len(blob), len(encoder.shapes), len(shape_keys),
+        len(roots) // _ROOT_FIELDS, len(encoder.records), len(encoder.f64), len(encoder.i64),
+    )
+    out = bytearray(header)
+    for section in (offsets, shape_offsets, shape_keys, roots, encoder.records, encoder.f64, encoder.i64):
+        out += _le(section)
+        out += b"\0" * (_pad(len(out)) - len(out))
+    out += blob
+    return bytes(out)
+
+
+class _Decoder:
+    """Section views over an encoded buffer; strings and shapes are decoded on first use"""
+
+    def __init__(self, buffer, grammar: str = GRAMMAR_VNEXT):
+        # Everything is validated before the first memoryview over ``buffer`` exists,
+        # so a failed open never leaves an mmap with exported views behind
+        if len(buffer) < _HEADER.size:
+            raise WODCraftError("Not a WODCraft binary AST (file too short)")
+        (magic, fmt, digest, version, n_strings, blob_size, n_shapes, n_shape_keys,
+         n_roots, n_records, n_f64, n_i64) = _HEADER.unpack_from(buffer)
+        if magic != BINARY_AST_MAGIC:
+            raise WODCraftError("Not a WODCraft binary AST (bad magic)")
+        if fmt != BINARY_AST_FORMAT:
+            raise WODCraftError(f"Unsupported binary AST format {fmt} (expected {BINARY_AST_FORMAT})",
+                                suggestion="Re-parse the source and dump it again")
+        self.grammar_hash = digest.hex()
+        if self.grammar_hash != grammar_hash(grammar):
+            raise WODCraftError("Binary AST was built for a different grammar",
+                                suggestion="Re-parse the source and dump it again")
+        self.wodcraft_version = version.rstrip(b"\0").decode("utf-8", "replace")
+        if version.rstrip(b"\0") != _version_field():
+            raise WODCraftError(f"Binary AST was written by wodcraft {self.wodcraft_version} "
+                                f"(running {wodcraft_version()})",
+                                suggestion="Re-parse the source and dump it again")
+        layout = []
+        pos = _HEADER.size
+        for count, code, width in ((n_strings + 1, "I", 4), (n_shapes + 1, "I", 4), (n_shape_keys, "I", 4),
+                                   (n_roots * _ROOT_FIELDS, "I", 4), (n_records, "I", 4),
+                                   (n_f64, "d", 8), (n_i64, "q", 8)):
+            pos = _pad(pos)
+            layout.append((pos, pos + count * width, code))
+            pos += count * width
+        if pos + blob_size > len(buffer):
+            raise WODCraftError("Truncated binary AST")
+
+        view = memoryview(buffer)
+        (self.string_offsets, self.shape_offsets, self.shape_keys, self.roots,
+         self.records, self.f64, self.i64) = (self._cast(view[start:end], code) for start, end, code in layout)
+        self.blob = view[pos:pos + blob_size]
+        self.counts = {"strings": n_strings, "shapes": n_shapes, "roots": n_roots,
+                       "records": n_records, "floats": n_f64, "ints": n_i64}
+        self._strings: List[Optional[str]] = [None] * n_strings
+        self._shapes: List[Optional[Tuple[str, ...]]] = [None] * n_shapes
+        self._scalars: Dict[int, Any] = {NULL: None, TRUE: True, FALSE: False}
+
+    @staticmethod
+    def _cast(view: memoryview, code: str):
+        if sys.byteorder != "little":  # pragma: no cover - big-endian hosts
+            values = array(code, view.tobytes())
+            values.byteswap()
+            return values
+        return view.cast(code)
+
+    def string(self, sid: int) -> str:
+        text = self._strings[sid]
+        if text is None:
+            offsets = self.string_offsets
+            text = self._strings[sid] = str(self.blob[offsets[sid]:offsets[sid + 1]], "utf-8")
+        return text
+
+    def shape(self, shape_id: int) -> Tuple[str, ...]:
+        keys = self._shapes[shape_id]
+        if keys is None:
+            offsets = self.shape_offsets
+            keys = self._shapes[shape_id] = tuple(
+                self.string(sid) for sid in self.shape_keys[offsets[shape_id]:offsets[shape_id + 1]]
+            )
+        return keys
+
+    def decode(self, start: int, end: int) -> Any:
+        """Decode the value stored in records [start, end)"""
+        records = iter(self.records[start:end])
+        scalars = self._scalars
+        shapes, shape = self._shapes, self.shape
+
+        def read(record):
+            tag = record & ~_ARG_MASK
+            arg = record & _ARG_MASK
+            if tag == DICT:
+                node = {}
+                for key in shapes[arg] or shape(arg):
+                    record = next(records)
+                    node[key] = scalars[record] if record in scalars else read(record)
+                return node
+            if tag == LIST:
+                return [scalars[record] if record in scalars else read(record) for record in islice(records, arg)]
+            # Scalars are decoded once per reader and then served from ``scalars``
+            if tag == STR:
+                value = self.string(arg)
+            elif tag == INT:
+                value = arg + _INT_MIN * 2 if arg > _INT_MAX else arg
+            elif tag == FLOAT:
+                value = self.f64[arg]
+            elif tag == INT64:
+                value = self.i64[arg]
+            else:
+                raise WODCraftError(f"Corrupt binary AST (unknown tag {tag >> _ARG_BITS})")
+            scalars[record] = value
+            return value
+
+        try:
+            record = next(records)
+            return scalars[record] if record in scalars else read(record)
+        finally:
+            # ``read`` refers to itself; drop the records view so the mmap can close
+            records = iter(())
+
+    def iter_roots(self) -> Iterator[Tuple[str, Optional[int], Optional[str], int, int]]:
+        roots = self.roots.tolist()
+        string = self.string
+        for section, index, key, start, end in zip(*(roots[i::_ROOT_FIELDS] for i in range(_ROOT_FIELDS))):
+            yield (string(section), None if index == _NONE else index,
+                   None if key == _NONE else string(key), start, end)
+
+    def document(self) -> Dict[str, Any]:
+        for sid in range(len(self._strings)):
+            self.string(sid)
+        document: Dict[str, Any] = {}
+        for section, index, _key, start, end in self.iter_roots():
+            node = self.decode(start, end)
+            if index is None:
+                document[section] = node
+            else:
+                document.setdefault(section, []).append(node)
+        return document
+
+
+def loads_ast(data: Union[bytes, bytearray, memoryview], grammar: str = GRAMMAR_VNEXT) -> Dict[str, Any]:
+    """Decode a whole document encoded by ``dumps_ast``"""
+    return _Decoder(data, grammar).document()
+
+
+def dump_ast(ast: Dict[str, Any], path: Union[str, Path]) -> Path:
+    """Write ``ast`` to ``path`` in the binary format"""
+    target = Path(path)
+    target.write_bytes(dumps_ast(ast))
+    return target
+
+
+def load_ast(path: Union[str, Path]) -> Dict[str, Any]:
+    """Read a whole document written by ``dump_ast``"""
+    with ASTReader(path) as reader:
+        return reader.document()
+
+
+class ASTReader:
+    """
+    Memory-mapped access to a binary AST file.
+
+    Opening only reads the header; the root index is built on the first
+    lookup, and ``get``/``module``/``session`` decode the records of one
+    top-level node, and only the strings that node uses.
+    """
+
+    def __init__(self, path: Union[str, Path], grammar: str = GRAMMAR_VNEXT):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise WODCraftError(f"Not a WODCraft binary AST: {self.path}")
+        try:
+            self._decoder = _Decoder(self._map, grammar)
+        except WODCraftError:
+            self.close()
+            raise
+        self._index: Optional[Dict[Tuple[str, Optional[int]], Tuple[int, int]]] = None
+        self._keys: Dict[Tuple[str, str], Tuple[int, int]] = {}
+
+    def _spans(self) -> Dict[Tuple[str, Optional[int]], Tuple[int, int]]:
+        if self._index is None:
+            index_map: Dict[Tuple[str, Optional[int]], Tuple[int, int]] = {}
+            for section, index, key, start, end in self._decoder.iter_roots():
+                index_map[(section, index)] = (start, end)
+                if key is not None:
+                    self._keys.setdefault((section, key), (start, end))
+                    if section == "modules":
+                        # Versionless lookups: "wod.fran" finds the first "wod.fran@..."
+                        self._keys.setdefault((section, key.split("@", 1)[0]), (start, end))
+            self._index = index_map
+        return self._index
+
+    @property
+    def grammar_hash(self) -> str:
+        return self._decoder.grammar_hash
+
+    @property
+    def wodcraft_version(self) -> str:
+        return self._decoder.wodcraft_version
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        return dict(self._decoder.counts)
+
+    def roots(self) -> List[Dict[str, Any]]:
+        """Top-level entries as ``{"section", "index", "key"}``, without decoding them"""
+        return [{"section": section, "index": index, "key": key}
+                for section, index, key, _start, _end in self._decoder.iter_roots()]
+
+    def get(self, section: str, index: Optional[int] = None) -> Any:
+        """Decode one top-level node (``index`` is None for non-list sections)"""
+        try:
+            start, end = self._spans()[(section, index)]
+        except KeyError:
+            raise KeyError(f"{section}[{index}]" if index is not None else section) from None
+        return self._decoder.decode(start, end)
+
+    def module(self, module_id: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """First module with this id (and version, when given), or None"""
+        self._spans()
+        found = self._keys.get(("modules", f"{module_id}@{version}" if version is not None else module_id))
+        return self._decoder.decode(*found) if found else None
+
+    def session(self, title: str) -> Optional[Dict[str, Any]]:
+        """First session with this title, or None"""
+        self._spans()
+        found = self._keys.get(("sessions", title))
+        return self._decoder.decode(*found) if found else None
+
+    def document(self) -> Dict[str, Any]:
+        """Decode everything (same result as ``load_ast``)"""
+        return self._decoder.document()
+
+    def close(self):
+        decoder = self.__dict__.pop("_decoder", None)
+        if decoder is not None:
+            # Release the exported memoryviews before the map can be closed
+            for name in ("string_offsets", "shape_offsets", "shape_keys", "roots", "records", "f64", "i64", "blob"):
+                view = getattr(decoder, name)
+                if isinstance(view, memoryview):
+                    view.release()
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
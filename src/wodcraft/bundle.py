@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Single-file module bundles (``.wodpack``) and the resolver that serves them.
+
+  wodc bundle build modules/ -o modules.wodpack      # or sdk.build_bundle(...)
+  wodc session week.wod --modules-path modules.wodpack
+  resolver = BundleResolver("modules.wodpack")
+
+A bundle is an SQLite database (standard library ``sqlite3``) with two tables:
+
+  meta      key/value pairs: format, grammar hash, wodcraft version, binary
+            AST format, module count
+  modules   one row per ``namespace.name@version`` (primary key, no rowid):
+            source of the module block, its content hash and, unless built
+            with ``asts=False``, the parsed module AST in the binary AST format
+
+``BundleResolver.resolve`` is one primary-key lookup; the packed AST is
+decoded when the compiler first asks for it, instead of parsing the source. ASTs built
+under another grammar, by another wodcraft release or in another binary AST
+format are ignored (the source is parsed instead). Bundles are read-only:
+rebuild them when ``modules/`` changes.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .binary_ast import BINARY_AST_FORMAT, dumps_ast, loads_ast
+from .cache import wodcraft_version
+from .core import (GRAMMAR_VNEXT, FileSystemResolver, ModuleRef, ModuleResolver, ResolvedModule, SessionCompiler,
+                   WODCraftError, grammar_hash)
+
+BUNDLE_FORMAT = 1
+BUNDLE_SUFFIX = ".wodpack"
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE modules (
+    id TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    source TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    ast BLOB
+) WITHOUT ROWID;
+CREATE INDEX modules_namespace ON modules (namespace);
+"""
+
+
+def build_bundle(modules_path: Union[str, Path], output: Union[str, Path], asts: bool = True) -> Dict[str, Any]:
+    """
+    Pack every module under ``modules_path`` into the bundle ``output``.
+
+    Modules that do not parse are packed without an AST (resolving them
+    fails at compile time, as it would from the directory). The file is
+    written next to ``output`` and renamed into place. Returns counts and
+    the ids of the modules that did not parse.
+    """
+    started = time.perf_counter()
+    resolver = FileSystemResolver(Path(modules_path))
+    compiler = SessionCompiler(resolver)
+    rows = []
+    failed = []
+    for ref in resolver.list():
+        resolved = resolver.resolve(ref)
+        blob = None
+        if asts:
+            try:
+                blob = dumps_ast(compiler.module_ast(resolved))
+            except Exception:
+                failed.append(ref.full_name)
+        rows.append((ref.full_name, ref.namespace, ref.name, ref.version, resolved.source,
+                     resolved.content_hash, blob))
+
+    target = Path(output)
+    fd, tmp = tempfile.mkstemp(dir=target.parent if str(target.parent) else ".", prefix=".", suffix=".tmp")
+    os.close(fd)
+    try:
+        db = sqlite3.connect(tmp)
+        try:
+            db.executescript(_SCHEMA)
+            db.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("format", str(BUNDLE_FORMAT)),
+                ("grammar_hash", grammar_hash(GRAMMAR_VNEXT)),
+                ("wodcraft_version", wodcraft_version()),
+                ("ast_format", str(BINARY_AST_FORMAT)),
+                ("modules", str(len(rows))),
+                ("asts", "1" if asts else "0"),
+            ])
+            db.executemany("INSERT INTO modules VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            db.commit()
+            db.execute("VACUUM")
+        finally:
+            db.close()
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return {
+        "bundle": str(target),
+        "modules": len(rows),
+        "asts": sum(1 for row in rows if row[6] is not None),
+        "failed": failed,
+        "bytes": target.stat().st_size,
+        "build_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+class BundledModule(ResolvedModule):
+    """ResolvedModule whose packed AST is decoded on first access"""
+
+    def __init__(self, source: str, content_hash: str, blob: Optional[bytes], meta: Optional[Dict] = None):
+        self._blob = blob
+        super().__init__(source, meta=meta)
+        self._content_hash = content_hash
+
+    @property
+    def ast(self) -> Optional[Dict]:
+        if self._ast is None and self._blob is not None:
+            blob, self._blob = self._blob, None
+            try:
+                self._ast = loads_ast(blob)
+            except WODCraftError:  # packed by another grammar or release: the compiler parses the source
+                pass
+        return self._ast
+
+    @ast.setter
+    def ast(self, value: Optional[Dict]):
+        self._ast = value
+
+
+class BundleResolver(ModuleResolver):
+    """Read-only resolver serving the modules of a ``.wodpack`` bundle"""
+
+    concurrent = True
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        if not self.path.is_file():
+            raise ValueError(f"Module bundle not found: {self.path}")
+        self._local = threading.local()  # one read-only connection per thread
+        self._cache: Dict[str, ResolvedModule] = {}
+        self._refs: Optional[List[Tuple[str, str, str]]] = None
+        self.meta = dict(self._db().execute("SELECT key, value FROM meta"))
+        if self.meta.get("format") != str(BUNDLE_FORMAT):
+            raise ValueError(f"Unsupported module bundle format {self.meta.get('format')!r}: {self.path}")
+        # ASTs packed under another grammar, release or AST format are ignored rather than
+        # decoded into a stale shape
+        self.use_asts = (self.meta.get("grammar_hash") == grammar_hash(GRAMMAR_VNEXT)
+                         and self.meta.get("wodcraft_version") == wodcraft_version()
+                         and self.meta.get("ast_format") == str(BINARY_AST_FORMAT))
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True,
+                                                  check_same_thread=False)
+        return db
+
+    def resolve(self, ref: ModuleRef) -> ResolvedModule:
+        key = ref.full_name
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        row = self._db().execute("SELECT source, content_hash, ast FROM modules WHERE id = ?", (key,)).fetchone()
+        if row is None:
+            versions = [v for (v,) in self._db().execute(
+                "SELECT version FROM modules WHERE namespace = ? AND name = ? ORDER BY version",
+                (ref.namespace, ref.name))]
+            if versions:
+                raise ValueError(f"Module version not found: {key} (available: {', '.join(versions)})")
+            raise ValueError(f"Module not found: {key} (bundle {self.path})")
+        source, digest, blob = row
+        resolved = BundledModule(source, digest, blob if self.use_asts else None, meta={"bundle": str(self.path)})
+        self._cache[key] = resolved
+        return resolved
+
+    def list(self, namespace: Optional[str] = None) -> List[ModuleRef]:
+        if self._refs is None:  # the bundle is read-only: read the ids once
+            self._refs = self._db().execute("SELECT namespace, name, version FROM modules ORDER BY id").fetchall()
+        return [ModuleRef(ns, name, version) for ns, name, version in self._refs if not namespace or ns == namespace]
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def __enter__(self) -> "BundleResolver":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_resolver(modules_path: Union[str, Path]) -> ModuleResolver:
+    """BundleResolver for a ``.wodpack`` file, FileSystemResolver for a directory"""
+    path = Path(modules_path)
+    if path.suffix == BUNDLE_SUFFIX or path.is_file():
+        return BundleResolver(path)
+    return FileSystemResolver(path)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+On-disk cache for compiled sessions, shared across CLI/SDK invocations.
+
+Entries are content-addressed: the key combines the session fingerprint, the
+content hash of every resolved module, the wodcraft version and the grammar
+hash, so a stale entry can never be served. Writes go through a temporary file
+and an atomic rename, which makes the cache safe for concurrent processes.
+The directory is kept under a byte budget by evicting least recently used
+entries (hits refresh the entry's mtime).
+
+Enable it with ``wodc session|run|results --cache-dir DIR`` or the
+``WODCRAFT_CACHE_DIR`` environment variable; manage it with ``wodc cache``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .core import GRAMMAR_VNEXT, grammar_hash
+
+CACHE_ENV = "WODCRAFT_CACHE_DIR"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+CACHE_FORMAT = 2  # entries: {"compiled": ..., "messages": [...]}
+
+
+def default_cache_dir() -> Path:
+    """Cache directory from $WODCRAFT_CACHE_DIR, else the user cache directory."""
+    env = os.environ.get(CACHE_ENV)
+    if env:
+        return Path(env)
+    base = os.environ.get("XDG_CACHE_HOME") or (Path.home() / ".cache")
+    return Path(base) / "wodcraft"
+
+
+def configured_cache_dir(cache_dir: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """Explicit directory if given, else $WODCRAFT_CACHE_DIR if set, else None (disabled)."""
+    if cache_dir:
+        return Path(cache_dir)
+    env = os.environ.get(CACHE_ENV)
+    return Path(env) if env else None
+
+
+@lru_cache(maxsize=None)
+def wodcraft_version() -> str:
+    try:
+        from importlib.metadata import version as _pkg_version  # type: ignore
+        return _pkg_version("wodcraft")
+    except Exception:
+        return "dev"
+
+
+class DiskCache:
+    """Size-bounded, content-addressed JSON store (``<dir>/<k[:2]>/<k>.json``)"""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # Salt mixed into every key so upgrades never read older entries
+        self.namespace = f"{CACHE_FORMAT}:{wodcraft_version()}:{grammar_hash(GRAMMAR_VNEXT)[:16]}"
+        self._approx_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def key(self, compile_key: str) -> str:
+        """Disk key for a SessionCompiler compile key"""
+        return hashlib.blake2b(f"{self.namespace}|{compile_key}".encode("utf-8"), digest_size=20).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value, or None on a miss (unreadable entries count as misses)"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # LRU bookkeeping for prune()
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store ``value`` atomically; failures are ignored (the cache is best-effort)"""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(value, f, separators=(",", ":"), ensure_ascii=False)
+                size = os.path.getsize(tmp)
+                os.replace(tmp, path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        except (OSError, TypeError, ValueError):
+            return
+        self.writes += 1
+        if self._approx_bytes is None:
+            self._approx_bytes = self._scan_bytes()
+        else:
+            self._approx_bytes += size
+        if self._approx_bytes > self.max_bytes:
+            self.prune()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, Path(entry.path)))
+        return entries
+
+    def _scan_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Evict least recently used entries until the cache fits in 80% of ``max_bytes``"""
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        if total > budget:
+            target = int(budget * 0.8)
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+        self._approx_bytes = total
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry; returns how many were removed"""
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                continue
+        self._approx_bytes = 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Directory usage plus this process's hit/miss/write counters"""
+        entries = self._entries()
+        return {
+            "directory": str(self.directory),
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+        }
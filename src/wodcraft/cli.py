@@ -22,215 +22,152 @@ def cmd_lint(args):
     text = p.read_text()
     mode = args.mode or detect_mode_from_text(text)
     # language-first only
-    # Prefer programming lint if block present; else validate
-    from wodcraft.core import ProgrammingLinter, parse_vnext
+    # Prefer programming lint if block present; else structural checks on modules
+    from wodcraft.sdk import lint
     if "programming" in text:
-        ast = parse_vnext(text)
-        reports = []
-        for blk in ast.get("programming", []):
-            data = blk.get("data", {})
-            issues = ProgrammingLinter().lint(data)
-            reports.append({"programming": data.get("macrocycle", {}).get("name"), "issues": issues})
+        report = lint(text)
+        reports = report["reports"]
         print(json.dumps({"reports": reports}, indent=2))
         return 2 if any(any(i.get("level") == "error" for i in r.get("issues", [])) for r in reports) else 0
+    try:
+        report = lint(text)
+    except Exception as e:
+        print(f"✗ Invalid syntax: {e}")
+        return 1
+    issues = report["issues"]
+    if issues:
+        for issue in issues:
+            print(f"{issue['level'].upper()} {issue['code']} {args.file}: {issue['message']}")
     else:
-        # Lint modules: find common structural issues
-        try:
-            ast = parse_vnext(text)
-        except Exception as e:
-            print(f"✗ Invalid syntax: {e}")
-            return 1
-        issues = []
-        modules = ast.get("modules", [])
-        for m in modules:
-            mid = m.get("id", "<module>")
-            body = m.get("body")
-            comps = []
-            # Flatten containers
-            def collect(node):
-                if isinstance(node, dict):
-                    t = node.get("type")
-                    if t in ("WARMUP","WOD","SKILL","STRENGTH"):
-                        comps.append(node)
-                    elif t in ("MODULE_BODY","BODY"):
-                        for ch in node.get("children", []):
-                            collect(ch)
-                    else:
-                        # attempt to collect nested dicts
-                        for v in node.values():
-                            collect(v)
-                elif isinstance(node, list):
-                    for v in node: collect(v)
-            collect(body)
-            if not comps:
-                issues.append(("warning","M101", f"Module '{mid}' has no components"))
-            for c in comps:
-                ct = c.get("type")
-                if ct == "WOD":
-                    mv = c.get("movements") or []
-                    if not mv:
-                        issues.append(("warning","M102", f"WOD in '{mid}' has no movements"))
-                elif ct == "WARMUP":
-                    bl = c.get("blocks") or []
-                    if not bl:
-                        issues.append(("warning","M103", f"Warmup in '{mid}' has no blocks"))
-                elif ct in ("SKILL","STRENGTH"):
-                    wk = c.get("work") or {}
-                    lines = wk.get("lines") or []
-                    if not lines:
-                        issues.append(("warning","M104", f"{ct.title()} in '{mid}' has no work lines"))
-        if issues:
-            for lvl, code, msg in issues:
-                print(f"{lvl.upper()} {code} {args.file}: {msg}")
+        print("✓ Valid WODCraft syntax")
+    # Treat warnings as success
+    return 0
+
+
+def _single_file(args) -> bool:
+    # One plain file keeps the historical single-file output
+    return len(args.files) == 1 and Path(args.files[0]).is_file()
+
+
+def _emit_json(document, args) -> int:
+    # Pretty JSON streamed in chunks, compact JSON, or JSON lines; to stdout or --output
+    from wodcraft.jsonio import iter_records, open_output, write_json, write_jsonl
+    out = open_output(getattr(args, "output", None))
+    try:
+        if args.format == "jsonl":
+            write_jsonl(iter_records(document), out)
         else:
-            print("✓ Valid WODCraft syntax")
-        # Treat warnings as success
-        return 0
+            write_json(document, out, compact=args.compact)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
 
 
-def cmd_parse(args):
-    text = Path(args.file).read_text()
-    mode = args.mode or detect_mode_from_text(text)
-    if mode == "legacy":
-        # Legacy not supported in clean mode — fallback to language parser
-        from wodcraft.core import parse_vnext
-        ast = parse_vnext(text)
+def _batch(args, parse: bool) -> int:
+    # Many files/globs/directories: process pool, JSON lines or failures + summary, worst exit code
+    from wodcraft.batch import BatchSummary, default_jobs, expand_inputs, run_batch
+    from wodcraft.jsonio import dumps_compact, open_output
+    files = expand_inputs(args.files)
+    if not files:
+        print("✗ No .wod files matched", file=sys.stderr)
+        return 2
+    jsonl = parse or args.format == "jsonl"
+    jobs = args.jobs or default_jobs()
+    summary = BatchSummary()
+    out = open_output(getattr(args, "output", None)) if jsonl else sys.stdout
+    try:
+        for record in run_batch(files, jobs, ordered=not args.unordered, parse=parse,
+                                lean=getattr(args, "lean", False), all_errors=getattr(args, "all_errors", False),
+                                fast=getattr(args, "fast", False)):
+            summary.add(record)
+            if jsonl:
+                print(dumps_compact(record), file=out, flush=args.unordered)
+            elif not record["ok"]:
+                for err in record.get("errors") or [record["error"]]:
+                    where = f":{err['line']}:{err['column']}" if err.get("line") else ""
+                    print(f"✗ {record['file']}{where}: {err.get('summary') or err['message'].splitlines()[0]}")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(summary.format_text(), file=sys.stderr if jsonl else sys.stdout)
+    return summary.exit_code
+
+
+def _emit_binary(ast, args) -> int:
+    # Binary AST (wodcraft.binary_ast) to --output, or raw bytes on stdout
+    from wodcraft.binary_ast import dump_ast, dumps_ast
+    if args.output and args.output != "-":
+        dump_ast(ast, args.output)
     else:
-        from wodcraft.core import parse_vnext
-        ast = parse_vnext(text)
-    print(json.dumps(ast, indent=2))
+        sys.stdout.buffer.write(dumps_ast(ast))
+        sys.stdout.buffer.flush()
     return 0
 
 
-def _to_seconds(tok: str) -> int:
-    s = str(tok).strip()
-    if ":" in s:
-        try:
-            m, sec = s.split(":", 1)
-            return int(m) * 60 + int(sec)
-        except Exception:
-            return 0
-    if s.endswith("min"):
-        try:
-            return int(s[:-3]) * 60
-        except Exception:
-            return 0
-    if s.endswith("m"):
-        try:
-            return int(s[:-1]) * 60
-        except Exception:
-            return 0
-    if s.endswith("h"):
-        try:
-            return int(s[:-1]) * 3600
-        except Exception:
-            return 0
-    if s.endswith("s"):
+def cmd_parse(args):
+    if not _single_file(args):
+        option = ("--format binary" if args.format == "binary" else "--mode legacy" if args.mode == "legacy"
+                  else "--profile" if args.profile else None)
+        if option:
+            print(f"✗ {option} takes a single file", file=sys.stderr)
+            return 2
+        return _batch(args, parse=True)
+    text = Path(args.files[0]).read_text()
+    if args.mode == "legacy":
+        # Legacy WOD syntax: the legacy grammar is only built when asked for
+        from wodcraft.core import WODCraftError, parse_legacy
+        if args.format != "json":
+            print("✗ --mode legacy writes JSON only", file=sys.stderr)
+            return 2
         try:
-            return int(s[:-1])
-        except Exception:
-            return 0
-    try:
-        return int(s)
-    except Exception:
-        return 0
+            ast = parse_legacy(text)
+        except WODCraftError as e:
+            print(f"✗ Invalid syntax: {e}", file=sys.stderr)
+            return 1
+    elif args.profile:
+        from wodcraft.core import profile_parsing, parse_vnext
+        with profile_parsing() as profile:
+            ast = parse_vnext(text, lean=args.lean)
+        # On stderr, so the AST on stdout stays usable
+        if args.profile == "json":
+            print(json.dumps(profile.as_dict(), indent=2), file=sys.stderr)
+        else:
+            print(profile.format_table(), file=sys.stderr)
+    else:
+        from wodcraft.core import parse_vnext
+        ast = parse_vnext(text, lean=args.lean)
+    if args.format == "binary":
+        return _emit_binary(ast, args)
+    return _emit_json(ast, args)
 
 
-def _flatten_form(node):
-    if isinstance(node, (str, int, float)):
-        yield str(node)
-    elif isinstance(node, dict):
-        # Try explicit keys first
-        if "type" in node and isinstance(node["type"], str) and node["type"] not in ("WOD", "WOD_FORM"):
-            yield str(node["type"])
-        for v in node.values():
-            if isinstance(v, (list, dict, str, int, float)):
-                yield from _flatten_form(v)
-    elif isinstance(node, list):
-        for v in node:
-            yield from _flatten_form(v)
-
-
-def _infer_wod_form(form) -> tuple[str, int | None]:
-    # Returns (form_type, duration_seconds or None)
-    toks = list(_flatten_form(form))
-    ftype = None
-    dur = None
-    # pick first known keyword
-    for kw in ("AMRAP", "EMOM", "ForTime", "RFT", "TABATA"):
-        if any(kw.lower() == t.lower() for t in toks):
-            ftype = kw
-            break
-    # look for duration-like tokens
-    for t in toks:
-        if any(ch.isdigit() for ch in t) and any(ch in t for ch in (":", "m", "min", "s", "h")):
-            sec = _to_seconds(t)
-            if sec:
-                dur = sec
-                break
-    # ForTime can specify cap after 'cap'
-    if (ftype == "ForTime" or (ftype is None and any("ForTime" in t for t in toks))) and dur is None:
-        # scan for token 'cap' then next duration token
-        for i, t in enumerate(toks):
-            if t.lower() == "cap" and i + 1 < len(toks):
-                sec = _to_seconds(toks[i + 1])
-                if sec:
-                    dur = sec
-                    break
-    return (ftype or "WOD", dur)
+def _session_compiler(args):
+    # SessionCompiler for session/run/results, with the on-disk cache when configured
+    from wodcraft.sdk import session_compiler
+    return session_compiler(args.modules_path, getattr(args, "cache_dir", None))
 
 
 def cmd_run(args):
-    # Unified WODCraft run: compile session and emit a simple timeline
-    from wodcraft.core import parse_vnext, FileSystemResolver, SessionCompiler
+    # Unified WODCraft run: compile session and emit a simple timeline (same as `wodc serve` run)
+    from wodcraft.core import parse_vnext
+    from wodcraft.sdk import timeline as sdk_timeline
     p = Path(args.file)
     text = p.read_text()
     ast = parse_vnext(text)
     if not ast.get("sessions"):
         print("✗ No session found in file")
         return 1
-    resolver = FileSystemResolver(Path(args.modules_path))
-    compiler = SessionCompiler(resolver)
+    compiler = _session_compiler(args)
     session_ast = ast["sessions"][0]
     compiled = compiler.compile_session(session_ast)
-    sess = compiled.get("session", {})
-    comps = sess.get("components", {})
-    t = 0
-    total = 0
-    unknown = False
-    segments = []
-    order = ["warmup", "skill", "strength", "wod"]
-    for kind in order:
-        if kind in comps:
-            comp = comps[kind].get("component", {})
-            title = comp.get("title") or kind.title()
-            seg = {"kind": kind, "title": title, "start_s": t}
-            dur = None
-            if kind == "wod":
-                form = comp.get("form")
-                ftype, fdur = _infer_wod_form(form)
-                seg["form"] = ftype
-                if fdur:
-                    dur = fdur
-            # Accumulate
-            seg["duration_s"] = dur
-            segments.append(seg)
-            if dur is None:
-                unknown = True
-            else:
-                t += dur
-                total += dur
-    timeline = {
-        "session_title": sess.get("title"),
-        "total_duration_s": None if unknown else total,
-        "segments": segments,
-    }
+    timeline = sdk_timeline(compiled)
     if args.format == "json":
         print(json.dumps({"timeline": timeline}, indent=2))
     else:
         # text
         lines = [f"Session: {timeline['session_title']}"]
-        for seg in segments:
+        for seg in timeline["segments"]:
             base = f"- {seg['kind'].title()}: {seg['title']}"
             if seg.get("form"):
                 base += f" ({seg['form']})"
@@ -250,7 +187,25 @@ def cmd_export(args):
 
 
 def cmd_validate(args):
-    text = Path(args.file).read_text()
+    if args.format == "jsonl" or not _single_file(args):
+        return _batch(args, parse=False)
+    text = Path(args.files[0]).read_text()
+    if args.fast:
+        from wodcraft.quickcheck import quick_check
+        error = quick_check(text)
+        if error is not None:
+            print(f"✗ Invalid syntax: {error}")
+            return 1
+    if args.all_errors:
+        from wodcraft.core import parse_vnext_recover
+        _, errors = parse_vnext_recover(text)
+        for e in errors:
+            print(f"✗ Invalid syntax: {e}")
+        if errors:
+            print(f"✗ {len(errors)} syntax error(s)")
+            return 1
+        print("✓ Valid WODCraft syntax")
+        return 0
     from wodcraft.core import parse_vnext
     try:
         parse_vnext(text)
@@ -262,34 +217,59 @@ def cmd_validate(args):
 
 
 def cmd_session(args):
-    from wodcraft.core import parse_vnext, FileSystemResolver, SessionCompiler
+    from wodcraft.core import parse_vnext
     text = Path(args.file).read_text()
     ast = parse_vnext(text)
     if not ast.get("sessions"):
         print("✗ No session found in file")
         return 1
-    resolver = FileSystemResolver(Path(args.modules_path))
-    compiler = SessionCompiler(resolver)
+    compiler = _session_compiler(args)
+    if args.all:
+        return _emit_sessions(compiler.compile_many(ast["sessions"], jobs=args.jobs, executor=args.executor), args)
     session_ast = ast["sessions"][0]
     compiled = compiler.compile_session(session_ast)
-    if args.format == "json":
-        print(compiler.export_json(compiled))
-    elif args.format == "ics":
-        print(compiler.export_ics(compiled))
-    else:
-        print(json.dumps(compiled, indent=2))
-    return 0
+    if args.format == "ics":
+        from wodcraft.jsonio import open_output
+        out = open_output(args.output)
+        try:
+            print(compiler.export_ics(compiled), file=out)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return 0
+    return _emit_json(compiled, args)
+
+
+def _emit_sessions(records, args) -> int:
+    # `wodc session --all`: one record per session (JSON list or JSON lines); exit 1 if any failed
+    from wodcraft.jsonio import open_output, write_json, write_jsonl
+    if args.format == "ics":
+        print("✗ --all writes json or jsonl", file=sys.stderr)
+        return 2
+    out = open_output(args.output)
+    try:
+        if args.format == "jsonl":
+            write_jsonl(records, out)
+        else:
+            write_json({"sessions": records}, out, compact=args.compact)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    failed = [record for record in records if not record["ok"]]
+    for record in failed:
+        print(f"✗ Session {record['index']} ({record['title']}): {record['error']['message'].splitlines()[0]}",
+              file=sys.stderr)
+    return 1 if failed else 0
 
 
 def cmd_results(args):
-    from wodcraft.core import parse_vnext, FileSystemResolver, SessionCompiler, TeamRealizedAggregator
+    from wodcraft.core import parse_vnext, TeamRealizedAggregator
     text = Path(args.file).read_text()
     ast = parse_vnext(text)
     if not ast.get("sessions"):
         print("✗ No session found in file")
         return 1
-    resolver = FileSystemResolver(Path(args.modules_path))
-    compiler = SessionCompiler(resolver)
+    compiler = _session_compiler(args)
     session_ast = ast["sessions"][0]
     compiled = compiler.compile_session(session_ast)
     results = compiled.get("session", {}).get("results")
@@ -299,6 +279,136 @@ def cmd_results(args):
     return 0
 
 
+def cmd_deps(args):
+    # Import graph of every session in the given files, as JSON or Graphviz dot
+    from wodcraft.batch import expand_inputs
+    from wodcraft.core import DependencyGraph, SessionCompiler, WODCraftError, parse_vnext
+    from wodcraft.jsonio import open_output, write_json
+    files = expand_inputs(args.files)
+    if not files:
+        print("✗ No .wod files matched", file=sys.stderr)
+        return 2
+    compiler = SessionCompiler(_resolver(args.modules_path))
+    graph = DependencyGraph()
+    for path in files:
+        try:
+            sessions = parse_vnext(path.read_text(encoding="utf-8")).get("sessions") or []
+        except (OSError, WODCraftError) as e:
+            print(f"✗ {path}: {e}", file=sys.stderr)
+            return 1
+        compiler.dependency_graph(sessions, graph, file=str(path) if len(files) > 1 else None)
+    if not args.no_resolve:
+        compiler.prefetch(graph, jobs=args.jobs)
+    out = open_output(args.output)
+    try:
+        if args.format == "dot":
+            print(graph.to_dot(), file=out)
+        else:
+            write_json(graph.to_dict(), out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    failed = [name for name, status in graph.status.items() if status["status"] == "error"]
+    for name in failed:
+        print(f"✗ {name}: {graph.status[name]['error']['message'].splitlines()[0]}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def cmd_watch(args):
+    # Compile every session of the given files, then recompile the affected ones as modules change
+    import time
+    from wodcraft.batch import expand_inputs
+    from wodcraft.watch import SessionWatch
+    files = expand_inputs(args.files)
+    if not files:
+        print("✗ No .wod files matched", file=sys.stderr)
+        return 2
+    watch = SessionWatch(files, args.modules_path, backend=args.backend, interval=args.interval, jobs=args.jobs)
+    print(f"… Watching {args.modules_path} ({watch.watcher.backend}), Ctrl-C to stop", file=sys.stderr)
+    deadline = time.monotonic() + args.duration if args.duration else None
+    try:
+        _report_watch(watch.start(), args)
+        while deadline is None or time.monotonic() < deadline:
+            _report_watch(watch.step(args.interval), args)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watch.close()
+    return 0
+
+
+def _report_watch(records, args):
+    # `wodc watch`: JSON lines, or one status line per recompiled session
+    if args.format == "jsonl":
+        from wodcraft.jsonio import write_jsonl
+        write_jsonl(records, sys.stdout)
+    else:
+        import time
+        stamp = time.strftime("%H:%M:%S")
+        for record in records:
+            name = record["file"] + (f"#{record['index']}" if record["index"] is not None else "")
+            name += f" ({record['title']})" if record["title"] else ""
+            if record["ok"]:
+                print(f"{stamp} ✓ {name}")
+            else:
+                print(f"{stamp} ✗ {name}: {record['error']['message'].splitlines()[0]}")
+    sys.stdout.flush()
+
+
+def _resolver(modules_path):
+    # Modules directory, or a .wodpack bundle
+    from wodcraft.bundle import open_resolver
+    return open_resolver(modules_path)
+
+
+def cmd_bundle_build(args):
+    # Pack a modules directory into a single .wodpack file
+    from wodcraft.bundle import build_bundle
+    if not Path(args.modules_dir).is_dir():
+        print(f"✗ Not a directory: {args.modules_dir}", file=sys.stderr)
+        return 2
+    stats = build_bundle(args.modules_dir, args.output, asts=not args.no_ast)
+    print(f"✓ {stats['bundle']}: {stats['modules']} modules ({stats['asts']} with ASTs), "
+          f"{stats['bytes']} bytes in {stats['build_ms']} ms")
+    for name in stats["failed"]:
+        print(f"⚠ {name}: does not parse, packed without AST", file=sys.stderr)
+    return 0
+
+
+def cmd_cache(args):
+    from wodcraft.cache import DiskCache, default_cache_dir
+    cache = DiskCache(args.cache_dir or default_cache_dir(), max_bytes=args.max_bytes)
+    if args.cache_cmd == "clear":
+        removed = cache.clear()
+        print(f"✓ Removed {removed} cached session(s) from {cache.directory}")
+    elif args.cache_cmd == "prune":
+        removed = cache.prune()
+        print(f"✓ Pruned {removed} cached session(s) from {cache.directory}")
+    else:
+        print(json.dumps(cache.stats(), indent=2))
+    return 0
+
+
+def cmd_serve(args):
+    # Long-lived JSON-lines worker on stdin/stdout (one warm parser/compiler)
+    from wodcraft.service import Worker, serve
+    return serve(Worker(args.modules_path, args.cache_dir))
+
+
+def cmd_http(args):
+    # Local HTTP compile service backed by a pool of warm worker processes
+    from wodcraft.http_service import serve_http
+    return serve_http(args.host, args.port, args.workers, args.modules_path, args.cache_dir)
+
+
+def cmd_lsp(args):
+    # Language server over stdio (warm documents, compiler and completion indexes)
+    from wodcraft.lsp import LanguageServer, serve_lsp
+    server = LanguageServer(args.modules_path, args.cache_dir, debounce=args.debounce_ms / 1000.0,
+                            catalog_path=args.catalog, trace=args.trace)
+    return serve_lsp(server)
+
+
 def cmd_catalog_build(args):
     # thin wrapper
     from scripts.build_catalog import main as build
@@ -306,6 +416,40 @@ def cmd_catalog_build(args):
     return 0
 
 
+def cmd_info(args):
+    # Report versions and which path the parser was loaded from
+    import time
+    from wodcraft.core import parser_info
+    started = time.perf_counter()
+    info = parser_info()
+    info["parser_ready_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    try:
+        from importlib.metadata import version as _pkg_version  # type: ignore
+        info["wodcraft_version"] = _pkg_version("wodcraft")
+    except Exception:
+        info["wodcraft_version"] = None
+    if args.format == "json":
+        print(json.dumps(info, indent=2))
+        return 0
+    origin = info.get("origin") or {}
+    lines = [
+        f"wodc {info['wodcraft_version'] or 'unknown'}",
+        f"lark {info['lark_version']}",
+        f"grammar {info['grammar_hash'][:16]}",
+        f"artifact {info['artifact_path']} ({origin.get('artifact_status', 'unknown')})",
+        f"parser loaded from {origin.get('source', 'unknown')} in {info['parser_ready_ms']} ms",
+    ]
+    print("\n".join(lines))
+    return 0
+
+
+def cmd_parser_build(args):
+    from wodcraft.core import save_parser_artifact
+    path = save_parser_artifact(args.output)
+    print(f"✓ Parser artifact written to {path}")
+    return 0
+
+
 REPO_URL = os.environ.get("WODCRAFT_DOCS_URL", "https://github.com/Nicolas78240/WODCraft")
 
 
@@ -336,12 +480,25 @@ def main(argv=None):
         "parse",
         help="Parse a WODCraft file and print its JSON AST",
         description=(
-            "Parse a WODCraft source file and emit a JSON AST.\n\n"
-            "Examples:\n  wodc parse examples/language/team_realized_session.wod"
+            "Parse a WODCraft source file and emit a JSON AST. With several files, globs or\n"
+            "directories, emits one JSON line per file ({file, ok, ast|error}) and a summary on stderr.\n\n"
+            "Examples:\n  wodc parse examples/language/team_realized_session.wod\n"
+            "  wodc parse examples/wods --jobs 4 > asts.jsonl"
         ),
     )
-    p_parse.add_argument("file", help="Path to .wod file")
-    p_parse.add_argument("--mode", choices=["legacy", "vnext"], help=argparse.SUPPRESS)
+    p_parse.add_argument("files", nargs="+", metavar="file", help="Path(s) to .wod files, directories or globs")
+    p_parse.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for several files (0 = all CPUs)")
+    p_parse.add_argument("--unordered", action="store_true", help="Stream results as they finish instead of in input order")
+    p_parse.add_argument("--format", choices=["json", "jsonl", "binary"], default="json",
+                         help="json (one document), jsonl (one record per top-level node / realized event)\n"
+                              "or binary (compact AST for sdk.load_ast, single file)")
+    p_parse.add_argument("--compact", action="store_true", help="Single-line JSON (fast backend if installed)")
+    p_parse.add_argument("--lean", action="store_true", help="Leave out re-derivable fields (smaller AST)")
+    p_parse.add_argument("-o", "--output", help="Write to this file instead of stdout")
+    p_parse.add_argument("--mode", choices=["legacy", "vnext"], default="vnext",
+                         help="legacy: parse pre-language WOD/BLOCK syntax (single file; grammar built on demand)")
+    p_parse.add_argument("--profile", nargs="?", const="table", choices=["table", "json"],
+                         help="Time the parse per phase and per transformer method; report on stderr (single file)")
     p_parse.set_defaults(func=cmd_parse)
 
     p_lint = sub.add_parser(
@@ -367,7 +524,8 @@ def main(argv=None):
         ),
     )
     p_run.add_argument("file", help="Path to .wod file with a session block")
-    p_run.add_argument("--modules-path", default="modules", help="Path to modules directory")
+    p_run.add_argument("--modules-path", default="modules", help="Modules directory or .wodpack bundle")
+    p_run.add_argument("--cache-dir", help="Persistent compiled-session cache (default: $WODCRAFT_CACHE_DIR, else off)")
     p_run.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
     p_run.set_defaults(func=cmd_run)
 
@@ -387,11 +545,22 @@ def main(argv=None):
         "validate",
         help="Validate WODCraft syntax",
         description=(
-            "Validate the file against the WODCraft grammar.\n\n"
-            "Examples:\n  wodc validate file.wod"
+            "Validate files against the WODCraft grammar. Accepts several files, globs and\n"
+            "directories; prints failures and a summary (or JSON lines with --format jsonl).\n"
+            "Exit code: 0 all valid, 1 syntax errors, 2 unreadable files.\n\n"
+            "Examples:\n  wodc validate file.wod\n  wodc validate file.wod --all-errors\n"
+            "  wodc validate examples/wods --jobs 0\n  wodc validate 'inbox/*.wod' --fast\n"
+            "  wodc validate 'examples/wods/**/*.wod' --format jsonl --unordered"
         ),
     )
-    p_validate.add_argument("file", help="Path to .wod file")
+    p_validate.add_argument("files", nargs="+", metavar="file", help="Path(s) to .wod files, directories or globs")
+    p_validate.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes (0 = all CPUs)")
+    p_validate.add_argument("--format", choices=["text", "jsonl"], default="text", help="Output format")
+    p_validate.add_argument("--unordered", action="store_true", help="Stream results as they finish instead of in input order")
+    p_validate.add_argument("--all-errors", action="store_true",
+                            help="Recover from syntax errors and report all of them, not just the first")
+    p_validate.add_argument("--fast", action="store_true",
+                            help="Reject obviously malformed input with a lexer/brace pre-check before parsing")
     p_validate.set_defaults(func=cmd_validate)
 
     p_session = sub.add_parser(
@@ -399,13 +568,24 @@ def main(argv=None):
         help="Compile a session (resolve modules) and export JSON or ICS",
         description=(
             "Compile the first session in the file: resolves module imports, applies overrides,\n"
-            "and exports a structured session JSON or an ICS calendar event.\n\n"
-            "Examples:\n  wodc session file.wod --modules-path modules --format json"
+            "and exports a structured session JSON or an ICS calendar event. With --all, every\n"
+            "session is compiled (shared imports resolved once) into one record per session.\n\n"
+            "Examples:\n  wodc session file.wod --modules-path modules --format json\n"
+            "  wodc session week.wod --all --jobs 4 --format jsonl"
         ),
     )
     p_session.add_argument("file", help="Path to .wod file with a session block")
-    p_session.add_argument("--modules-path", default="modules", help="Path to modules directory")
-    p_session.add_argument("--format", choices=["json", "ics"], default="json", help="Export format")
+    p_session.add_argument("--modules-path", default="modules", help="Modules directory or .wodpack bundle")
+    p_session.add_argument("--cache-dir", help="Persistent compiled-session cache (default: $WODCRAFT_CACHE_DIR, else off)")
+    p_session.add_argument("--format", choices=["json", "jsonl", "ics"], default="json",
+                           help="Export format (jsonl: one record per section / realized event)")
+    p_session.add_argument("--compact", action="store_true", help="Single-line JSON (fast backend if installed)")
+    p_session.add_argument("-o", "--output", help="Write to this file instead of stdout")
+    p_session.add_argument("--all", action="store_true",
+                           help="Compile every session in the file (default: the first one), one record each")
+    p_session.add_argument("--jobs", "-j", type=int, default=1, help="With --all: sessions compiled in parallel (0 = all CPUs)")
+    p_session.add_argument("--executor", choices=["thread", "process"], default="thread",
+                           help="With --all --jobs N: thread pool or worker processes")
     p_session.set_defaults(func=cmd_session)
 
     p_results = sub.add_parser(
@@ -417,9 +597,108 @@ def main(argv=None):
         ),
     )
     p_results.add_argument("file", help="Path to .wod file with a session block")
-    p_results.add_argument("--modules-path", default="modules", help="Path to modules directory")
+    p_results.add_argument("--modules-path", default="modules", help="Modules directory or .wodpack bundle")
+    p_results.add_argument("--cache-dir", help="Persistent compiled-session cache (default: $WODCRAFT_CACHE_DIR, else off)")
     p_results.set_defaults(func=cmd_results)
 
+    p_serve = sub.add_parser(
+        "serve",
+        help="Run a long-lived JSON-lines worker on stdin/stdout",
+        description=(
+            "Keep one warm parser and compiler in memory and answer newline-delimited JSON\n"
+            "requests (parse, validate, lint, session, run, results, stats, shutdown).\n\n"
+            "Examples:\n"
+            "  echo '{\"id\": 1, \"method\": \"validate\", \"params\": {\"path\": \"file.wod\"}}' | wodc serve"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    p_serve.add_argument("--modules-path", default="modules", help="Default modules directory or .wodpack bundle")
+    p_serve.add_argument("--cache-dir", help="Persistent compiled-session cache (default: $WODCRAFT_CACHE_DIR, else off)")
+    p_serve.set_defaults(func=cmd_serve)
+
+    p_http = sub.add_parser(
+        "http",
+        help="Run a local HTTP compile service with a pool of warm workers",
+        description=(
+            "Serve POST /parse, /validate, /lint, /compile, /run, /results (JSON params or raw\n"
+            ".wod body) and GET /metrics from a pool of pre-forked worker processes.\n\n"
+            "Examples:\n"
+            "  wodc http --port 8080 --workers 4\n"
+            "  curl --data-binary @file.wod http://127.0.0.1:8080/validate"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    p_http.add_argument("--host", default="127.0.0.1", help="Bind address")
+    p_http.add_argument("--port", type=int, default=8080, help="Port (0 picks a free one)")
+    p_http.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    p_http.add_argument("--modules-path", default="modules", help="Default modules directory or .wodpack bundle")
+    p_http.add_argument("--cache-dir", help="Persistent compiled-session cache (default: $WODCRAFT_CACHE_DIR, else off)")
+    p_http.set_defaults(func=cmd_http)
+
+    p_lsp = sub.add_parser(
+        "lsp",
+        help="Run the language server (LSP over stdio) for editors",
+        description=(
+            "Language server for .wod files: diagnostics (every syntax error, unresolved imports,\n"
+            "compiler warnings) published after edits settle, and completion of movement names\n"
+            "and module refs. Parsed documents, resolved modules and indexes stay in memory.\n\n"
+            "Examples:\n"
+            "  wodc lsp --modules-path modules\n"
+            "  wodc lsp --debounce-ms 100 --trace   # per-request latency on stderr"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    p_lsp.add_argument("--modules-path", default="modules", help="Modules directory (relative to the workspace root)")
+    p_lsp.add_argument("--cache-dir", help="Persistent compiled-session cache (default: $WODCRAFT_CACHE_DIR, else off)")
+    p_lsp.add_argument("--catalog", help="Movements catalog for completion, relative to the workspace root "
+                       "(default: the catalog bundled with wodcraft)")
+    p_lsp.add_argument("--debounce-ms", type=int, default=200, help="Quiet time after an edit before diagnostics run")
+    p_lsp.add_argument("--trace", action="store_true", help="Log each request and its latency to stderr")
+    p_lsp.set_defaults(func=cmd_lsp)
+
+    p_deps = sub.add_parser(
+        "deps",
+        help="Show which modules each session imports (JSON or Graphviz dot)",
+        description=(
+            "Collect the component imports of every session in the given files into a\n"
+            "dependency graph, resolve and parse each module once (modules that cannot be\n"
+            "resolved or parsed are reported, exit code 1) and print the graph.\n\n"
+            "Examples:\n  wodc deps week.wod --format dot | dot -Tsvg > deps.svg\n"
+            "  wodc deps 'programs/**/*.wod' --modules-path modules --format json"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    p_deps.add_argument("files", nargs="+", metavar="file", help="Path(s) to .wod files, directories or globs")
+    p_deps.add_argument("--modules-path", default="modules", help="Modules directory or .wodpack bundle")
+    p_deps.add_argument("--format", choices=["json", "dot"], default="json", help="Output format")
+    p_deps.add_argument("--jobs", "-j", type=int, default=4, help="Threads resolving modules (0 = all CPUs)")
+    p_deps.add_argument("--no-resolve", action="store_true", help="Only read the imports; do not touch modules")
+    p_deps.add_argument("-o", "--output", help="Write to this file instead of stdout")
+    p_deps.set_defaults(func=cmd_deps)
+
+    p_watch = sub.add_parser(
+        "watch",
+        help="Recompile sessions live as their modules change",
+        description=(
+            "Compile every session of the given files, then watch the modules directory\n"
+            "(inotify on Linux, else polling) and recompile only the sessions importing a\n"
+            "changed module; edited session files are re-read. Resolving modules does not\n"
+            "stat files: the watcher invalidates resolved modules, module ASTs and compiled\n"
+            "sessions as changes arrive.\n\n"
+            "Examples:\n  wodc watch week.wod --modules-path modules\n"
+            "  wodc watch 'programs/**/*.wod' --format jsonl --backend poll --interval 1"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    p_watch.add_argument("files", nargs="+", metavar="file", help="Path(s) to .wod files, directories or globs")
+    p_watch.add_argument("--modules-path", default="modules", help="Path to modules directory")
+    p_watch.add_argument("--format", choices=["summary", "jsonl"], default="summary", help="Output format")
+    p_watch.add_argument("--backend", choices=["auto", "inotify", "poll"], default="auto", help="How changes are detected")
+    p_watch.add_argument("--interval", type=float, default=0.5, help="Seconds between checks of session files (and polls)")
+    p_watch.add_argument("--jobs", "-j", type=int, default=1, help="Parallel compile jobs (0 = all CPUs)")
+    p_watch.add_argument("--duration", type=float, help="Stop after this many seconds (default: until Ctrl-C)")
+    p_watch.set_defaults(func=cmd_watch)
+
     p_cat = sub.add_parser(
         "catalog",
         help="Catalog utilities (build movements catalog)",
@@ -432,6 +711,64 @@ def main(argv=None):
     p_cat_build = p_cat_sub.add_parser("build", help="Build movements catalog from sources")
     p_cat_build.set_defaults(func=cmd_catalog_build)
 
+    p_cache = sub.add_parser(
+        "cache",
+        help="Inspect or clean the on-disk compiled-session cache",
+        description=(
+            "Manage the persistent compiled-session cache used by session/run/results\n"
+            "(--cache-dir or $WODCRAFT_CACHE_DIR; defaults to ~/.cache/wodcraft here).\n\n"
+            "Examples:\n  wodc cache stats\n  wodc cache prune --max-bytes 10000000\n  wodc cache clear"
+        ),
+    )
+    p_cache.add_argument("cache_cmd", choices=["stats", "clear", "prune"], help="Action")
+    p_cache.add_argument("--cache-dir", help="Cache directory")
+    p_cache.add_argument("--max-bytes", type=int, default=64 * 1024 * 1024, help="Size budget used by prune")
+    p_cache.set_defaults(func=cmd_cache)
+
+    p_info = sub.add_parser(
+        "info",
+        help="Show versions and how the parser was loaded (artifact or grammar build)",
+        description=(
+            "Print wodcraft/lark versions, the grammar hash, and whether the parser was\n"
+            "loaded from the pre-serialized artifact or rebuilt from the grammar.\n\n"
+            "Examples:\n  wodc info\n  wodc info --format json"
+        ),
+    )
+    p_info.add_argument("--format", choices=["text", "json"], default="text", help="Output format")
+    p_info.set_defaults(func=cmd_info)
+
+    p_bundle = sub.add_parser(
+        "bundle",
+        help="Pack a modules directory into one .wodpack file",
+        description=(
+            "Pack every module (source, content hash and parsed AST) into a single SQLite\n"
+            "file. Commands taking --modules-path accept the bundle in place of the directory:\n"
+            "resolving a module is then one indexed read and its AST is not re-parsed.\n\n"
+            "Examples:\n  wodc bundle build modules/ -o modules.wodpack\n"
+            "  wodc session week.wod --modules-path modules.wodpack"
+        ),
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+    p_bundle_sub = p_bundle.add_subparsers(dest="bundle_cmd")
+    p_bundle_build = p_bundle_sub.add_parser("build", help="Build a .wodpack from a modules directory")
+    p_bundle_build.add_argument("modules_dir", help="Modules directory")
+    p_bundle_build.add_argument("-o", "--output", default="modules.wodpack", help="Bundle path")
+    p_bundle_build.add_argument("--no-ast", action="store_true", help="Store sources only (ASTs parsed on first use)")
+    p_bundle_build.set_defaults(func=cmd_bundle_build)
+
+    p_parser = sub.add_parser(
+        "parser",
+        help="Parser utilities (build the pre-serialized parser artifact)",
+        description=(
+            "Utilities around the pre-serialized LALR parser.\n\n"
+            "Examples:\n  wodc parser build"
+        ),
+    )
+    p_parser_sub = p_parser.add_subparsers(dest="parser_cmd")
+    p_parser_build = p_parser_sub.add_parser("build", help="Serialize the analysed parser into the package")
+    p_parser_build.add_argument("-o", "--output", help="Artifact path (defaults to the package location)")
+    p_parser_build.set_defaults(func=cmd_parser_build)
+
     args = ap.parse_args(argv)
     if not hasattr(args, "func"):
         ap.print_help()
@@ -21,6 +21,8 @@ Architecture:
 - WODCraftError: Enhanced error reporting with source context
 - ModuleResolver: Abstract interface for module resolution
 - FileSystemResolver: File-based module resolution with caching
+- ParserRegistry: Process-wide cache of compiled LALR parsers
+- StringTable: Process-wide interning of names, units and node types in ASTs
 
 Type System:
 - Load, Distance types with unit conversion
@@ -34,15 +36,21 @@ context visibility while maintaining clean separation of concerns.
 """
 
 import sys, json, argparse, re, os
+import hashlib
+import heapq
+import pickle
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union, Tuple
-from lark import Lark, Transformer, Token, Tree, LarkError
-from lark.exceptions import UnexpectedCharacters, UnexpectedToken
+from typing import Any, Dict, List, NamedTuple, Optional, Union, Tuple
+from lark import Lark, Transformer, Token, Tree, LarkError, __version__ as lark_version
+from lark.exceptions import UnexpectedCharacters, UnexpectedInput, UnexpectedToken, VisitError
 from dataclasses import dataclass
 from enum import Enum
 from functools import lru_cache
+from importlib import resources as importlib_resources
 import time
 from collections import OrderedDict
+from contextlib import contextmanager
 
 # Extended EBNF Grammar for the WODCraft DSL
 GRAMMAR_VNEXT = r"""
@@ -174,8 +182,34 @@ TEMPO: "tempo"
 XINT.2: /x\d+/
 MAXREP: /(?i:maxrep)/
 DIST: /\d+(?:\.\d+)?(?:m|km)\b/
+CALDUAL: /\d+(?:\.\d+)?\/\d+(?:\.\d+)?\s*cal/
+UNIT_WEIGHT: /(kg|lb|%1RM)/
+// Height units must be defined before IDENT to have priority
+UNIT_HEIGHT: /(in|cm|ft)/
+
+// Identifiers: allow ASCII letters, digits, underscore, and common Latin-1 letters
+IDENT: /[A-Za-z\u00C0-\u00D6\u00D8-\u00F6\u00F8-\u00FF][A-Za-z0-9_\u00C0-\u00D6\u00D8-\u00F6\u00F8-\u00FF]*/
+STRING: ESCAPED_STRING
+
+// Comments
+COMMENT: /\/\/[^\n]*/
+MLCOMMENT: /\/\*[\s\S]*?\*\//
+
+%import common.INT
+%import common.NUMBER
+%import common.WS
+%import common.ESCAPED_STRING
 
-// Legacy WOD support (from original grammar)
+%ignore WS
+%ignore COMMENT
+%ignore MLCOMMENT
+"""
+
+# Legacy WOD syntax (WOD/BLOCK/BUYIN..., from the original grammar). The rules
+# extend GRAMMAR_VNEXT but are unreachable from ``program`` and ambiguous for
+# LALR, so they live outside the hot grammar and are only built, with Earley,
+# by ``get_legacy_parser`` (``wodc parse --mode legacy``).
+GRAMMAR_LEGACY = r"""
 legacy_wod: wod_meta* segment*
 ?wod_meta: title | team | cap_line | score_line | tracks_decl
 title: "WOD" STRING
@@ -252,36 +286,16 @@ time: INT ":" INT -> mmss
 
 track_block: "TRACK" IDENT "{" /[^}]+/ "}"
 
-// Terminals (avoid duplicating DIST; defined earlier)
+// Terminals (DIST, CALDUAL, IDENT, ... come from GRAMMAR_VNEXT)
 TIMEQ: /\d{1,2}:\d{2}/ | /\d+s/
 LOADVAL: /\d+(?:\.\d+)?(kg|lb|cm|in|m|km|%|%1RM)\b/
 LOADDUAL: /\d+(?:\.\d+)?\/\d+(?:\.\d+)?(kg|lb|cm|in|m|km|%|%1RM)\b/
 PERCENT_LOAD: /\d+(?:\.\d+)?%(?:1RM)?/
 SHORTHAND_PATTERN: /\d+(-\d+)+/  // e.g., 21-15-9, 5-10-15-20
 REPDUAL: /\d+\/\d+/
-CALDUAL: /\d+(?:\.\d+)?\/\d+(?:\.\d+)?\s*cal/
 DISTDUAL: /\d+(?:\.\d+)?\/\d+(?:\.\d+)?(?:m|km)\b/
-UNIT_WEIGHT: /(kg|lb|%1RM)/
-// Height units must be defined before IDENT to have priority
-UNIT_HEIGHT: /(in|cm|ft)/
-
-// Identifiers: allow ASCII letters, digits, underscore, and common Latin-1 letters
-IDENT: /[A-Za-z\u00C0-\u00D6\u00D8-\u00F6\u00F8-\u00FF][A-Za-z0-9_\u00C0-\u00D6\u00D8-\u00F6\u00F8-\u00FF]*/
-STRING: ESCAPED_STRING
 
-// Comments
-COMMENT: /\/\/[^\n]*/
-MLCOMMENT: /\/\*[\s\S]*?\*\//
-
-%import common.INT
-%import common.NUMBER
-%import common.WS
 %import common.NEWLINE
-%import common.ESCAPED_STRING
-
-%ignore WS
-%ignore COMMENT
-%ignore MLCOMMENT
 """
 
 PROGRESS_RE = re.compile(r"(?P<sign>[+-]?)(?P<value>\d+(?:\.\d+)?)(?P<unit>[A-Za-z%]*)\s*/\s*(?P<cadence>[A-Za-z_][A-Za-z0-9_-]*)")
@@ -300,6 +314,209 @@ GENDER_ALIAS_MAP = {
     "woman": "female",
 }
 
+
+def grammar_hash(grammar: str) -> str:
+    """Return a stable hex digest identifying a grammar text."""
+    return hashlib.sha256(grammar.encode("utf-8")).hexdigest()
+
+
+def content_hash(source: str) -> str:
+    """Return a stable, process-independent digest of module or session source."""
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def ast_fingerprint(node: Any) -> str:
+    """
+    Return a stable, process-independent digest of an AST (or any JSON-like value).
+
+    The canonical encoding is compact JSON with sorted keys, hashed with blake2b;
+    unlike ``hash()`` it is not salted per process, so keys can be shared.
+    """
+    canonical = json.dumps(node, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Pre-serialized parser artifact (built by `make parser-build`, shipped in the wheel)
+PARSER_ARTIFACT_PATH = Path(__file__).with_name("grammar_vnext.lalr")
+PARSER_ARTIFACT_FORMAT = 1
+
+
+def save_parser_artifact(path: Optional[Union[str, Path]] = None, grammar: str = GRAMMAR_VNEXT) -> Path:
+    """
+    Analyse ``grammar`` and serialize the resulting LALR parser to ``path``.
+
+    The file starts with a small header (format, grammar hash, Lark version)
+    followed by Lark's own serialized parser, so loaders can reject stale
+    artifacts without deserializing the tables.
+    """
+    target = Path(path) if path else PARSER_ARTIFACT_PATH
+    parser = Lark(grammar, parser='lalr')
+    header = {
+        "format": PARSER_ARTIFACT_FORMAT,
+        "grammar_hash": grammar_hash(grammar),
+        "lark_version": lark_version,
+    }
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        parser.save(f)
+    os.replace(tmp, target)
+    return target
+
+
+def read_parser_artifact_header(path: Optional[Union[str, Path]] = None) -> Optional[Dict[str, Any]]:
+    """Return the artifact header, or None if the artifact is missing or unreadable"""
+    source = Path(path) if path else PARSER_ARTIFACT_PATH
+    try:
+        with open(source, "rb") as f:
+            header = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def load_parser_artifact(grammar: str = GRAMMAR_VNEXT, path: Optional[Union[str, Path]] = None,
+                         **options) -> Tuple[Optional[Lark], str]:
+    """
+    Load a serialized parser for ``grammar``.
+
+    Returns ``(parser, status)`` where status is ``"loaded"`` on success, or
+    ``"missing"``, ``"stale"`` (grammar hash, Lark version or format differ) or
+    ``"unreadable"`` when the caller must build from source instead.
+    """
+    source = Path(path) if path else PARSER_ARTIFACT_PATH
+    if not source.exists():
+        return None, "missing"
+    try:
+        with open(source, "rb") as f:
+            header = pickle.load(f)
+            if (not isinstance(header, dict)
+                    or header.get("format") != PARSER_ARTIFACT_FORMAT
+                    or header.get("grammar_hash") != grammar_hash(grammar)
+                    or header.get("lark_version") != lark_version):
+                return None, "stale"
+            return Lark.__new__(Lark)._load(pickle.load(f), **options), "loaded"
+    except Exception:
+        return None, "unreadable"
+
+
+# Parser Registry
+class ParserRegistry:
+    """
+    Process-wide cache of compiled Lark parsers.
+
+    Building a LALR parser means analysing the whole grammar and constructing
+    its tables, which costs far more than parsing a typical WOD. Parsers are
+    therefore built lazily, once per (grammar hash, options) key, and shared by
+    every caller. Lookups are thread-safe; a parser is never built twice for the
+    same key, even under concurrent first use.
+
+    Plain LALR parsers are first looked up in the pre-serialized artifact
+    (see ``save_parser_artifact``); the grammar is only analysed when the
+    artifact is missing or was built from a different grammar.
+    """
+
+    # Options Lark accepts when loading a serialized parser
+    _ARTIFACT_OPTIONS = {"transformer", "propagate_positions", "lexer_callbacks", "postlex", "debug"}
+
+    def __init__(self, artifact_path: Optional[Union[str, Path]] = PARSER_ARTIFACT_PATH):
+        self.artifact_path = Path(artifact_path) if artifact_path else None
+        self._parsers: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Lark] = {}
+        self._origins: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._builds = 0
+        self._artifact_loads = 0
+        self._hits = 0
+
+    @staticmethod
+    def _key(grammar: str, options: Dict[str, Any]) -> Tuple[str, Tuple[Tuple[str, Any], ...]]:
+        return grammar_hash(grammar), tuple(sorted(options.items()))
+
+    def _build(self, grammar: str, options: Dict[str, Any]) -> Tuple[Lark, Dict[str, Any]]:
+        started = time.perf_counter()
+        status = "disabled"
+        extra = {k: v for k, v in options.items() if k != "parser"}
+        if self.artifact_path and options.get("parser") == "lalr" and set(extra) <= self._ARTIFACT_OPTIONS:
+            parser, status = load_parser_artifact(grammar, self.artifact_path, **extra)
+            if parser is not None:
+                self._artifact_loads += 1
+                return parser, {"source": "artifact", "artifact_status": status,
+                                "seconds": time.perf_counter() - started}
+        parser = Lark(grammar, **options)
+        self._builds += 1
+        return parser, {"source": "grammar", "artifact_status": status,
+                        "seconds": time.perf_counter() - started}
+
+    def get(self, grammar: str = GRAMMAR_VNEXT, **options) -> Lark:
+        """Return the shared parser for ``grammar`` and ``options``, building it on first use"""
+        options.setdefault("parser", "lalr")
+        key = self._key(grammar, options)
+        parser = self._parsers.get(key)
+        if parser is None:
+            with self._lock:
+                parser = self._parsers.get(key)
+                if parser is None:
+                    parser, origin = self._build(grammar, options)
+                    self._parsers[key] = parser
+                    self._origins[key] = origin
+                    return parser
+        with self._lock:
+            self._hits += 1
+        return parser
+
+    def origin(self, grammar: str = GRAMMAR_VNEXT, **options) -> Optional[Dict[str, Any]]:
+        """Describe how the cached parser was obtained (artifact or grammar build)"""
+        options.setdefault("parser", "lalr")
+        return self._origins.get(self._key(grammar, options))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get registry statistics (grammar builds, artifact loads, cache hits, cached parsers)"""
+        with self._lock:
+            return {
+                "grammar_builds": self._builds,
+                "artifact_loads": self._artifact_loads,
+                "cache_hits": self._hits,
+                "parsers": len(self._parsers),
+            }
+
+    def clear(self):
+        """Drop all cached parsers and reset counters"""
+        with self._lock:
+            self._parsers.clear()
+            self._origins.clear()
+            self._builds = 0
+            self._artifact_loads = 0
+            self._hits = 0
+
+
+PARSER_REGISTRY = ParserRegistry()
+
+
+def get_parser(**options) -> Lark:
+    """Return the shared LALR parser for ``GRAMMAR_VNEXT``."""
+    return PARSER_REGISTRY.get(GRAMMAR_VNEXT, **options)
+
+
+def get_legacy_parser() -> Lark:
+    """Return the shared Earley parser for legacy WOD syntax (built on first use only)."""
+    return PARSER_REGISTRY.get(GRAMMAR_VNEXT + GRAMMAR_LEGACY, parser="earley", start="legacy_wod")
+
+
+def parser_info() -> Dict[str, Any]:
+    """Diagnostic summary of the parser load path for ``GRAMMAR_VNEXT``."""
+    get_parser()
+    header = read_parser_artifact_header(PARSER_REGISTRY.artifact_path) if PARSER_REGISTRY.artifact_path else None
+    return {
+        "lark_version": lark_version,
+        "grammar_hash": grammar_hash(GRAMMAR_VNEXT),
+        "artifact_path": str(PARSER_REGISTRY.artifact_path) if PARSER_REGISTRY.artifact_path else None,
+        "artifact_header": header,
+        "origin": PARSER_REGISTRY.origin(GRAMMAR_VNEXT),
+        "stats": PARSER_REGISTRY.stats(),
+        "interning": STRING_TABLE.stats(),
+    }
+
+
 # Type System
 class UnitType(Enum):
     KG = "kg"
@@ -570,10 +787,21 @@ class ResolvedModule:
         self.source = source
         self.ast = ast
         self.meta = meta or {}
+        self._content_hash: Optional[str] = None
+
+    @property
+    def content_hash(self) -> str:
+        """Stable digest of the module source (computed once)"""
+        if self._content_hash is None:
+            self._content_hash = content_hash(self.source)
+        return self._content_hash
 
 class ModuleResolver:
     """Abstract module resolver interface"""
 
+    # True when resolve() may be called from several threads at once (batch prefetch)
+    concurrent = False
+
     def resolve(self, ref: ModuleRef) -> ResolvedModule:
         """Resolve a module reference to its AST and metadata"""
         raise NotImplementedError("Subclasses must implement resolve method")
@@ -585,6 +813,8 @@ class ModuleResolver:
 class InMemoryResolver(ModuleResolver):
     """In-memory module registry for testing"""
 
+    concurrent = True
+
     def __init__(self):
         self.registry: Dict[str, str] = {}
 
@@ -607,107 +837,640 @@ class InMemoryResolver(ModuleResolver):
                 refs.append(ModuleRef(ns, name, version))
         return refs
 
-class FileSystemResolver(ModuleResolver):
-    """File-based module resolver with intelligent caching"""
+# Module declaration at the start of a line; a missing version means v1
+_MODULE_DECL = re.compile(rb"(?m)^[ \t]*module\s+[^\s{]+(?:\s+(v\d+(?:\.\d+)?))?\s*\{")
+MODULE_SUFFIXES = (".wod", ".wodcraft")
+
+
+class IndexEntry(NamedTuple):
+    """Where one module version lives: file, byte range of its block, digest of the block text"""
+    path: str
+    offset: int
+    end: int
+    content_hash: str
+
+
+class ModuleIndex:
+    """
+    ``namespace.name@version`` -> IndexEntry for every module file under a directory.
+
+    Files follow the resolver layout (``namespace/name.wod``, nested
+    directories add dotted name parts) and each ``module ... vN {`` block in a
+    file is one version. Building reads every file once; ``refresh`` re-scans
+    only the directories whose mtime changed (files added, removed or renamed)
+    and ``update_file`` re-reads a single file whose mtime or size changed.
+    When ``name.wod`` and ``name.wodcraft`` both define a version, ``.wod`` wins.
+    """
 
     def __init__(self, base_path: Path):
         self.base_path = Path(base_path)
-        self._cache: Dict[str, Tuple[float, ResolvedModule]] = {}  # key -> (mtime, module)
+        self.entries: Dict[str, IndexEntry] = {}
+        self.files_read = 0
+        self._files: Dict[str, Tuple[int, int, Dict[str, IndexEntry]]] = {}  # path -> (mtime_ns, size, entries)
+        self._dirs: Dict[str, int] = {}  # directory -> mtime_ns
+        self._built = False
+
+    def ensure(self) -> None:
+        if not self._built:
+            self.build()
+
+    def build(self) -> None:
+        self.entries.clear()
+        self._files.clear()
+        self._dirs.clear()
+        self._scan(str(self.base_path))
+        self._built = True
+
+    def refresh(self) -> int:
+        """Re-scan directories whose mtime changed; returns how many did"""
+        if not self._built:
+            self.build()
+            return len(self._dirs)
+        changed = 0
+        for directory, mtime in list(self._dirs.items()):
+            if directory not in self._dirs:  # forgotten with a removed parent
+                continue
+            try:
+                current = os.stat(directory).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                changed += 1
+                self._rescan(directory)
+        return changed
+
+    def versions(self, name: str) -> List[str]:
+        """Indexed versions of ``namespace.name``"""
+        prefix = f"{name}@"
+        return sorted(key[len(prefix):] for key in self.entries if key.startswith(prefix))
+
+    def update_file(self, path: str) -> bool:
+        """Re-index one file if its mtime or size changed (or drop it if gone); True when it did"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return self.remove_file(path)
+        known = self._files.get(path)
+        if known is not None and (known[0], known[1]) == (st.st_mtime_ns, st.st_size):
+            return False
+        with open(path, "rb") as f:
+            data = f.read()
+        self.files_read += 1
+        self._drop(path)
+        entries = self._parse_file(path, data)
+        self._files[path] = (st.st_mtime_ns, st.st_size, entries)
+        for key, entry in entries.items():
+            current = self.entries.get(key)
+            if current is None or self._preferred(entry.path, current.path):
+                self.entries[key] = entry
+        return True
+
+    def update_path(self, path: str) -> None:
+        """Bring one changed path (file or directory, existing or removed) up to date"""
+        if os.path.isdir(path):
+            if path not in self._dirs:
+                self._scan(path)
+                return
+            prefix = path + os.sep
+            for directory in [d for d in self._dirs if d == path or d.startswith(prefix)]:
+                if directory in self._dirs:
+                    self._rescan(directory)
+        elif path in self._dirs:
+            self._forget(path)
+        elif path in self._files or path.endswith(MODULE_SUFFIXES):
+            self.update_file(path)
+
+    def remove_file(self, path: str) -> bool:
+        if path not in self._files:
+            return False
+        self._drop(path)
+        return True
+
+    def _parse_file(self, path: str, data: bytes) -> Dict[str, IndexEntry]:
+        parts = Path(path).relative_to(self.base_path).with_suffix("").parts
+        if len(parts) < 2:  # files directly under the base directory have no namespace
+            return {}
+        name = f"{parts[0]}.{'.'.join(parts[1:])}"
+        starts = [(m.start(), (m.group(1) or b"v1").decode("ascii")) for m in _MODULE_DECL.finditer(data)]
+        starts = starts or [(0, "v1")]
+        entries: Dict[str, IndexEntry] = {}
+        for i, (offset, version) in enumerate(starts):
+            end = starts[i + 1][0] if i + 1 < len(starts) else len(data)
+            text = data[offset:end].decode("utf-8", errors="replace")
+            entries.setdefault(f"{name}@{version}", IndexEntry(path, offset, end, content_hash(text)))
+        return entries
+
+    @staticmethod
+    def _preferred(path: str, other: str) -> bool:
+        return path.endswith(".wod") and not other.endswith(".wod")
+
+    def _drop(self, path: str) -> None:
+        known = self._files.pop(path, None)
+        if known is None:
+            return
+        for key in known[2]:
+            current = self.entries.get(key)
+            if current is not None and current.path == path:
+                del self.entries[key]
+                # Another file may define the same version (name.wod vs name.wodcraft)
+                for _, _, entries in self._files.values():
+                    if key in entries:
+                        self.entries[key] = entries[key]
+                        break
+
+    def _scan(self, directory: str) -> None:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            children = list(os.scandir(directory))
+        except OSError:
+            return
+        self._dirs[directory] = mtime
+        for child in children:
+            if child.is_dir():
+                self._scan(child.path)
+            elif child.name.endswith(MODULE_SUFFIXES):
+                self.update_file(child.path)
 
-    def resolve(self, ref: ModuleRef) -> ResolvedModule:
-        # Convert namespace.name to file path: namespace/name.(wod|wodcraft)
-        name_path = ref.name.replace('.', '/')
-        candidates = [
-            self.base_path / ref.namespace / f"{name_path}.wod",
-            self.base_path / ref.namespace / f"{name_path}.wodcraft",
-        ]
-        file_path = None
-        for c in candidates:
-            if c.exists():
-                file_path = c
-                break
-        if not file_path:
-            raise ValueError(f"Module file not found: {candidates[0]}")
+    def _rescan(self, directory: str) -> None:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+            children = list(os.scandir(directory))
+        except OSError:
+            self._forget(directory)
+            return
+        self._dirs[directory] = mtime
+        files = {path for path in self._files if os.path.dirname(path) == directory}
+        subdirs = {path for path in self._dirs if os.path.dirname(path) == directory}
+        for child in children:
+            if child.is_dir():
+                subdirs.discard(child.path)
+                if child.path not in self._dirs:
+                    self._scan(child.path)
+            elif child.name.endswith(MODULE_SUFFIXES):
+                files.discard(child.path)
+                self.update_file(child.path)  # unchanged files are not re-read
+        for path in files:
+            self.remove_file(path)
+        for path in subdirs:
+            self._forget(path)
+
+    def _forget(self, directory: str) -> None:
+        prefix = directory + os.sep
+        for path in [p for p in self._files if p.startswith(prefix)]:
+            self.remove_file(path)
+        for path in [d for d in self._dirs if d == directory or d.startswith(prefix)]:
+            del self._dirs[path]
 
-        # Check cache with mtime validation
-        cache_key = str(file_path)
-        file_mtime = file_path.stat().st_mtime
 
-        if cache_key in self._cache:
-            cached_mtime, cached_module = self._cache[cache_key]
-            if cached_mtime >= file_mtime:
-                return cached_module
+class FileSystemResolver(ModuleResolver):
+    """
+    File-based module resolver backed by a ModuleIndex.
+
+    ``resolve`` is a lookup of ``namespace.name@version`` in the index, built
+    on first use. With ``verify`` (the default) it also stats the module's
+    file so in-place edits are picked up, and unknown modules trigger an
+    index refresh before failing. Without ``verify``, resolving never touches
+    the file system beyond reading a module not served before: freshness is
+    then up to whoever calls ``invalidate`` (see ``wodcraft.watch``). ``list``
+    answers from the index without reading module bodies.
+    """
+
+    concurrent = True
 
-        # Read and cache
-        with open(file_path, 'r') as f:
-            source = f.read()
+    def __init__(self, base_path: Path, verify: bool = True):
+        self.base_path = Path(base_path)
+        self.verify = verify
+        self.index = ModuleIndex(self.base_path)
+        self._cache: Dict[str, ResolvedModule] = {}  # key -> module (content hash checked on reuse)
+        self._lock = threading.RLock()
 
-        resolved = ResolvedModule(source)
-        self._cache[cache_key] = (file_mtime, resolved)
+    def resolve(self, ref: ModuleRef) -> ResolvedModule:
+        key = ref.full_name
+        with self._lock:
+            self.index.ensure()
+            entry = self.index.entries.get(key)
+            if entry is not None and self.verify and self.index.update_file(entry.path):
+                entry = self.index.entries.get(key)
+            if entry is None and self.verify and self.index.refresh():
+                entry = self.index.entries.get(key)
+        if entry is None:
+            raise self._not_found(ref)
+
+        cached = self._cache.get(key)
+        if cached is not None and cached.content_hash == entry.content_hash:
+            return cached
+
+        with open(entry.path, "rb") as f:
+            f.seek(entry.offset)
+            source = f.read(entry.end - entry.offset).decode("utf-8", errors="replace")
+        resolved = ResolvedModule(source, meta={"path": entry.path, "offset": entry.offset})
+        resolved._content_hash = entry.content_hash
+        self._cache[key] = resolved
         return resolved
 
     def list(self, namespace: Optional[str] = None) -> List[ModuleRef]:
+        with self._lock:
+            self.index.refresh()
+            keys = sorted(self.index.entries)
         refs = []
-        search_path = self.base_path / namespace if namespace else self.base_path
-        for pattern in ("*.wod", "*.wodcraft"):
-            for file_path in search_path.rglob(pattern):
-                relative = file_path.relative_to(self.base_path)
-                parts = relative.with_suffix('').parts
-                if len(parts) >= 2:
-                    ns = parts[0]
-                    name = ".".join(parts[1:])
-                    # Extract version from file content if present, fallback to v1
-                    version = self._extract_version_from_file(file_path)
-                    refs.append(ModuleRef(ns, name, version))
+        for key in keys:
+            ns_name, version = key.split("@")
+            ns, name = ns_name.split(".", 1)
+            if not namespace or ns == namespace:
+                refs.append(ModuleRef(ns, name, version))
         return refs
 
-    def _extract_version_from_file(self, file_path: Path) -> str:
-        """Extract version from module declaration in file"""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-            # Look for module declarations like "module wod.name v2 {"
-            import re
-            match = re.search(r'module\s+[\w.]+\s+v(\d+)\s*\{', content)
-            if match:
-                return f"v{match.group(1)}"
-        except Exception:
-            pass
-        return "v1"  # fallback
+    def invalidate(self, paths) -> Dict[str, Optional[str]]:
+        """
+        Re-index changed paths (files or directories) and forget the modules they affect.
+
+        Returns ``{module id: content hash served before (None if new)}`` for
+        every module version added, removed or changed.
+        """
+        with self._lock:
+            self.index.ensure()
+            before = dict(self.index.entries)
+            for path in paths:
+                self.index.update_path(os.path.normpath(str(path)))
+            after = self.index.entries
+            changed = {key: entry.content_hash for key, entry in before.items() if after.get(key) != entry}
+            changed.update((key, None) for key in after if key not in before)
+            for key in changed:
+                self._cache.pop(key, None)
+        return changed
+
+    def _not_found(self, ref: ModuleRef) -> ValueError:
+        versions = self.index.versions(f"{ref.namespace}.{ref.name}")
+        if versions:
+            return ValueError(f"Module version not found: {ref.full_name} (available: {', '.join(versions)})")
+        name_path = ref.name.replace('.', '/')
+        return ValueError(f"Module file not found: {self.base_path / ref.namespace / f'{name_path}.wod'}")
+
+class DependencyGraph:
+    """
+    Sessions and the modules they import, for a batch of sessions.
+
+    Nodes are sessions (``session:<index>``, or ``<file>#<index>`` when added
+    with a file) and modules (``namespace.name@version``); an edge goes from a
+    session to each module one of its components imports. Modules import
+    nothing, so the graph is a DAG and ``topological_order`` lists every
+    module before the sessions that need it. ``status`` records, per module,
+    how the prefetch went (see ``SessionCompiler.prefetch``).
+    """
+
+    def __init__(self):
+        self.sessions: List[Dict[str, Any]] = []
+        self.modules: Dict[str, ModuleRef] = {}
+        self.edges: List[Tuple[str, str, str]] = []  # (session id, module id, component)
+        self.status: Dict[str, Dict[str, Any]] = {}
+
+    def add_session(self, index: int, title: Optional[str], refs: List[Tuple[str, ModuleRef]],
+                    file: Optional[str] = None) -> str:
+        node = f"{file}#{index}" if file else f"session:{index}"
+        self.sessions.append({"id": node, "index": index, "title": title, "file": file})
+        for comp_type, ref in refs:
+            self.modules.setdefault(ref.full_name, ref)
+            self.edges.append((node, ref.full_name, comp_type))
+        return node
+
+    def dependencies(self, node: str) -> List[str]:
+        """Modules imported by a session node, without duplicates, in component order"""
+        return list(dict.fromkeys(target for source, target, _ in self.edges if source == node))
+
+    def topological_order(self) -> List[str]:
+        """Every node after the nodes it depends on; otherwise modules, then sessions, in insertion order"""
+        nodes = list(self.modules) + [session["id"] for session in self.sessions]
+        position = {node: i for i, node in enumerate(nodes)}
+        pending = {node: 0 for node in nodes}
+        dependents: Dict[str, List[str]] = {node: [] for node in nodes}
+        for source, target in dict.fromkeys((source, target) for source, target, _ in self.edges):
+            pending[source] += 1
+            dependents[target].append(source)
+        # Kahn's algorithm, taking the earliest ready node first
+        ready = [position[node] for node in nodes if not pending[node]]
+        order = []
+        while ready:
+            node = nodes[heapq.heappop(ready)]
+            order.append(node)
+            for dependent in dependents[node]:
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    heapq.heappush(ready, position[dependent])
+        return order
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly graph: sessions, modules (with prefetch status), edges and order"""
+        modules = []
+        for name, ref in self.modules.items():
+            node = {"id": name, "namespace": ref.namespace, "name": ref.name, "version": ref.version,
+                    "used_by": sum(1 for _, target, _ in self.edges if target == name)}
+            node.update(self.status.get(name, {}))
+            modules.append(node)
+        return {
+            "sessions": self.sessions,
+            "modules": modules,
+            "edges": [{"from": source, "to": target, "component": comp_type}
+                      for source, target, comp_type in self.edges],
+            "order": self.topological_order(),
+        }
+
+    def to_dot(self) -> str:
+        """Graphviz source; modules that failed to resolve or parse are drawn dashed red"""
+        def quote(text: Any) -> str:
+            return '"' + str(text).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+        lines = ["digraph wodcraft {", "  rankdir=LR;", "  node [fontname=Helvetica];"]
+        for session in self.sessions:
+            lines.append(f"  {quote(session['id'])} [shape=box, label={quote(session['title'] or session['id'])}];")
+        for name in self.modules:
+            style = ', style=dashed, color=red' if self.status.get(name, {}).get("status") == "error" else ""
+            lines.append(f"  {quote(name)} [shape=ellipse{style}];")
+        for source, target, comp_type in self.edges:
+            lines.append(f"  {quote(source)} -> {quote(target)} [label={quote(comp_type)}];")
+        lines.append("}")
+        return "\n".join(lines)
+
+
+def _compile_error(e: Exception) -> Dict[str, str]:
+    """JSON-friendly description of a session that failed to compile"""
+    return {"type": type(e).__name__, "message": str(e)}
+
+
+_WORKER_COMPILER: Optional["SessionCompiler"] = None
+
+
+def _compile_in_worker(item: Tuple[Dict, List[Tuple[str, "ModuleRef", "ResolvedModule"]]]
+                       ) -> Tuple[Optional[Dict], Optional[Dict], List[str]]:
+    # Process-pool entry point of SessionCompiler.compile_many: modules arrive resolved and parsed
+    global _WORKER_COMPILER
+    if _WORKER_COMPILER is None:
+        _WORKER_COMPILER = SessionCompiler(InMemoryResolver())
+    return _WORKER_COMPILER._try_build(*item)
+
 
 # Session Compiler with semantic validation
 class SessionCompiler:
     """Compiles sessions by resolving imports and applying overrides with semantic validation"""
 
-    def __init__(self, resolver: ModuleResolver, cache_size: int = 100):
+    def __init__(self, resolver: ModuleResolver, cache_size: int = 100, module_cache_size: int = 256,
+                 disk_cache: Optional[Any] = None, cache_ttl: Optional[float] = 300):
         self.resolver = resolver
-        # Use a base parser without transformer; we'll transform explicitly
-        self._base_parser = Lark(GRAMMAR_VNEXT, parser='lalr')
+        # Seconds a compiled session stays cached (None: until evicted or invalidated)
+        self.cache_ttl = cache_ttl
+        # Optional persistent store shared across processes (see wodcraft.cache.DiskCache)
+        self.disk_cache = disk_cache
+        # Shared base parser without transformer; we'll transform explicitly
+        self._base_parser = get_parser()
         # LRU cache with size limit and performance metrics
         self._compiled_cache: OrderedDict[str, Tuple[float, Dict]] = OrderedDict()
         self._cache_size = cache_size
         self._cache_hits = 0
         self._cache_misses = 0
+        # Module ids each cached session was compiled from, and the reverse map
+        self._compiled_refs: Dict[str, Tuple[str, ...]] = {}
+        self._dependents: Dict[str, set] = {}
+        # Parsed module ASTs keyed by source content hash (LRU)
+        self._module_cache: OrderedDict[str, Dict] = OrderedDict()
+        self._module_cache_size = module_cache_size
+        self._module_hits = 0
+        self._module_misses = 0
+        # Session fingerprints memoized by AST identity
+        self._fingerprints: OrderedDict[int, Tuple[Dict, str]] = OrderedDict()
+        # INFO/WARNING messages of the session being built, per thread (kept with disk entries)
+        self._notes = threading.local()
+
+    def fingerprint(self, session_ast: Dict) -> str:
+        """
+        Stable structural fingerprint of a session AST.
+
+        Computed once per AST object (ASTs are treated as immutable once handed
+        to the compiler) and identical across processes, unlike ``hash()``.
+        """
+        memo = self._fingerprints.get(id(session_ast))
+        if memo is not None and memo[0] is session_ast:
+            return memo[1]
+        digest = ast_fingerprint(session_ast)
+        self._fingerprints[id(session_ast)] = (session_ast, digest)
+        while len(self._fingerprints) > self._cache_size:
+            self._fingerprints.popitem(last=False)
+        return digest
+
+    def compile_key(self, session_ast: Dict, modules: List[Tuple[str, ModuleRef, ResolvedModule]]) -> str:
+        """Cache key covering the session fingerprint and every resolved module's version and content"""
+        h = hashlib.blake2b(self.fingerprint(session_ast).encode("ascii"), digest_size=16)
+        for comp_type, ref, resolved in modules:
+            h.update(f"|{comp_type}={ref.full_name}#{resolved.content_hash}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _resolve_components(self, session_ast: Dict, resolved_refs: Optional[Dict[str, Any]] = None
+                            ) -> List[Tuple[str, ModuleRef, ResolvedModule]]:
+        """Resolve the module behind each component import, in component order
+
+        With ``resolved_refs`` (shared across a batch) each ref is resolved and
+        its module parsed only once; failures are remembered and re-raised.
+        """
+        resolved = []
+        for comp_type, ref in self._component_refs(session_ast):
+            if resolved_refs is None:
+                resolved.append((comp_type, ref, self.resolver.resolve(ref)))
+                continue
+            module = resolved_refs.get(ref.full_name)
+            if module is None:
+                module = resolved_refs[ref.full_name] = self._fetch(ref)
+            if isinstance(module, Exception):
+                raise module
+            resolved.append((comp_type, ref, module))
+        return resolved
+
+    def _component_refs(self, session_ast: Dict) -> List[Tuple[str, ModuleRef]]:
+        """The module reference of each component import, in component order"""
+        components = session_ast.get("components") or {}
+        return [(comp_type, self._module_ref(components[comp_type]))
+                for comp_type in ["warmup", "skill", "strength", "wod"] if comp_type in components]
+
+    def _fetch(self, ref: ModuleRef) -> Any:
+        # Resolved module with its AST parsed, or the exception that prevented it
+        try:
+            module = self.resolver.resolve(ref)
+            self.module_ast(module)
+            return module
+        except Exception as e:
+            return e
+
+    def dependency_graph(self, sessions: List[Dict], graph: Optional[DependencyGraph] = None,
+                         file: Optional[str] = None) -> DependencyGraph:
+        """Add every session's component imports to ``graph`` (a new one by default)"""
+        graph = graph if graph is not None else DependencyGraph()
+        for index, session_ast in enumerate(sessions):
+            graph.add_session(index, session_ast.get("title"), self._component_refs(session_ast), file)
+        return graph
+
+    def prefetch(self, graph: DependencyGraph, jobs: int = 1) -> Dict[str, Any]:
+        """
+        Resolve and parse every module of ``graph`` exactly once, in topological order.
+
+        Returns ``{module id: ResolvedModule (AST parsed) or the exception raised}``
+        and fills ``graph.status``. Resolution runs on ``jobs`` threads (0 = all
+        CPUs) when the resolver is ``concurrent``; parsing stays on this thread.
+        """
+        names = [node for node in graph.topological_order() if node in graph.modules]
+        refs = [graph.modules[name] for name in names]
+        workers = min(jobs or os.cpu_count() or 1, len(refs))
+        if workers > 1 and self.resolver.concurrent:
+            from concurrent.futures import ThreadPoolExecutor
+
+            def resolve(ref):
+                try:
+                    return self.resolver.resolve(ref)
+                except Exception as e:
+                    return e
+            with ThreadPoolExecutor(workers) as pool:
+                resolved = list(pool.map(resolve, refs))
+        else:
+            resolved = [None] * len(refs)
+        fetched: Dict[str, Any] = {}
+        for name, ref, module in zip(names, refs, resolved):
+            if module is None:
+                fetched[name] = self._fetch(ref)
+                continue
+            if not isinstance(module, Exception):
+                try:
+                    self.module_ast(module)
+                except Exception as e:
+                    module = e
+            fetched[name] = module
+        for name, module in fetched.items():
+            graph.status[name] = ({"status": "error", "error": _compile_error(module)}
+                                  if isinstance(module, Exception) else {"status": "ok"})
+        return fetched
 
     def compile_session(self, session_ast: Dict) -> Dict:
         """Compile a session AST to executable JSON with caching"""
-        # Create cache key from session AST
-        session_hash = str(hash(json.dumps(session_ast, sort_keys=True)))
+        # Resolve imports first so the cache key reflects the current module contents
+        modules = self._resolve_components(session_ast)
+        session_hash = self.compile_key(session_ast, modules)
         current_time = time.time()
+        cached_result = self._cached(session_hash, current_time)
+        if cached_result is not None:
+            return cached_result
+        result, messages = self._build_noted(session_ast, modules)
+        self._remember(session_hash, result, current_time, refs=[ref.full_name for _, ref, _ in modules],
+                       messages=messages)
+        return result
+
+    def compile_many(self, sessions: List[Dict], jobs: int = 1, executor: str = "thread") -> List[Dict]:
+        """
+        Compile every session of a batch; one record per session, in input order.
+
+        Each record is ``{"index", "title", "ok", "compiled"}`` or, when that
+        session fails, ``{"index", "title", "ok": False, "error": {"type", "message"}}``;
+        a failure never aborts the rest of the batch. Every module import is
+        resolved and parsed once for the whole batch (``prefetch`` over the
+        ``dependency_graph``), identical sessions are
+        compiled once, and cached sessions are not recompiled. With ``jobs``
+        > 1 (0 = all CPUs) the remaining sessions are compiled on a pool of
+        threads or, with ``executor="process"``, worker processes (modules are
+        resolved here and shipped with each session, already parsed).
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor!r} (use 'thread' or 'process')")
+        current_time = time.time()
+        resolved_refs = self.prefetch(self.dependency_graph(sessions), jobs=jobs)
+        records: List[Dict] = []
+        pending: OrderedDict[str, Tuple[Dict, List[Tuple[str, ModuleRef, ResolvedModule]], List[Dict]]] = OrderedDict()
+        for index, session_ast in enumerate(sessions):
+            record: Dict[str, Any] = {"index": index, "title": session_ast.get("title"), "ok": False}
+            records.append(record)
+            try:
+                modules = self._resolve_components(session_ast, resolved_refs)
+                session_hash = self.compile_key(session_ast, modules)
+                cached_result = self._cached(session_hash, current_time)
+            except Exception as e:
+                record["error"] = _compile_error(e)
+                continue
+            if cached_result is not None:
+                record.update(ok=True, compiled=cached_result)
+            elif session_hash in pending:
+                pending[session_hash][2].append(record)
+            else:
+                pending[session_hash] = (session_ast, modules, [record])
+
+        work = [(session_ast, modules) for session_ast, modules, _ in pending.values()]
+        workers = min(jobs or os.cpu_count() or 1, len(work))
+        if workers <= 1:
+            outcomes = [self._try_build(session_ast, modules) for session_ast, modules in work]
+        elif executor == "process":
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(workers) as pool:
+                outcomes = list(pool.map(_compile_in_worker, work))
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(workers) as pool:
+                outcomes = list(pool.map(lambda item: self._try_build(*item), work))
+
+        for (session_hash, (_, modules, waiting)), (result, error, messages) in zip(pending.items(), outcomes):
+            if error is None:
+                self._remember(session_hash, result, current_time, refs=[ref.full_name for _, ref, _ in modules],
+                               messages=messages)
+            for record in waiting:
+                if error is None:
+                    record.update(ok=True, compiled=result)
+                else:
+                    record["error"] = error
+        return records
 
+    def _cached(self, session_hash: str, current_time: float) -> Optional[Dict]:
+        """Compiled session from the memory (then disk) cache, or None"""
         # Check cache (valid for 300 seconds = 5 minutes)
         if session_hash in self._compiled_cache:
             cache_time, cached_result = self._compiled_cache[session_hash]
-            if current_time - cache_time < 300:
+            if self.cache_ttl is None or current_time - cache_time < self.cache_ttl:
                 # Move to end (LRU behavior)
                 self._compiled_cache.move_to_end(session_hash)
                 self._cache_hits += 1
                 return cached_result
             else:
                 # Expired entry, remove it
-                del self._compiled_cache[session_hash]
+                self._forget_compiled(session_hash)
 
         self._cache_misses += 1
 
+        if self.disk_cache is not None:
+            entry = self.disk_cache.get(self.disk_cache.key(session_hash))
+            if entry is not None:
+                # Replay what compiling printed, as a fresh compile would
+                for message in entry["messages"]:
+                    print(message)
+                self._remember(session_hash, entry["compiled"], current_time, persist=False)
+                return entry["compiled"]
+        return None
+
+    def _try_build(self, session_ast: Dict, modules: List[Tuple[str, ModuleRef, ResolvedModule]]
+                   ) -> Tuple[Optional[Dict], Optional[Dict], List[str]]:
+        try:
+            result, messages = self._build_noted(session_ast, modules)
+        except Exception as e:
+            return None, _compile_error(e), []
+        return result, None, messages
+
+    def _build_noted(self, session_ast: Dict, modules: List[Tuple[str, ModuleRef, ResolvedModule]]
+                     ) -> Tuple[Dict, List[str]]:
+        """``_build`` plus the INFO/WARNING messages it printed"""
+        self._notes.messages = messages = []
+        try:
+            return self._build(session_ast, modules), messages
+        finally:
+            self._notes.messages = None
+
+    def _note(self, message: str):
+        """Print a compiler message and record it for the session being built"""
+        print(message)
+        messages = getattr(self._notes, "messages", None)
+        if messages is not None:
+            messages.append(message)
+
+    def _build(self, session_ast: Dict, modules: List[Tuple[str, ModuleRef, ResolvedModule]]) -> Dict:
+        """Compile a session from its resolved modules (no caching)"""
         result = {
             "session": {
                 "title": session_ast.get("title", "Untitled"),
@@ -723,28 +1486,26 @@ class SessionCompiler:
         }
 
         if not session_ast.get("components"):
-            self._compiled_cache[session_hash] = (current_time, result)
             return result
 
         components = session_ast["components"]
 
-        # Resolve each component
-        for comp_type in ["warmup", "skill", "strength", "wod"]:
-            if comp_type in components:
-                import_info = components[comp_type]
-                module_ast = self._resolve_and_parse_module(import_info)
+        # Compile each resolved component
+        for comp_type, _ref, resolved in modules:
+            import_info = components[comp_type]
+            module_ast = self.module_ast(resolved)
 
-                # Extract overrides if present
-                override_params = None
-                if isinstance(import_info.get("override"), dict):
-                    override_params = import_info["override"].get("assignments", {})
+            # Extract overrides if present
+            override_params = None
+            if isinstance(import_info.get("override"), dict):
+                override_params = import_info["override"].get("assignments", {})
 
-                compiled_component = self._compile_component(module_ast, comp_type, override_params)
-                result["session"]["components"][comp_type] = compiled_component
+            compiled_component = self._compile_component(module_ast, comp_type, override_params)
+            result["session"]["components"][comp_type] = compiled_component
 
-                # Semantic validation for WOD components
-                if comp_type == "wod" and compiled_component.get("component"):
-                    self._validate_wod_semantics(compiled_component["component"])
+            # Semantic validation for WOD components
+            if comp_type == "wod" and compiled_component.get("component"):
+                self._validate_wod_semantics(compiled_component["component"])
 
         # Aggregate realized team results if present
         try:
@@ -756,33 +1517,85 @@ class SessionCompiler:
             # Be tolerant: do not break compilation if realized data is malformed
             pass
 
-        # Cache result with LRU eviction
+        return result
+
+    def _remember(self, session_hash: str, result: Dict, current_time: float, persist: bool = True,
+                  refs: Optional[List[str]] = None, messages: Optional[List[str]] = None):
+        """Cache result with LRU eviction (and in the disk cache, if configured)"""
         self._compiled_cache[session_hash] = (current_time, result)
+        if refs:
+            self._compiled_refs[session_hash] = tuple(refs)
+            for ref in refs:
+                self._dependents.setdefault(ref, set()).add(session_hash)
 
         # Evict oldest entries if cache is full
         while len(self._compiled_cache) > self._cache_size:
-            self._compiled_cache.popitem(last=False)
+            self._forget_compiled(next(iter(self._compiled_cache)))
 
-        return result
+        if persist and self.disk_cache is not None:
+            self.disk_cache.put(self.disk_cache.key(session_hash), {"compiled": result, "messages": messages or []})
+
+    def _forget_compiled(self, session_hash: str):
+        self._compiled_cache.pop(session_hash, None)
+        for ref in self._compiled_refs.pop(session_hash, ()):
+            dependents = self._dependents.get(ref)
+            if dependents is not None:
+                dependents.discard(session_hash)
+                if not dependents:
+                    del self._dependents[ref]
+
+    def invalidate_modules(self, changes: Dict[str, Optional[str]]) -> int:
+        """
+        Drop what was derived from changed modules; returns the number of compiled sessions dropped.
+
+        ``changes`` maps module ids to the content hash served before the
+        change (``FileSystemResolver.invalidate``): the parsed AST of that
+        content and every compiled session built from the module are removed
+        from memory. Disk cache entries are keyed by content and left alone.
+        """
+        dropped = 0
+        for name, old_hash in changes.items():
+            if old_hash is not None:
+                self._module_cache.pop(old_hash, None)
+            for session_hash in list(self._dependents.get(name, ())):
+                self._forget_compiled(session_hash)
+                dropped += 1
+        return dropped
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
         total_requests = self._cache_hits + self._cache_misses
         hit_rate = self._cache_hits / total_requests if total_requests > 0 else 0.0
 
+        module_requests = self._module_hits + self._module_misses
+        module_hit_rate = self._module_hits / module_requests if module_requests > 0 else 0.0
+
         return {
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
             "hit_rate": hit_rate,
             "total_entries": len(self._compiled_cache),
-            "max_size": self._cache_size
+            "max_size": self._cache_size,
+            "module_cache_hits": self._module_hits,
+            "module_cache_misses": self._module_misses,
+            "module_hit_rate": module_hit_rate,
+            "module_entries": len(self._module_cache),
+            "module_max_size": self._module_cache_size,
+            "disk_cache_hits": self.disk_cache.hits if self.disk_cache is not None else 0,
+            "disk_cache_misses": self.disk_cache.misses if self.disk_cache is not None else 0,
         }
 
     def clear_cache(self):
         """Clear all cached data"""
         self._compiled_cache.clear()
+        self._compiled_refs.clear()
+        self._dependents.clear()
         self._cache_hits = 0
         self._cache_misses = 0
+        self._module_cache.clear()
+        self._module_hits = 0
+        self._module_misses = 0
+        self._fingerprints.clear()
 
     def _expand_shorthand_macros(self, wod_ast: Dict) -> Dict:
         """Expand shorthand macros like '21-15-9 Thrusters + Pull_ups' into individual movement lines"""
@@ -834,15 +1647,15 @@ class SessionCompiler:
                 slot_time = 60  # 1 minute slots for EMOM
 
                 if estimated_movement_time > slot_time * 0.8:  # Use 80% of slot time as threshold
-                    print(f"WARNING: EMOM might be too packed - {len(movements)} movements in {slot_time}s slots")
+                    self._note(f"WARNING: EMOM might be too packed - {len(movements)} movements in {slot_time}s slots")
 
         # Time cap validation
         time_cap = self._extract_time_cap(form)
         if time_cap:
             if time_cap < 60:  # Less than 1 minute
-                print(f"WARNING: Very short time cap ({time_cap}s) - might be unrealistic")
+                self._note(f"WARNING: Very short time cap ({time_cap}s) - might be unrealistic")
             elif time_cap > 3600:  # More than 1 hour
-                print(f"WARNING: Very long time cap ({time_cap}s) - might be unrealistic")
+                self._note(f"WARNING: Very long time cap ({time_cap}s) - might be unrealistic")
 
         # Movement and load validation
         for movement in movements:
@@ -936,32 +1749,32 @@ class SessionCompiler:
         # Deadlift warnings
         if "deadlift" in movement_lower:
             if load_kg > 180:  # > 180kg deadlift
-                print(f"WARNING: Very heavy deadlifts ({load_kg:.1f}kg) - verify safety progression and form")
+                self._note(f"WARNING: Very heavy deadlifts ({load_kg:.1f}kg) - verify safety progression and form")
             elif load_kg > 140:  # > 140kg deadlift
-                print(f"INFO: Heavy deadlifts ({load_kg:.1f}kg) - ensure proper warmup and spotting")
+                self._note(f"INFO: Heavy deadlifts ({load_kg:.1f}kg) - ensure proper warmup and spotting")
 
         # Overhead movement warnings
         elif any(term in movement_lower for term in ["press", "jerk", "snatch", "overhead"]):
             if load_kg > 80:  # > 80kg overhead
-                print(f"WARNING: Heavy overhead movement ({load_kg:.1f}kg) - check shoulder mobility and technique")
+                self._note(f"WARNING: Heavy overhead movement ({load_kg:.1f}kg) - check shoulder mobility and technique")
 
         # Squat warnings
         elif "squat" in movement_lower:
             if load_kg > 150:  # > 150kg squat
-                print(f"WARNING: Very heavy squats ({load_kg:.1f}kg) - ensure proper depth and safety bars")
+                self._note(f"WARNING: Very heavy squats ({load_kg:.1f}kg) - ensure proper depth and safety bars")
 
     def _check_high_rep_warnings(self, movement: str, reps: float):
         """Check for potentially dangerous high rep combinations"""
         movement_lower = movement.lower()
 
         if "deadlift" in movement_lower and reps > 20:
-            print(f"WARNING: High rep deadlifts ({int(reps)} reps) - high injury risk, consider scaling")
+            self._note(f"WARNING: High rep deadlifts ({int(reps)} reps) - high injury risk, consider scaling")
 
         if "burpee" in movement_lower and reps > 50:
-            print(f"INFO: High rep burpees ({int(reps)} reps) - expect significant fatigue")
+            self._note(f"INFO: High rep burpees ({int(reps)} reps) - expect significant fatigue")
 
         if any(term in movement_lower for term in ["thruster", "clean"]) and reps > 30:
-            print(f"INFO: High rep {movement} ({int(reps)} reps) - monitor form degradation")
+            self._note(f"INFO: High rep {movement} ({int(reps)} reps) - monitor form degradation")
 
     def _validate_wod_structure(self, form: Dict, movements: List[Dict]):
         """Validate overall WOD structure"""
@@ -969,7 +1782,7 @@ class SessionCompiler:
         movement_names = [m.get("movement", "") for m in movements if m.get("type") == "MOVEMENT_LINE"]
 
         if len(set(movement_names)) == 1 and len(movement_names) > 1:
-            print("INFO: Single movement WOD - consider pacing and scaling options")
+            self._note("INFO: Single movement WOD - consider pacing and scaling options")
 
         # Check for balance between modalities
         cardio_count = sum(1 for name in movement_names if any(term in name.lower()
@@ -979,18 +1792,41 @@ class SessionCompiler:
 
         if len(movements) > 2:
             if cardio_count == 0:
-                print("INFO: No cardio movements - WOD focuses on strength/gymnastics")
+                self._note("INFO: No cardio movements - WOD focuses on strength/gymnastics")
             elif strength_count == 0:
-                print("INFO: No strength movements - WOD focuses on cardio/gymnastics")
+                self._note("INFO: No strength movements - WOD focuses on cardio/gymnastics")
 
-    def _resolve_and_parse_module(self, import_info: Dict) -> Dict:
-        """Resolve and parse a module import"""
+    def _module_ref(self, import_info: Dict) -> ModuleRef:
+        """Build the module reference of an import statement"""
         ref_parts = import_info["ref_id"].split(".")
-        ref = ModuleRef(ref_parts[0], ".".join(ref_parts[1:]), import_info.get("version", "v1"))
+        return ModuleRef(ref_parts[0], ".".join(ref_parts[1:]), import_info.get("version", "v1"))
 
-        resolved = self.resolver.resolve(ref)
-        tree = self._base_parser.parse(resolved.source)
-        return ToASTvNext().transform(tree)
+    def _resolve_and_parse_module(self, import_info: Dict) -> Dict:
+        """Resolve and parse a module import"""
+        resolved = self.resolver.resolve(self._module_ref(import_info))
+        return self.module_ast(resolved)
+
+    def module_ast(self, resolved: ResolvedModule) -> Dict:
+        """Return the parsed AST of a resolved module, memoized on the module and by content hash"""
+        if resolved.ast is not None:
+            self._module_hits += 1
+            return resolved.ast
+
+        key = resolved.content_hash
+        module_ast = self._module_cache.get(key)
+        if module_ast is not None:
+            self._module_cache.move_to_end(key)
+            self._module_hits += 1
+        else:
+            self._module_misses += 1
+            tree = self._base_parser.parse(resolved.source)
+            module_ast = ToASTvNext().transform(tree)
+            self._module_cache[key] = module_ast
+            while len(self._module_cache) > self._module_cache_size:
+                self._module_cache.popitem(last=False)
+
+        resolved.ast = module_ast
+        return module_ast
 
     def _apply_overrides(self, module_ast: Dict, overrides: Dict) -> Dict:
         """(Reserved) Apply parameter overrides to module AST.
@@ -1019,8 +1855,10 @@ class SessionCompiler:
 
         return {}
 
-    def export_json(self, compiled_session: Dict) -> str:
-        """Export compiled session as JSON"""
+    def export_json(self, compiled_session: Dict, compact: bool = False) -> str:
+        """Export compiled session as JSON (single line when compact)"""
+        if compact:
+            return json.dumps(compiled_session, separators=(",", ":"), ensure_ascii=False)
         return json.dumps(compiled_session, indent=2)
 
     def export_ics(self, compiled_session: Dict) -> str:
@@ -1140,6 +1978,96 @@ class SessionCompiler:
             label = f"{label} (progress {progress})" if label else f"progress {progress}"
         return label or "Movement"
 
+# Movements catalog shipped as package data (copy of data/movements_catalog.json)
+MOVEMENTS_CATALOG_PATH = Path(str(importlib_resources.files(__package__) / "movements_catalog.json"))
+
+
+# String interning for parsed libraries
+class StringTable:
+    """
+    Process-wide table of canonical strings shared by every parsed AST.
+
+    Movement names, units, identifiers and node types repeat across thousands
+    of ASTs; returning one canonical object per distinct value keeps a resident
+    corpus from holding millions of equal small strings. Only strings up to
+    ``max_length`` characters are stored (long notes and titles are rarely
+    repeated) and the table stops growing at ``max_size`` entries, so a
+    long-lived worker parsing arbitrary input stays bounded.
+    """
+
+    def __init__(self, max_length: int = 64, max_size: int = 100_000):
+        self.max_length = max_length
+        self.max_size = max_size
+        self._strings: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.deduplicated = 0
+        self.seeded = 0
+
+    def intern(self, value: str) -> str:
+        """Canonical instance of ``value`` (``value`` itself when it is new)"""
+        # Threaded workers (serve/http/lsp) share the table: lookup, insert and counters under one lock
+        with self._lock:
+            self.lookups += 1
+            found = self._strings.get(value)
+            if found is not None:
+                if found is not value:
+                    self.deduplicated += 1
+                return found
+            if len(value) <= self.max_length and len(self._strings) < self.max_size:
+                self._strings[value] = value
+            return value
+
+    def seed(self, values) -> int:
+        """Pre-load ``values``; returns how many were new"""
+        added = 0
+        with self._lock:
+            for value in values:
+                if isinstance(value, str) and value not in self._strings and len(self._strings) < self.max_size:
+                    self._strings[value] = value
+                    added += 1
+            self.seeded += added
+        return added
+
+    def seed_from_catalog(self, path: Optional[Union[str, Path]] = None) -> int:
+        """Seed with the movement keys, aliases and preferred names of a movements catalog"""
+        catalog_path = Path(path) if path else MOVEMENTS_CATALOG_PATH
+        try:
+            catalog = json.loads(catalog_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+        names: List[str] = [unit.value for unit in UnitType]
+        for key, entry in (catalog.get("movements") or {}).items():
+            names.append(key)
+            if isinstance(entry, dict):
+                names.extend(entry.get("aliases") or [])
+                names.append(entry.get("preferred"))
+        return self.seed(names)
+
+    def stats(self) -> Dict[str, Any]:
+        """Table size, lookups and how many duplicate strings were replaced by a shared one"""
+        with self._lock:
+            return {
+                "strings": len(self._strings),
+                "lookups": self.lookups,
+                "deduplicated": self.deduplicated,
+                "seeded": self.seeded,
+                "max_length": self.max_length,
+                "max_size": self.max_size,
+            }
+
+    def clear(self):
+        """Drop all strings and reset counters"""
+        with self._lock:
+            self._strings.clear()
+            self.lookups = 0
+            self.deduplicated = 0
+            self.seeded = 0
+
+
+STRING_TABLE = StringTable()
+
+
 # AST Transformer for extended language with enhanced error context
 class ToASTvNext(Transformer):
     """
@@ -1149,10 +2077,11 @@ class ToASTvNext(Transformer):
     preserving source location information for better error reporting.
     """
 
-    def __init__(self):
+    def __init__(self, strings: Optional[StringTable] = None):
         super().__init__()
         self.resolver = InMemoryResolver()
         self._source_lines: List[str] = []
+        self.strings = strings or STRING_TABLE
 
     def set_source(self, source: str):
         """Set source text for enhanced error reporting"""
@@ -1360,8 +2289,8 @@ class ToASTvNext(Transformer):
     def load_value(self, items):
         """Parse load values like '43kg', '95lb'"""
         number = self._parse_numeric(items[0]) if items else None
-        unit = str(items[1]) if len(items) > 1 else None
-        raw = f"{items[0]}{items[1]}" if len(items) > 1 else str(items[0])
+        unit = self.strings.intern(str(items[1])) if len(items) > 1 else None
+        raw = self.strings.intern(f"{items[0]}{items[1]}" if len(items) > 1 else str(items[0]))
         return {
             "type": "LOAD_VALUE",
             "value": number,
@@ -1455,7 +2384,8 @@ class ToASTvNext(Transformer):
 
     def movement_name(self, items):
         """Parse movement names to snake_case format"""
-        return {"type": "MOVEMENT_NAME", "name": "_".join(str(part) for part in items if part is not None), "children": list(items)}
+        name = self.strings.intern("_".join(str(part) for part in items if part is not None))
+        return {"type": "MOVEMENT_NAME", "name": name, "children": list(items)}
 
     def movement_line(self, items):
         """
@@ -1916,75 +2846,605 @@ class ToASTvNext(Transformer):
     def __default_token__(self, token):
         """Handle default token conversion with type preservation"""
         if token.type in ['STRING', 'IDENT']:
-            return str(token.value)
+            return self.strings.intern(str(token.value))
         elif token.type in ['INT', 'NUMBER']:
             try:
                 return int(token.value)
             except ValueError:
                 return float(token.value)
-        return str(token.value)
+        return self.strings.intern(str(token.value))
 
     def __default__(self, data, children, meta):
         """Handle default rule conversion to structured format"""
         # Convert any remaining Tree objects to dicts
         return {
-            "type": data.upper() if isinstance(data, str) else str(data),
+            "type": self.strings.intern(data.upper() if isinstance(data, str) else str(data)),
             "children": children
         }
 
 
-def parse_vnext(text: str) -> Dict:
+class LeanToASTvNext(ToASTvNext):
+    """
+    ToASTvNext variant that leaves out everything it can re-derive.
+
+    - MOVEMENT_LINE nodes keep their extracted fields (movement, quantity,
+      load, ...) but not the parsed ``children`` they were built from
+    - load and REST ``raw`` texts are dropped when they equal the text
+      rebuilt from the structured fields (see ``raw_text``)
+    - generic nodes drop the ``None`` placeholders of empty optional slots
+
+    The result is smaller and faster to serialize; ``raw_text(node)``
+    recomputes a dropped ``raw`` on demand.
+    """
+
+    def _drop_raw(self, node: Dict[str, Any], derived: str) -> Dict[str, Any]:
+        if node.get("raw") == derived:
+            del node["raw"]
+        return node
+
+    def load_value(self, items):
+        node = super().load_value(items)
+        return self._drop_raw(node, self._load_to_text(dict(node, raw=None)))
+
+    def load_dual(self, items):
+        node = super().load_dual(items)
+        return self._drop_raw(node, self._load_to_text(dict(node, raw=None)))
+
+    def load_variant(self, items):
+        node = super().load_variant(items)
+        return self._drop_raw(node, self._load_to_text(dict(node, raw=None)))
+
+    def load_spec(self, items):
+        node = super().load_spec(items)
+        if node is not None:
+            node.pop("raw", None)
+        return node
+
+    def wod_rest(self, items):
+        node = super().wod_rest(items)
+        return self._drop_raw(node, node["duration"].get("raw"))
+
+    def movement_line(self, items):
+        node = super().movement_line(items)
+        del node["children"]
+        return node
+
+    def __default__(self, data, children, meta):
+        return super().__default__(data, [child for child in children if child is not None], meta)
+
+
+def raw_text(node: Any) -> str:
+    """
+    Source-like text of an AST node, computed when a lean AST left ``raw`` out.
+
+    Works on both full and lean ASTs: a stored ``raw`` always wins.
+    """
+    if isinstance(node, dict):
+        if node.get("raw") is not None:
+            return str(node["raw"])
+        node_type = node.get("type")
+        if node_type in ("LOAD_VALUE", "LOAD_DUAL", "LOAD_VARIANT"):
+            return LEAN_TRANSFORMER._load_to_text(node)
+        if node_type == "LOAD_SPEC":
+            return raw_text(node.get("load"))
+        if node_type == "REST":
+            return raw_text(node.get("duration"))
+    return LEAN_TRANSFORMER._flatten(node)
+
+
+class InlineToASTvNext:
+    """
+    Tree-less adapter running ToASTvNext inside the LALR parser.
+
+    Lark invokes rule callbacks during each reduction, so no intermediate parse
+    tree is built. Terminals reach the callbacks as raw tokens, so they are
+    converted with ``__default_token__`` first; the resulting AST is identical
+    to the two-pass ``ToASTvNext().transform(tree)`` output. The adapter holds
+    no per-parse state and is shared by every single-pass parse.
+    """
+
+    def __init__(self, transformer: Optional[ToASTvNext] = None):
+        self._transformer = transformer or ToASTvNext()
+
+    def _convert(self, children: List[Any]) -> List[Any]:
+        default_token = self._transformer.__default_token__
+        return [default_token(child) if isinstance(child, Token) else child for child in children]
+
+    def __getattr__(self, name: str):
+        # Only rule callbacks are wrapped; terminal names and helpers fall through
+        if name.startswith("_"):
+            raise AttributeError(name)
+        method = getattr(self._transformer, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        def callback(children):
+            return method(self._convert(children))
+        return callback
+
+    def __default__(self, data, children, meta):
+        # Lark's internal repetition rules (``__x_star_0``) must stay trees so
+        # the parent reduction can splice their children in place
+        if isinstance(data, str) and data.startswith("_"):
+            return Tree(data, children)
+        return self._transformer.__default__(data, self._convert(children), meta)
+
+
+def _syntax_error(e: UnexpectedInput, source_lines: List[str]) -> WODCraftError:
+    """WODCraftError with line/column, source context and a suggestion for a Lark syntax error"""
+    line = getattr(e, 'line', None)
+    column = getattr(e, 'column', None)
+
+    source_line = source_lines[line - 1] if line and 0 <= line - 1 < len(source_lines) else ""
+
+    # Generate suggestions based on common errors
+    suggestion = None
+    if hasattr(e, 'expected'):
+        expected = e.expected
+        if 'STRING' in expected:
+            suggestion = "Expected a quoted string (use double quotes)"
+        elif 'IDENT' in expected:
+            suggestion = "Expected an identifier (e.g., Movement_Name)"
+        elif any('"{"' in exp for exp in expected):
+            suggestion = "Expected an opening brace '{'"
+        elif 'LBRACE' in expected:
+            suggestion = "Missing opening brace '{' after component declaration"
+        elif 'RBRACE' in expected:
+            suggestion = "Missing closing brace '}' to end block"
+        elif 'INT' in expected:
+            suggestion = "Expected a number (e.g., 10, 15, 20)"
+        elif 'COLON' in expected:
+            suggestion = "Missing colon ':' in declaration"
+        elif 'IMPORT' in expected:
+            suggestion = "Use 'import module.name@version' syntax"
+
+    error_msg = f"Syntax error"
+    if hasattr(e, 'token') and e.token:
+        error_msg += f" at '{e.token}'"
+
+    return WODCraftError(error_msg, line, column, source_line, suggestion)
+
+
+INLINE_TRANSFORMER = InlineToASTvNext()
+LEAN_TRANSFORMER = LeanToASTvNext()
+LEAN_INLINE_TRANSFORMER = InlineToASTvNext(LEAN_TRANSFORMER)
+
+
+class ParseProfile:
+    """
+    Cumulative time and call counts of ``parse_vnext``, per phase and per transformer method.
+
+    Phases are ``grammar`` (parser lookup, or its build/artifact load on first
+    use), ``lex`` (the contextual lexer), ``parse`` (LALR steps and tree
+    building) and ``transform`` (ToASTvNext). Methods cover every ToASTvNext
+    rule callback and helper; a method's time includes the helpers it calls,
+    and recursive calls are counted but timed once.
+    """
+
+    PHASES = ("grammar", "lex", "parse", "transform")
+
+    def __init__(self):
+        self.files = 0
+        self.phases: Dict[str, List[float]] = {name: [0, 0.0] for name in self.PHASES}
+        self.methods: Dict[str, List[float]] = {}
+        self.parser_origin: Optional[Dict[str, Any]] = None
+
+    def add_phase(self, name: str, seconds: float):
+        stat = self.phases.setdefault(name, [0, 0.0])
+        stat[0] += 1
+        stat[1] += seconds
+
+    def instrument(self, transformer: ToASTvNext) -> ToASTvNext:
+        """Time every ToASTvNext method of ``transformer`` (instance attributes shadow the class)"""
+        names = set()
+        for cls in type(transformer).__mro__:
+            if cls is Transformer:
+                break
+            names.update(name for name, value in vars(cls).items()
+                         if callable(value) and name not in ("__init__", "set_source"))
+        for name in names:
+            setattr(transformer, name, self._timed(name, getattr(transformer, name)))
+        return transformer
+
+    def _timed(self, name: str, method):
+        stat = self.methods.setdefault(name, [0, 0.0])
+        depth = [0]
+
+        def timed(*args, **kwargs):
+            stat[0] += 1
+            if depth[0]:
+                return method(*args, **kwargs)
+            depth[0] += 1
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                stat[1] += time.perf_counter() - started
+                depth[0] -= 1
+        return timed
+
+    def as_dict(self) -> Dict[str, Any]:
+        """JSON-friendly report; methods sorted by time, slowest first"""
+        methods = sorted(((n, s) for n, s in self.methods.items() if s[0]), key=lambda item: -item[1][1])
+        return {
+            "files": self.files,
+            "parser_origin": self.parser_origin,
+            "phases": {name: {"calls": int(calls), "seconds": seconds}
+                       for name, (calls, seconds) in self.phases.items()},
+            "methods": [{"name": name, "calls": int(calls), "seconds": seconds}
+                        for name, (calls, seconds) in methods],
+        }
+
+    def format_table(self, limit: int = 20) -> str:
+        """Phases, then the ``limit`` slowest methods, as a text table"""
+        report = self.as_dict()
+        total = sum(phase["seconds"] for phase in report["phases"].values()) or 1.0
+        lines = []
+        if self.parser_origin:
+            lines.append(f"parser: {self.parser_origin['source']} "
+                         f"(first use took {self.parser_origin['seconds'] * 1000:.1f} ms), files: {self.files}")
+        lines.append(f"{'phase':<28}{'calls':>8}{'ms':>10}{'%':>7}")
+        for name, phase in report["phases"].items():
+            lines.append(f"{name:<28}{phase['calls']:>8}{phase['seconds'] * 1000:>10.2f}"
+                         f"{phase['seconds'] / total * 100:>6.1f}%")
+        lines.append("")
+        lines.append(f"{'method':<28}{'calls':>8}{'ms':>10}{'us/call':>9}")
+        for method in report["methods"][:limit]:
+            lines.append(f"{method['name']:<28}{method['calls']:>8}{method['seconds'] * 1000:>10.2f}"
+                         f"{method['seconds'] / method['calls'] * 1e6:>9.1f}")
+        return "\n".join(lines)
+
+
+_PROFILING = threading.local()
+
+
+@contextmanager
+def profile_parsing(profile: Optional[ParseProfile] = None):
+    """
+    Profile every ``parse_vnext`` call made by this thread inside the block.
+
+      with profile_parsing() as profile:
+          parse_vnext(text)
+      print(profile.format_table())
+
+    Profiled parses feed the LALR parser token by token to time the lexer
+    apart from the parser, and always run two-pass (same AST as single-pass).
+    """
+    profile = profile if profile is not None else ParseProfile()
+    previous = getattr(_PROFILING, "profile", None)
+    _PROFILING.profile = profile
+    try:
+        yield profile
+    finally:
+        _PROFILING.profile = previous
+
+
+def _parse_profiled(text: str, lean: bool, profile: ParseProfile) -> Dict:
+    started = time.perf_counter()
+    parser = get_parser()
+    profile.add_phase("grammar", time.perf_counter() - started)
+    profile.parser_origin = PARSER_REGISTRY.origin(GRAMMAR_VNEXT)
+    profile.files += 1
+
+    interactive = parser.parse_interactive(text)
+    tokens = interactive.lexer_thread.lex(interactive.parser_state)
+    lexing = parsing = 0.0
+    token = None
+    while True:
+        started = time.perf_counter()
+        next_token = next(tokens, None)
+        lexed = time.perf_counter()
+        lexing += lexed - started
+        if next_token is None:
+            break
+        token = next_token
+        interactive.feed_token(token)
+        parsing += time.perf_counter() - lexed
+    started = time.perf_counter()
+    tree = interactive.feed_eof(token)
+    parsing += time.perf_counter() - started
+    profile.add_phase("lex", lexing)
+    profile.add_phase("parse", parsing)
+
+    transformer = profile.instrument(LeanToASTvNext() if lean else ToASTvNext())
+    transformer.set_source(text)
+    started = time.perf_counter()
+    result = transformer.transform(tree)
+    profile.add_phase("transform", time.perf_counter() - started)
+    return result
+
+
+def parse_vnext(text: str, single_pass: bool = False, lean: bool = False) -> Dict:
     """
     Parse WODCraft source with enhanced error reporting.
 
     Returns a structured AST dictionary with modules, sessions, and programming blocks.
     Provides detailed error messages with line/column information and suggestions.
+
+    With ``single_pass=True`` the AST is built during LALR reduction instead of
+    materializing a parse tree and transforming it afterwards; the output is the same.
+    With ``lean=True`` re-derivable fields are left out (see ``LeanToASTvNext``).
     """
-    parser = Lark(GRAMMAR_VNEXT, parser='lalr')
     try:
-        tree = parser.parse(text)
-        transformer = ToASTvNext()
+        profile = getattr(_PROFILING, "profile", None)
+        if profile is not None:
+            return _parse_profiled(text, lean, profile)
+        if single_pass:
+            inline = LEAN_INLINE_TRANSFORMER if lean else INLINE_TRANSFORMER
+            return get_parser(transformer=inline).parse(text)
+        tree = get_parser().parse(text)
+        transformer = LeanToASTvNext() if lean else ToASTvNext()
         transformer.set_source(text)
         result = transformer.transform(tree)
         return result
     except (UnexpectedCharacters, UnexpectedToken) as e:
         # Enhanced error reporting with context
-        line = getattr(e, 'line', None)
-        column = getattr(e, 'column', None)
-
-        source_lines = text.split('\n')
-        source_line = source_lines[line - 1] if line and 0 <= line - 1 < len(source_lines) else ""
-
-        # Generate suggestions based on common errors
-        suggestion = None
-        if hasattr(e, 'expected'):
-            expected = e.expected
-            if 'STRING' in expected:
-                suggestion = "Expected a quoted string (use double quotes)"
-            elif 'IDENT' in expected:
-                suggestion = "Expected an identifier (e.g., Movement_Name)"
-            elif any('"{"' in exp for exp in expected):
-                suggestion = "Expected an opening brace '{'"
-            elif 'LBRACE' in expected:
-                suggestion = "Missing opening brace '{' after component declaration"
-            elif 'RBRACE' in expected:
-                suggestion = "Missing closing brace '}' to end block"
-            elif 'INT' in expected:
-                suggestion = "Expected a number (e.g., 10, 15, 20)"
-            elif 'COLON' in expected:
-                suggestion = "Missing colon ':' in declaration"
-            elif 'IMPORT' in expected:
-                suggestion = "Use 'import module.name@version' syntax"
-
-        error_msg = f"Syntax error"
-        if hasattr(e, 'token') and e.token:
-            error_msg += f" at '{e.token}'"
-
-        raise WODCraftError(error_msg, line, column, source_line, suggestion)
+        raise _syntax_error(e, text.split('\n'))
     except Exception as e:
         raise WODCraftError(f"Parse error: {e}")
 
 
+def _legacy_node(node: Any) -> Any:
+    # Generic tree dump: {"type": rule, "children": [...]}, tokens as text, line ends dropped
+    if isinstance(node, Token):
+        return str(node)
+    return {"type": node.data,
+            "children": [_legacy_node(c) for c in node.children
+                         if not (isinstance(c, Token) and c.type == "NEWLINE")]}
+
+
+def parse_legacy(text: str) -> Dict:
+    """
+    Parse legacy WOD syntax (``WOD``/``BLOCK``/``BUYIN``...) with ``GRAMMAR_LEGACY``.
+
+    There is no legacy transformer: the result is the parse tree as nested
+    ``{"type", "children"}`` dicts. The grammar is only built on the first call.
+    """
+    try:
+        return _legacy_node(get_legacy_parser().parse(text))
+    except UnexpectedInput as e:
+        raise _syntax_error(e, text.split('\n'))
+    except LarkError as e:
+        raise WODCraftError(f"Parse error: {e}")
+
+
+TOP_LEVEL_RULES = ("module", "session", "programming_block")
+
+
+class _ErrorRecovery:
+    """
+    ``on_error`` handler for one recovering parse (panic mode).
+
+    After an unexpected token or character, what was parsed of its line is
+    unwound from the parser stack and the rest of the line is skipped,
+    together with any block it opened, up to the first token of a later line
+    or the ``}`` closing the enclosing block. The stack is then unwound to
+    the deepest state that accepts that token. When the unexpected token is
+    itself a ``}``, it is fed back to close its block; a ``}`` with no open
+    block is dropped, and an unexpected end of input is fixed by closing
+    open blocks.
+    Errors on a line that already has a diagnostic are cascades and are not
+    reported.
+    """
+
+    def __init__(self, text: str, max_errors: int):
+        self.source_lines = text.split('\n')
+        self.max_errors = max_errors
+        self.errors: List[WODCraftError] = []
+        self._reported_line: Optional[int] = None
+
+    def report(self, e: UnexpectedInput):
+        line = getattr(e, 'line', None)
+        if len(self.errors) >= self.max_errors or (line is not None and line == self._reported_line):
+            return
+        self._reported_line = line
+        self.errors.append(_syntax_error(e, self.source_lines))
+
+    def __call__(self, e: UnexpectedInput) -> bool:
+        if len(self.errors) >= self.max_errors:
+            return False
+        self.report(e)
+        parser = e.interactive_parser
+        if isinstance(e, UnexpectedCharacters):
+            self._skip_char(parser)
+            token = self._resync(parser, e.line, 0)
+        elif e.token.type == '$END':
+            return self._close_blocks(parser)
+        elif e.token.type == 'RBRACE' and not self._open_blocks(parser):
+            return True  # stray '}': drop it
+        elif e.token.type == 'RBRACE':
+            token = self._close_statement(parser, e.token)
+        else:
+            token = self._resync(parser, e.token.line, 1 if e.token.type == 'LBRACE' else 0)
+        if token is not None:
+            parser.feed_token(token)
+        return True
+
+    @staticmethod
+    def _accepting_depth(parser, token_type: str, height: Optional[int] = None) -> Optional[int]:
+        # Highest stack height (<= height) at which the parser can take ``token_type``
+        states = parser.parser_state.parse_conf.states
+        stack = parser.parser_state.state_stack
+        for height in range(height or len(stack), 0, -1):
+            if token_type in states[stack[height - 1]]:
+                return height
+        return None
+
+    @staticmethod
+    def _unwind(parser, height: int):
+        state = parser.parser_state
+        del state.value_stack[height - 1:]
+        del state.state_stack[height:]
+
+    @staticmethod
+    def _first_line(value: Any) -> Optional[int]:
+        if isinstance(value, Tree):
+            value = next(value.scan_values(lambda v: isinstance(v, Token)), None)
+        return getattr(value, 'line', None)
+
+    @staticmethod
+    def _open_blocks(parser) -> int:
+        braces = [v.type for v in parser.parser_state.value_stack if isinstance(v, Token)]
+        return braces.count('LBRACE') - braces.count('RBRACE')
+
+    def _statement_start(self, parser, line: int) -> int:
+        # Stack height below what was parsed on the broken line, inside its innermost block
+        values = parser.parser_state.value_stack
+        height = len(values) + 1
+        while height > 1:
+            value = values[height - 2]
+            if (self._first_line(value) != line or _completed_blocks([value])
+                    or getattr(value, 'type', None) in ('LBRACE', 'RBRACE')):
+                break
+            height -= 1
+        return height
+
+    @staticmethod
+    def _skip_char(parser):
+        state = parser.lexer_thread.state
+        position = state.line_ctr.char_pos
+        state.line_ctr.feed(state.text.text[position:position + 1])
+
+    def _tokens(self, parser):
+        # Tokens after the error; lexer errors are skipped one character at a time
+        lexer = parser.lexer_thread
+        while True:
+            try:
+                for token in lexer.lex(parser.parser_state):
+                    yield token
+                return
+            except UnexpectedToken as e:  # valid token in the wrong context
+                yield e.token
+            except UnexpectedCharacters:
+                self._skip_char(parser)
+
+    def _resync(self, parser, line: int, depth: int) -> Optional[Token]:
+        # Unwind first: the contextual lexer picks terminals from the current state
+        floor = self._statement_start(parser, line)
+        self._unwind(parser, floor)
+        last = None
+        for token in self._tokens(parser):
+            last = token
+            if depth:
+                depth += {'LBRACE': 1, 'RBRACE': -1}.get(token.type, 0)
+                continue
+            if token.line == line and token.type != 'RBRACE':
+                depth = 1 if token.type == 'LBRACE' else 0
+                continue
+            height = self._accepting_depth(parser, token.type, floor)
+            if height is None:
+                continue
+            self._unwind(parser, height)
+            return token
+        # End of input while skipping: the parser sees $END next
+        if last is not None:
+            parser.lexer_thread.state.last_token = last
+        return None
+
+    def _close_statement(self, parser, token: Token) -> Optional[Token]:
+        # Unexpected '}': drop the broken statement and let the '}' close the innermost open block
+        floor = self._statement_start(parser, token.line)
+        self._unwind(parser, floor)
+        values = parser.parser_state.value_stack
+        opening = self._innermost_open(values)
+        height = self._accepting_depth(parser, 'RBRACE', floor)
+        # Never unwind the '{' of that block, nor a '}' already fed inside it
+        lowest = max([opening + 2 if opening is not None else 0]
+                     + [i + 2 for i, v in enumerate(values) if getattr(v, 'type', None) == 'RBRACE'])
+        if opening is not None and height is not None and height >= lowest:
+            self._unwind(parser, height)
+            return token
+        # The block cannot be closed as it stands (e.g. a required part is missing):
+        # drop it, header included, and let the '}' go with it
+        self._unwind(parser, self._block_start(values, opening) if opening is not None else 1)
+        return None
+
+    @staticmethod
+    def _innermost_open(values: List[Any]) -> Optional[int]:
+        # Index of the innermost unclosed '{' on the value stack
+        depth = 0
+        for index in range(len(values) - 1, -1, -1):
+            kind = getattr(values[index], 'type', None)
+            if kind == 'RBRACE':
+                depth += 1
+            elif kind == 'LBRACE':
+                if not depth:
+                    return index
+                depth -= 1
+        return None
+
+    def _block_start(self, values: List[Any], opening: int) -> int:
+        # Stack height below the header of the block opened at ``opening``
+        line = values[opening].line
+        index = opening
+        while index > 0:
+            value = values[index - 1]
+            if (getattr(value, 'type', None) in ('LBRACE', 'RBRACE') or _completed_blocks([value])
+                    or self._first_line(value) != line):
+                break
+            index -= 1
+        return index + 1
+
+    def _close_blocks(self, parser) -> bool:
+        closing = Token('RBRACE', '}')
+        for _ in range(len(parser.parser_state.state_stack)):
+            if self._accepting_depth(parser, '$END') == len(parser.parser_state.state_stack):
+                return True
+            height = self._accepting_depth(parser, 'RBRACE')
+            if height is None:
+                return False
+            self._unwind(parser, height)
+            parser.feed_token(closing)
+        return False
+
+
+def _completed_blocks(values: List[Any]) -> List[Tree]:
+    # Top-level blocks finished before an unrecoverable error (left on the parser stack)
+    blocks: List[Tree] = []
+    for value in values:
+        if isinstance(value, Tree):
+            if value.data in TOP_LEVEL_RULES:
+                blocks.append(value)
+            elif value.data in ("start", "program") or str(value.data).startswith("__"):
+                blocks.extend(_completed_blocks(value.children))
+    return blocks
+
+
+def parse_vnext_recover(text: str, max_errors: int = 100) -> Tuple[Dict, List[WODCraftError]]:
+    """
+    Parse WODCraft source, reporting every syntax error in one pass.
+
+    Returns ``(ast, errors)``: the AST holds every top-level block that could be
+    parsed (broken statements are dropped), ``errors`` the WODCraftErrors in
+    source order, with the same line/column and suggestions as ``parse_vnext``.
+    A block whose transformation fails (e.g. a non-positive REST) is left out
+    and reported too. Valid input gives the same AST as ``parse_vnext`` and no errors.
+    """
+    recovery = _ErrorRecovery(text, max_errors)
+    try:
+        tree = get_parser().parse(text, on_error=recovery)
+        blocks = _completed_blocks([tree])
+    except UnexpectedInput as e:
+        recovery.report(e)
+        parser = getattr(e, 'interactive_parser', None)
+        blocks = _completed_blocks(parser.parser_state.value_stack if parser else [])
+
+    transformer = ToASTvNext()
+    transformer.set_source(text)
+    items = []
+    for block in blocks:
+        try:
+            items.append(transformer.transform(block))
+        except VisitError as e:
+            error = e.orig_exc if isinstance(e.orig_exc, WODCraftError) else WODCraftError(f"Parse error: {e.orig_exc}")
+            first = next(block.scan_values(lambda v: isinstance(v, Token)), None)
+            if error.line is None and first is not None:
+                error.line, error.column = first.line, first.column
+            recovery.errors.append(error)
+    errors = sorted(recovery.errors, key=lambda err: (err.line or 0, err.column or 0))
+    return transformer.program(items), errors
+
+
 # Enhanced Programming linter with detailed semantic checks
 class ProgrammingLinter:
     """
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Local HTTP compile service (``wodc http``), standard library only.
+
+A threaded ``http.server`` front end hands each request to a pool of
+pre-forked worker processes. Every worker runs a ``service.Worker`` and so
+keeps its own warm parser, resolvers and SessionCompiler caches.
+
+Endpoints (POST, ``application/json`` body = worker params, any other body
+is the raw .wod source):
+
+  /parse  /validate  /lint  /compile  /run  /results
+
+``/compile`` is the ``session`` method. Sources are only taken inline:
+``path`` and ``modules_path`` params are refused, modules come from the
+directory (or bundle) the service was started with. Answers carry the worker envelope
+(``ok``, ``result`` or ``error``, optional ``warnings``): 200 on success,
+400 for invalid sources, 503 when no worker frees up in time.
+
+``GET /metrics`` reports queue depth, busy workers, p50/p99 latency (overall
+and per endpoint) and the cache counters summed over the workers.
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from .service import Metrics, Worker
+
+ENDPOINTS = {
+    "/parse": "parse",
+    "/validate": "validate",
+    "/lint": "lint",
+    "/compile": "session",
+    "/run": "run",
+    "/results": "results",
+}
+CLIENT_ERRORS = {"WODCraftError", "ValueError", "InvalidRequest"}
+
+
+def _worker_main(conn, modules_path: str, cache_dir: Optional[str]):
+    """Worker process loop: one request dict in, one response dict out"""
+    from .core import get_parser
+    worker = Worker(modules_path, cache_dir, local_files=False)
+    get_parser()
+    try:
+        while True:
+            try:
+                request = conn.recv()
+            except EOFError:
+                break
+            if request is None:
+                break
+            response = worker.handle(request)
+            response["counters"] = worker.cache_counters()
+            conn.send(response)
+    except KeyboardInterrupt:
+        pass
+
+
+class _Slot:
+    __slots__ = ("index", "process", "conn")
+
+    def __init__(self, index, process, conn):
+        self.index = index
+        self.process = process
+        self.conn = conn
+
+
+class WorkerPool:
+    """Fixed set of warm worker processes; callers block until one is idle"""
+
+    def __init__(self, size: Optional[int] = None, modules_path: str = "modules",
+                 cache_dir: Optional[str] = None):
+        self.size = max(1, size or os.cpu_count() or 1)
+        self.modules_path = modules_path
+        self.cache_dir = cache_dir
+        self._ctx = multiprocessing.get_context()
+        self._lock = threading.Lock()
+        self._idle: "queue.Queue[_Slot]" = queue.Queue()
+        self.waiting = 0
+        self.busy = 0
+        self.restarts = 0
+        self._counters: Dict[int, Dict[str, int]] = {}
+        self._slots = [self._spawn(i) for i in range(self.size)]
+        for slot in self._slots:
+            self._idle.put(slot)
+
+    def _spawn(self, index: int) -> _Slot:
+        parent, child = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main, args=(child, self.modules_path, self.cache_dir),
+            name=f"wodcraft-worker-{index}", daemon=True,
+        )
+        process.start()
+        child.close()
+        return _Slot(index, process, parent)
+
+    def call(self, method: str, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Run one request on the next idle worker; raises queue.Empty after ``timeout``"""
+        with self._lock:
+            self.waiting += 1
+        try:
+            slot = self._idle.get(timeout=timeout)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        with self._lock:
+            self.busy += 1
+        try:
+            slot.conn.send({"method": method, "params": params})
+            response = slot.conn.recv()
+        except (EOFError, OSError) as e:
+            slot = self._restart(slot)
+            response = {"ok": False, "error": {"type": "WorkerCrashed", "message": str(e) or "worker exited"}}
+        finally:
+            with self._lock:
+                self.busy -= 1
+            self._idle.put(slot)
+        counters = response.pop("counters", None)
+        if counters is not None:
+            self._counters[slot.index] = counters
+        return response
+
+    def _restart(self, slot: _Slot) -> _Slot:
+        try:
+            slot.conn.close()
+        finally:
+            if slot.process.is_alive():
+                slot.process.terminate()
+            slot.process.join(1)
+        self.restarts += 1
+        self._counters.pop(slot.index, None)
+        fresh = self._spawn(slot.index)
+        self._slots[slot.index] = fresh
+        return fresh
+
+    def counters(self) -> Dict[str, int]:
+        """Worker request/cache counters summed over the pool"""
+        totals: Dict[str, int] = {}
+        for counters in list(self._counters.values()):
+            for name, value in counters.items():
+                totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def close(self):
+        for slot in self._slots:
+            try:
+                slot.conn.send(None)
+            except OSError:
+                pass
+        for slot in self._slots:
+            slot.process.join(2)
+            if slot.process.is_alive():
+                slot.process.terminate()
+            slot.conn.close()
+
+
+class CompileHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer holding the worker pool and metrics"""
+
+    daemon_threads = True
+
+    def __init__(self, address, pool: WorkerPool, queue_timeout: float = 30.0):
+        super().__init__(address, CompileRequestHandler)
+        self.pool = pool
+        self.metrics = Metrics()
+        self.queue_timeout = queue_timeout
+        self.started = time.time()
+
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        counters = self.pool.counters()
+        hits, misses = counters.get("cache_hits", 0), counters.get("cache_misses", 0)
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "workers": self.pool.size,
+            "busy_workers": self.pool.busy,
+            "queue_depth": self.pool.waiting,
+            "worker_restarts": self.pool.restarts,
+            **self.metrics.snapshot(),
+            "cache": dict(counters, hit_rate=hits / (hits + misses) if hits + misses else 0.0),
+        }
+
+
+class CompileRequestHandler(BaseHTTPRequestHandler):
+    server: CompileHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # keep stderr quiet; /metrics has the numbers
+        pass
+
+    def _send(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _params(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        if self.headers.get_content_type() == "application/json":
+            params = json.loads(raw or "{}")
+            if not isinstance(params, dict):
+                raise ValueError("JSON body must be an object")
+            return params
+        return {"text": raw}
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            self._send(200, self.server.metrics_snapshot())
+        elif path == "/healthz":
+            self._send(200, {"ok": True})
+        else:
+            self._send(404, {"ok": False, "error": {"type": "NotFound", "message": f"No route for GET {path}"}})
+
+    def do_POST(self):
+        started = time.perf_counter()
+        path = self.path.split("?", 1)[0]
+        method = ENDPOINTS.get(path)
+        if method is None:
+            self._send(404, {"ok": False, "error": {"type": "NotFound", "message": f"No route for POST {path}"}})
+            return
+        try:
+            params = self._params()
+        except ValueError as e:
+            status, payload = 400, {"ok": False, "error": {"type": "InvalidRequest", "message": str(e)}}
+        else:
+            try:
+                payload = self.server.pool.call(method, params, timeout=self.server.queue_timeout)
+            except queue.Empty:
+                status, payload = 503, {"ok": False, "error": {"type": "Busy", "message": "No worker available"}}
+            else:
+                payload.pop("id", None)
+                if payload.get("ok"):
+                    status = 200
+                else:
+                    status = 400 if payload["error"].get("type") in CLIENT_ERRORS else 500
+        self._send(status, payload)
+        self.server.metrics.observe(path, status, time.perf_counter() - started)
+
+
+def serve_http(host: str = "127.0.0.1", port: int = 8080, workers: Optional[int] = None,
+               modules_path: str = "modules", cache_dir: Optional[str] = None) -> int:
+    """Run the service until interrupted"""
+    pool = WorkerPool(workers, modules_path, cache_dir)
+    server = CompileHTTPServer((host, port), pool)
+    print(f"wodc http listening on http://{host}:{server.server_address[1]} ({pool.size} workers)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+    return 0
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+JSON output helpers for the CLI: streamed, compact and JSON-lines writers.
+
+- Pretty output (``indent=2``, the historical format) is encoded chunk by
+  chunk and written as it goes instead of being built as one string.
+- Compact output and JSON lines use a fast backend (``orjson``) when it is
+  installed, the standard library otherwise; ``WODCRAFT_JSON=stdlib`` forces
+  the standard library.
+- JSON lines split a document into records so large sessions never need one
+  giant line: ``{"section": "sessions", "index": 0, "node": {...}}`` per
+  top-level node, with realized events moved out of their session into
+  ``{"section": "realized_event", "session": 0, "index": 3, "node": {...}}``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from typing import Any, Dict, IO, Iterable, Iterator, Optional
+
+JSON_BACKEND_ENV = "WODCRAFT_JSON"
+CHUNK_SIZE = 64 * 1024
+
+try:  # optional fast backend
+    import orjson as _orjson  # type: ignore
+except ImportError:  # pragma: no cover - depends on the environment
+    _orjson = None
+
+
+def backend_name() -> str:
+    """``orjson`` when installed and not disabled via $WODCRAFT_JSON, else ``stdlib``"""
+    if _orjson is not None and os.environ.get(JSON_BACKEND_ENV, "").lower() != "stdlib":
+        return "orjson"
+    return "stdlib"
+
+
+def dumps_compact(obj: Any) -> str:
+    """Single-line JSON with the selected backend"""
+    if backend_name() == "orjson":
+        return _orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def write_json(obj: Any, stream: IO[str], compact: bool = False):
+    """Write ``obj`` followed by a newline; pretty output is streamed in chunks"""
+    if compact:
+        stream.write(dumps_compact(obj))
+        stream.write("\n")
+        return
+    buffer = []
+    size = 0
+    for chunk in json.JSONEncoder(indent=2).iterencode(obj):
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= CHUNK_SIZE:
+            stream.write("".join(buffer))
+            buffer.clear()
+            size = 0
+    buffer.append("\n")
+    stream.write("".join(buffer))
+
+
+def write_jsonl(records: Iterable[Any], stream: IO[str]):
+    """One compact JSON document per line"""
+    for record in records:
+        stream.write(dumps_compact(record))
+        stream.write("\n")
+
+
+def _session_records(section: str, session: Dict[str, Any], position: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+    realized = session.get("realized")
+    data = realized.get("data") if isinstance(realized, dict) else None
+    events = data.get("events") if isinstance(data, dict) else None
+    if not isinstance(events, list):
+        yield dict(section=section, node=session, **position)
+        return
+    header = dict(session, realized=dict(realized, data=dict(data, events=[])))
+    yield dict(section=section, node=header, realized_events=len(events), **position)
+    owner = position.get("index", 0)
+    for i, event in enumerate(events):
+        yield {"section": "realized_event", "session": owner, "index": i, "node": event}
+
+
+def iter_records(document: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Split a parsed AST (``{"modules": [...], ...}``) or a compiled session (``{"session": {...}}``)"""
+    for section, value in document.items():
+        if isinstance(value, list):
+            items = [(node, {"index": i}) for i, node in enumerate(value)]
+        else:
+            items = [(value, {})]
+        for node, position in items:
+            if section in ("sessions", "session") and isinstance(node, dict):
+                yield from _session_records(section, node, position)
+            else:
+                yield dict(section=section, node=node, **position)
+
+
+def merge_records(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rebuild the document written by iter_records"""
+    document: Dict[str, Any] = {}
+    sessions: Dict[int, Dict[str, Any]] = {}
+    for record in records:
+        section = record["section"]
+        node = record["node"]
+        if section == "realized_event":
+            sessions[record["session"]]["realized"]["data"]["events"].append(node)
+            continue
+        if "realized_events" in record:
+            realized = node["realized"]
+            node = dict(node, realized=dict(realized, data=dict(realized["data"], events=[])))
+            sessions[record.get("index", 0)] = node
+        if "index" in record:
+            document.setdefault(section, []).append(node)
+        else:
+            document[section] = node
+    return document
+
+
+def open_output(path: Optional[str]) -> IO[str]:
+    """Text stream for ``-o/--output`` (a file) or stdout"""
+    if path and path != "-":
+        return open(path, "w", encoding="utf-8")
+    return sys.stdout
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Language server for WODCraft sources (``wodc lsp``), standard library only.
+
+Speaks the Language Server Protocol (JSON-RPC with ``Content-Length``
+framing) on stdin/stdout. One process keeps, for the whole editing session:
+
+  - every open document with an ``IncrementalParser`` (only edited top-level
+    blocks are re-parsed),
+  - a warm ``SessionCompiler`` (resolved modules and compiled sessions),
+  - an in-memory index of movement names (movements catalog) and module
+    refs (modules directory plus modules defined in open documents).
+
+Supported: ``textDocument/didOpen|didChange|didSave|didClose`` (full sync),
+``textDocument/publishDiagnostics`` and ``textDocument/completion``.
+Diagnostics are computed once edits stop for ``debounce`` seconds and only
+published when they changed: every syntax error (recovering parse), then,
+per session, unresolved imports and compiler warnings.
+
+Completion offers module refs after ``import`` and movement names elsewhere
+(label: preferred name, inserted: catalog id, like the VS Code extension).
+
+Latency is recorded per method (and for ``diagnostics`` runs); the custom
+``wodcraft/stats`` request returns p50/p99 plus parser and cache counters,
+and ``trace=True`` (``wodc lsp --trace``) logs every request to stderr.
+"""
+from __future__ import annotations
+
+import bisect
+import contextlib
+import io
+import json
+import queue
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, IO, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from . import sdk
+from .core import MOVEMENTS_CATALOG_PATH, WODCraftError, ast_fingerprint, parse_vnext_recover
+from .incremental import IncrementalParser
+from .service import Metrics
+
+# LSP constants
+SEVERITY = {"error": 1, "warning": 2, "info": 3}
+COMPLETION_KIND = {"module": 9, "value": 12}
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+MAX_COMPLETIONS = 100
+
+_IMPORT_PREFIX = re.compile(r"\bimport\s+([\w.@-]*)$")
+_WORD_PREFIX = re.compile(r"[A-Za-z_][\w-]*$")
+_COMPILER_MESSAGE = re.compile(r"^(WARNING|INFO):\s*(.*)$")
+
+
+def read_message(stream: BinaryIO) -> Optional[Dict[str, Any]]:
+    """Read one framed JSON-RPC message (None at end of input)"""
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            if length is not None:
+                break
+            continue
+        name, _, value = line.decode("ascii", "replace").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    return json.loads(body.decode("utf-8"))
+
+
+def write_message(stream: BinaryIO, payload: Dict[str, Any]):
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body))
+    stream.write(body)
+    stream.flush()
+
+
+def uri_to_path(uri: str) -> Path:
+    return Path(unquote(urlparse(uri).path))
+
+
+class MovementIndex:
+    """Movement names from a catalog, sorted for prefix lookups"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else MOVEMENTS_CATALOG_PATH
+        try:
+            movements = json.loads(self.path.read_text(encoding="utf-8")).get("movements") or {}
+        except (OSError, ValueError):
+            movements = {}
+        entries: List[Tuple[str, Dict[str, Any]]] = []
+        for key, spec in movements.items():
+            spec = spec if isinstance(spec, dict) else {}
+            preferred = spec.get("preferred") or key
+            aliases = [a for a in spec.get("aliases") or [] if isinstance(a, str)]
+            item = {
+                "label": preferred,
+                "kind": COMPLETION_KIND["value"],
+                "detail": key + (f" — {spec['category']}" if spec.get("category") else ""),
+                "insertText": key,
+                "filterText": " ".join(dict.fromkeys([key, preferred] + aliases)),
+            }
+            # Indexed under the id, the preferred name and every alias
+            for name in {key, preferred, *aliases}:
+                entries.append((name.lower(), item))
+        entries.sort(key=lambda entry: entry[0])
+        self._keys = [name for name, _ in entries]
+        self._items = [item for _, item in entries]
+        self.movements = len(movements)
+
+    def complete(self, prefix: str, limit: int = MAX_COMPLETIONS) -> Tuple[List[Dict[str, Any]], bool]:
+        """Items whose id, preferred name or an alias starts with ``prefix`` (and whether truncated)"""
+        prefix = prefix.lower()
+        found: List[Dict[str, Any]] = []
+        seen = set()
+        for i in range(bisect.bisect_left(self._keys, prefix), len(self._keys)):
+            if not self._keys[i].startswith(prefix):
+                break
+            item = self._items[i]
+            if id(item) not in seen:
+                if len(found) == limit:
+                    return found, True
+                seen.add(id(item))
+                found.append(item)
+        return found, False
+
+
+class Document:
+    """An open text document and what was last computed for it"""
+
+    def __init__(self, uri: str, text: str, version: Optional[int] = None):
+        self.uri = uri
+        self.text = text
+        self.version = version
+        self.parser = IncrementalParser()
+        self.ast: Dict[str, Any] = {"modules": [], "sessions": []}
+        self.published: Optional[List[Dict[str, Any]]] = None
+
+
+def _utf16(text: str, index: int) -> int:
+    # LSP positions count UTF-16 code units, Python strings count code points
+    return index + sum(1 for char in text[:index] if ord(char) > 0xFFFF)
+
+
+def _code_point(text: str, character: int) -> int:
+    # Inverse of _utf16: string index of an LSP ``character`` offset in ``text``
+    units = 0
+    for index, char in enumerate(text):
+        if units >= character:
+            return index
+        units += 2 if ord(char) > 0xFFFF else 1
+    return len(text)
+
+
+def _range(line: int, start: int, end: int, text: str = "") -> Dict[str, Any]:
+    # ``start``/``end`` index ``text`` (the line, or at least its beginning)
+    start, end = _utf16(text, start), _utf16(text, end)
+    return {"start": {"line": line, "character": start}, "end": {"line": line, "character": end}}
+
+
+def _diagnostic(rng: Dict[str, Any], message: str, severity: str, code: str) -> Dict[str, Any]:
+    return {"range": rng, "severity": SEVERITY[severity], "code": code, "source": "wodcraft", "message": message}
+
+
+class LanguageServer:
+    """LSP method handlers over warm parser, compiler and completion indexes"""
+
+    def __init__(self, modules_path: str = "modules", cache_dir: Optional[str] = None,
+                 debounce: float = 0.2, catalog_path: Optional[str] = None, trace: bool = False,
+                 log: Optional[IO[str]] = None):
+        self.modules_path = modules_path
+        self.cache_dir = cache_dir
+        self.debounce = debounce
+        self.catalog_path = catalog_path
+        self.trace = trace
+        self.log = log or sys.stderr
+        self.root: Optional[Path] = None
+        self.documents: Dict[str, Document] = {}
+        self.pending: Dict[str, float] = {}  # uri -> monotonic time its diagnostics are due
+        self.metrics = Metrics()
+        self.shutdown_requested = False
+        self.exited = False
+        self._compiler = None
+        self._movements: Optional[MovementIndex] = None
+        self._module_refs: Optional[List[str]] = None
+        self._session_checks: Dict[str, List[Tuple[str, str, str]]] = {}  # session fingerprint -> findings
+        self.requests: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown,
+            "textDocument/completion": self._completion,
+            "wodcraft/stats": self._stats,
+        }
+        self.notifications: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            "initialized": lambda params: None,
+            "exit": self._exit,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didSave": self._did_save,
+            "textDocument/didClose": self._did_close,
+            "workspace/didChangeWatchedFiles": lambda params: self._modules_changed(),
+        }
+        # Notifications to send (publishDiagnostics from didClose)
+        self.outbox: List[Dict[str, Any]] = []
+
+    # -- warm state ----------------------------------------------------------
+
+    def _workspace_path(self, path: str) -> Path:
+        path = Path(path)
+        return path if path.is_absolute() or self.root is None else self.root / path
+
+    def modules_dir(self) -> Path:
+        return self._workspace_path(self.modules_path)
+
+    def compiler(self):
+        if self._compiler is None:
+            self._compiler = sdk.session_compiler(self.modules_dir(), self.cache_dir)
+        return self._compiler
+
+    def movements(self) -> MovementIndex:
+        if self._movements is None:
+            path = self._workspace_path(self.catalog_path) if self.catalog_path else None
+            index = MovementIndex(path)
+            if not index.movements and path is not None:
+                print(f"[wodc lsp] no movements in {path}, using the bundled catalog", file=self.log, flush=True)
+                index = MovementIndex()
+            if not index.movements:
+                print(f"[wodc lsp] movement completion disabled: no movements in {index.path}",
+                      file=self.log, flush=True)
+            self._movements = index
+        return self._movements
+
+    def module_refs(self) -> List[str]:
+        """``ns.name@version`` of every module on disk or in an open document (sorted)"""
+        if self._module_refs is None:
+            refs = set()
+            with contextlib.suppress(OSError):
+                for ref in self.compiler().resolver.list():
+                    refs.add(f"{ref.namespace}.{ref.name}@{ref.version}")
+            self._module_refs = sorted(refs)
+        refs = set(self._module_refs)
+        for document in self.documents.values():
+            for module in document.ast.get("modules", []):
+                refs.add(f"{module.get('id')}@{module.get('version', 'v1')}")
+        return sorted(refs)
+
+    def _modules_changed(self):
+        self._module_refs = None
+        self._session_checks.clear()
+        if self._compiler is not None:
+            self._compiler.clear_cache()
+        for uri in self.documents:
+            self.pending.setdefault(uri, time.monotonic())
+
+    # -- dispatch ------------------------------------------------------------
+
+    def handle(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Answer one decoded message: a response for requests, None for notifications"""
+        method = message.get("method")
+        params = message.get("params") or {}
+        is_request = "id" in message
+        started = time.perf_counter()
+        status = 0
+        response: Optional[Dict[str, Any]] = None
+        handler = (self.requests if is_request else self.notifications).get(method)
+        try:
+            if handler is None:
+                if is_request:
+                    status = METHOD_NOT_FOUND
+                    response = {"jsonrpc": "2.0", "id": message["id"],
+                                "error": {"code": METHOD_NOT_FOUND, "message": f"Unknown method: {method}"}}
+                return response  # unknown notifications ($/...) are ignored
+            with contextlib.redirect_stdout(io.StringIO()):  # stdout is the protocol stream
+                result = handler(params)
+            if is_request:
+                response = {"jsonrpc": "2.0", "id": message["id"], "result": result}
+        except Exception as e:
+            status = INTERNAL_ERROR
+            if is_request:
+                response = {"jsonrpc": "2.0", "id": message["id"],
+                            "error": {"code": INTERNAL_ERROR, "message": f"{type(e).__name__}: {e}"}}
+        finally:
+            self._observe(str(method), status, time.perf_counter() - started)
+        return response
+
+    def _observe(self, name: str, status: int, seconds: float):
+        self.metrics.observe(name, status, seconds)
+        if self.trace:
+            print(f"[wodc lsp] {name} {seconds * 1000:.2f} ms" + (f" error {status}" if status else ""),
+                  file=self.log, flush=True)
+
+    def next_due(self) -> Optional[float]:
+        return min(self.pending.values()) if self.pending else None
+
+    def flush(self, now: Optional[float] = None, force: bool = False) -> List[Dict[str, Any]]:
+        """Notifications ready to send: queued ones plus diagnostics whose debounce expired"""
+        now = time.monotonic() if now is None else now
+        messages, self.outbox = self.outbox, []
+        for uri, due in list(self.pending.items()):
+            if force or due <= now:
+                del self.pending[uri]
+                message = self.publish(uri)
+                if message is not None:
+                    messages.append(message)
+        return messages
+
+    # -- diagnostics ---------------------------------------------------------
+
+    def diagnostics(self, document: Document) -> List[Dict[str, Any]]:
+        """Syntax errors (all of them), then per-session import errors and compiler warnings"""
+        found: List[Dict[str, Any]] = []
+        try:
+            document.ast = document.parser.parse(document.text)
+        except WODCraftError:
+            document.ast, errors = parse_vnext_recover(document.text)
+            lines = document.text.split("\n")
+            for e in errors:
+                line, column = max((e.line or 1) - 1, 0), max((e.column or 1) - 1, 0)
+                message = e.args[0] if e.args else str(e)
+                if e.suggestion:
+                    message += f" ({e.suggestion})"
+                text = lines[line] if line < len(lines) else ""
+                found.append(_diagnostic(_range(line, column, column + 1, text), message, "error", "syntax"))
+        for session in document.ast.get("sessions", []):
+            findings = self.check_session(session)
+            if findings:
+                rng = self._session_range(document.text, session.get("title", ""))
+                found.extend(_diagnostic(rng, message, severity, code) for severity, code, message in findings)
+        return found
+
+    def check_session(self, session: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+        """Compile one session; (severity, code, message) per failure or compiler warning (memoized)"""
+        key = ast_fingerprint(session)
+        findings = self._session_checks.get(key)
+        if findings is None:
+            findings = []
+            captured = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(captured):
+                    self.compiler().compile_session(session)
+            except Exception as e:
+                findings.append(("error", "compile", str(e)))
+            for line in captured.getvalue().splitlines():
+                match = _COMPILER_MESSAGE.match(line.strip())
+                if match:
+                    findings.append((match.group(1).lower(), "compile", match.group(2)))
+            if len(self._session_checks) >= 1024:
+                self._session_checks.clear()
+            self._session_checks[key] = findings
+        return findings
+
+    @staticmethod
+    def _session_range(text: str, title: str) -> Dict[str, Any]:
+        match = re.search(r'\bsession\s+"' + re.escape(title) + '"', text)
+        if match is None:
+            return _range(0, 0, 1)
+        line = text.count("\n", 0, match.start())
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        start = match.start() - line_start
+        return _range(line, start, start + len(match.group()), text[line_start:match.end()])
+
+    def publish(self, uri: str) -> Optional[Dict[str, Any]]:
+        """publishDiagnostics for ``uri``, or None when unchanged since the last one sent"""
+        document = self.documents.get(uri)
+        if document is None:
+            return None
+        started = time.perf_counter()
+        found = self.diagnostics(document)
+        self._observe("diagnostics", 0, time.perf_counter() - started)
+        if found == document.published:
+            return None
+        document.published = found
+        return {"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics",
+                "params": {"uri": uri, "version": document.version, "diagnostics": found}}
+
+    # -- handlers ------------------------------------------------------------
+
+    def _initialize(self, params):
+        root = params.get("rootUri") or params.get("rootPath")
+        if root:
+            self.root = uri_to_path(root) if "://" in root else Path(root)
+        options = params.get("initializationOptions") or {}
+        self.modules_path = options.get("modulesPath", self.modules_path)
+        self.catalog_path = options.get("catalogPath", self.catalog_path)
+        return {
+            "capabilities": {
+                "textDocumentSync": {"openClose": True, "change": 1, "save": {"includeText": False}},
+                "completionProvider": {"triggerCharacters": [" ", ".", "@"]},
+            },
+            "serverInfo": {"name": "wodcraft"},
+        }
+
+    def _shutdown(self, params):
+        self.shutdown_requested = True
+        return None
+
+    def _exit(self, params):
+        self.exited = True
+
+    def _did_open(self, params):
+        item = params["textDocument"]
+        self.documents[item["uri"]] = Document(item["uri"], item.get("text", ""), item.get("version"))
+        self.pending[item["uri"]] = time.monotonic()
+
+    def _did_change(self, params):
+        document = self.documents.get(params["textDocument"]["uri"])
+        changes = params.get("contentChanges") or []
+        if document is None or not changes:
+            return
+        document.text = changes[-1]["text"]  # full sync: the last change is the whole text
+        document.version = params["textDocument"].get("version")
+        self.pending[document.uri] = time.monotonic() + self.debounce
+
+    def _did_save(self, params):
+        uri = params["textDocument"]["uri"]
+        path = uri_to_path(uri)
+        with contextlib.suppress(ValueError):
+            path.resolve().relative_to(self.modules_dir().resolve())
+            self._modules_changed()
+        if uri in self.documents:
+            self.pending[uri] = time.monotonic()
+
+    def _did_close(self, params):
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        self.pending.pop(uri, None)
+        self.outbox.append({"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics",
+                            "params": {"uri": uri, "diagnostics": []}})
+
+    def _completion(self, params):
+        document = self.documents.get(params["textDocument"]["uri"])
+        if document is None:
+            return {"isIncomplete": False, "items": []}
+        position = params["position"]
+        lines = document.text.split("\n")
+        line = lines[position["line"]] if position["line"] < len(lines) else ""
+        before = line[:_code_point(line, position["character"])]
+        match = _IMPORT_PREFIX.search(before)
+        if match:
+            prefix = match.group(1)
+            items = [{"label": ref, "kind": COMPLETION_KIND["module"], "detail": "module"}
+                     for ref in self.module_refs() if ref.startswith(prefix)]
+            return {"isIncomplete": False, "items": items[:MAX_COMPLETIONS]}
+        match = _WORD_PREFIX.search(before)
+        if not match:
+            return {"isIncomplete": False, "items": []}
+        items, truncated = self.movements().complete(match.group())
+        return {"isIncomplete": truncated, "items": items}
+
+    def _stats(self, params):
+        parsed = reused = 0
+        for document in self.documents.values():
+            stats = document.parser.stats()
+            parsed += stats["blocks_parsed"]
+            reused += stats["blocks_reused"]
+        metrics = self.metrics.snapshot()
+        return {
+            "latency": metrics["latency"],
+            "requests": metrics["requests"],
+            "documents": len(self.documents),
+            "blocks": {"parsed": parsed, "reused": reused},
+            "movements": self.movements().movements,
+            "module_refs": len(self.module_refs()),
+            "parser": sdk.parser_stats(),
+            "compiler": self._compiler.get_cache_stats() if self._compiler is not None else None,
+        }
+
+
+def serve_lsp(server: LanguageServer, stdin: Optional[BinaryIO] = None,
+              stdout: Optional[BinaryIO] = None) -> int:
+    """Run the server until ``exit`` (exit code 0 after ``shutdown``, 1 otherwise) or end of input"""
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    inbox: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+
+    def reader():
+        while True:
+            try:
+                message = read_message(stdin)
+            except (ValueError, OSError):
+                message = None
+            inbox.put(message)
+            if message is None:
+                return
+
+    threading.Thread(target=reader, name="wodc-lsp-reader", daemon=True).start()
+    while not server.exited:
+        due = server.next_due()
+        timeout = None if due is None else max(0.0, due - time.monotonic())
+        try:
+            message = inbox.get(timeout=timeout)
+        except queue.Empty:
+            message = {}
+        if message is None:  # end of input
+            for notification in server.flush(force=True):
+                write_message(stdout, notification)
+            break
+        if message:
+            response = server.handle(message)
+            if response is not None:
+                write_message(stdout, response)
+        for notification in server.flush():
+            write_message(stdout, notification)
+    return 0 if server.shutdown_requested else 1
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Fast pre-validation before the LALR parse (``sdk.quick_check``, ``wodc validate --fast``).
+
+Obviously malformed input (chat answers, pasted notes, truncated files) is
+rejected by three cheap checks, in this order:
+
+  1. keyword scan: the first token must open a top-level ``module``,
+     ``session`` or ``programming`` block;
+  2. lexer: every character must be covered by a terminal of GRAMMAR_VNEXT.
+     The parser's own terminals, ordered like Lark's basic lexer orders them,
+     are joined into one regex so the whole text is lexed in a single C call;
+  3. brace balancing: braces (outside strings and comments) must balance and
+     every top-level block must start with one of the keywords above.
+
+The checks only reject input that ``parse_vnext`` rejects too; passing them
+does not make the input valid. The error reported is the first problem the
+checks find, which can differ from the first error of the full parse.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional, Pattern
+
+from lark.lexer import BasicLexer
+
+from .core import WODCraftError, get_parser
+
+TOP_LEVEL_KEYWORDS = ("module", "session", "programming")
+
+_TRIVIA = re.compile(r"(?:\s+|//[^\n]*|/\*[\s\S]*?\*/)*")
+_KEYWORD = re.compile("|".join(TOP_LEVEL_KEYWORDS))  # the contextual lexer needs no word boundary
+# Braces, plus the strings and comments whose braces do not count
+_BRACES = re.compile(r'[{}]|"(?:[^"\\\n]|\\.)*"|//[^\n]*|/\*[\s\S]*?\*/')
+_WORD = re.compile(r"\S{1,20}")
+
+_lexer_regex: Optional[Pattern[str]] = None
+
+
+def lexer_regex() -> Pattern[str]:
+    """Greedy regex matching a run of GRAMMAR_VNEXT tokens (built once from the parser's terminals)"""
+    global _lexer_regex
+    if _lexer_regex is None:
+        terminals = BasicLexer(get_parser().lexer_conf).terminals  # sorted in Lark's match order
+        alternatives = "|".join(terminal.pattern.to_regexp() for terminal in terminals)
+        _lexer_regex = re.compile(f"(?:{alternatives})*")
+    return _lexer_regex
+
+
+def _error(text: str, position: int, message: str, suggestion: Optional[str] = None) -> WODCraftError:
+    line = text.count("\n", 0, position) + 1
+    start = text.rfind("\n", 0, position) + 1
+    end = text.find("\n", position)
+    source_line = text[start:end if end >= 0 else len(text)]
+    return WODCraftError(message, line, position - start + 1, source_line, suggestion)
+
+
+def _unexpected(text: str, position: int, suggestion: Optional[str] = None) -> WODCraftError:
+    word = _WORD.match(text, position)
+    return _error(text, position, f"Syntax error at '{word.group() if word else text[position:position + 1]}'",
+                  suggestion)
+
+
+def _top_level(text: str, position: int) -> Optional[WODCraftError]:
+    # After whitespace/comments, either the end of the text or a top-level keyword
+    position = _TRIVIA.match(text, position).end()
+    if position < len(text) and not _KEYWORD.match(text, position):
+        return _unexpected(text, position, "Expected a top-level block: module, session or programming")
+    return None
+
+
+def quick_check(text: str) -> Optional[WODCraftError]:
+    """First problem found by the fast checks, or None when the text may be valid"""
+    error = _top_level(text, 0)
+    if error is not None:
+        return error
+
+    end = lexer_regex().match(text).end()
+    if end < len(text):
+        return _error(text, end, f"Syntax error at '{text[end]}'",
+                      "Unterminated string (use double quotes)" if text[end] == '"' else None)
+
+    opened = []  # positions of unclosed "{"
+    for match in _BRACES.finditer(text):
+        token = match.group()
+        if token == "{":
+            opened.append(match.start())
+        elif token == "}":
+            if not opened:
+                return _unexpected(text, match.start(), "Unmatched closing brace '}'")
+            opened.pop()
+            if not opened:
+                error = _top_level(text, match.end())
+                if error is not None:
+                    return error
+    if opened:
+        line = text.count("\n", 0, opened[-1]) + 1
+        return _error(text, len(text.rstrip()), f"Syntax error: '{{' opened at line {line} is never closed",
+                      "Missing closing brace '}' to end block")
+    return None
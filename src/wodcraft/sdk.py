@@ -6,28 +6,82 @@ without exposing internal names. Import from here for stable integration.
 Examples:
   from wodcraft import sdk
   ok, err = sdk.validate(text)
+  ok, err = sdk.quick_check(text)   # fast reject of garbage, then sdk.validate
+  ast, errors = sdk.diagnose(text)
+  report = sdk.lint(text)
   ast = sdk.parse(text)
+  typed = sdk.parse(text, typed=True)
+  parser = sdk.incremental_parser(); ast = parser.parse(text)
+  sdk.dump_ast(ast, "lib.wodast"); ast = sdk.load_ast("lib.wodast")
   compiled = sdk.compile_session(text, modules_path="modules")
+  compiled = sdk.compile_session(text, modules_path="modules", cache_dir=".wodcraft-cache")
+  records = sdk.compile_all(text, modules_path="modules", jobs=4)   # every session, in order
+  sdk.build_bundle("modules", "modules.wodpack")   # then modules_path="modules.wodpack"
   ics = sdk.export_ics(compiled)
   agg = sdk.results(text, modules_path="modules")
   tl = sdk.run(text, modules_path="modules")
+  stats = sdk.parser_stats()
+  with sdk.profile() as prof: sdk.parse(text)   # prof.format_table() / prof.as_dict()
+  sdk.seed_interning(); strings = sdk.intern_stats()
 """
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from .core import (
+    PARSER_REGISTRY,
+    STRING_TABLE,
+    ProgrammingLinter,
+    WODCraftError,
     parse_vnext,
+    parse_vnext_recover,
+    profile_parsing,
     FileSystemResolver,
     SessionCompiler,
     TeamRealizedAggregator,
 )
+from .cache import DiskCache, configured_cache_dir
 
 
-def parse(text: str) -> Dict[str, Any]:
-    """Parse WODCraft source to an AST dict."""
-    return parse_vnext(text)
+def parse(text: str, single_pass: bool = False, typed: bool = False, lean: bool = False) -> Any:
+    """Parse WODCraft source to an AST dict (single_pass builds it during LALR reduction).
+
+    typed=True returns the compact slotted AST (wodcraft.typed_ast); ``.to_dict()`` gives the dict back.
+    lean=True leaves out re-derivable fields (``core.raw_text`` recomputes a missing ``raw``).
+    """
+    ast = parse_vnext(text, single_pass=single_pass, lean=lean)
+    if typed:
+        from .typed_ast import to_typed
+        return to_typed(ast)
+    return ast
+
+
+def incremental_parser(lean: bool = False):
+    """Parser for a document edited over time: ``.parse(text)`` re-parses only changed top-level blocks.
+
+    Returns the same AST as ``parse`` (see wodcraft.incremental); ``.stats()`` counts reused blocks.
+    """
+    from .incremental import IncrementalParser
+    return IncrementalParser(lean=lean)
+
+
+def dump_ast(ast: Dict[str, Any], path: str) -> Path:
+    """Write a parsed AST in the compact binary format (wodcraft.binary_ast)."""
+    from .binary_ast import dump_ast as _dump_ast
+    return _dump_ast(ast, path)
+
+
+def load_ast(path: str) -> Dict[str, Any]:
+    """Read a whole AST written by ``dump_ast``; ``open_ast`` reads single nodes instead."""
+    from .binary_ast import load_ast as _load_ast
+    return _load_ast(path)
+
+
+def open_ast(path: str):
+    """Memory-mapped reader (``.module(id)``, ``.session(title)``, ``.get(section, i)``) for ``dump_ast`` files."""
+    from .binary_ast import ASTReader
+    return ASTReader(path)
 
 
 def validate(text: str) -> Tuple[bool, Optional[str]]:
@@ -39,27 +93,151 @@ def validate(text: str) -> Tuple[bool, Optional[str]]:
         return False, str(e)
 
 
-def compile_session(text: str, modules_path: str | Path = "modules") -> Dict[str, Any]:
+def quick_check(text: str) -> Tuple[bool, Optional[str]]:
+    """Microsecond pre-check (keywords, lexer, braces) before a full parse. Returns (ok, error_message).
+
+    ok=False means the text is certainly invalid; ok=True only means the full parse is still needed.
+    """
+    from .quickcheck import quick_check as _quick_check
+    error = _quick_check(text)
+    return error is None, (str(error) if error is not None else None)
+
+
+def diagnose(text: str, max_errors: int = 100) -> Tuple[Dict[str, Any], List[WODCraftError]]:
+    """Parse with error recovery: (partial AST, every syntax error in source order).
+
+    Each WODCraftError carries ``line``, ``column`` and ``suggestion``; valid input gives
+    the same AST as ``parse`` and no errors.
+    """
+    return parse_vnext_recover(text, max_errors=max_errors)
+
+
+def lint(text: str) -> Dict[str, Any]:
+    """Lint programming blocks, or module structure when there are none. Raises on invalid syntax.
+
+    Returns {"kind": "programming", "reports": [...]} or {"kind": "modules", "issues": [...]}.
+    """
+    ast = parse_vnext(text)
+    if "programming" in text:
+        reports = []
+        for blk in ast.get("programming", []):
+            data = blk.get("data", {})
+            issues = ProgrammingLinter().lint(data)
+            reports.append({"programming": data.get("macrocycle", {}).get("name"), "issues": issues})
+        return {"kind": "programming", "reports": reports}
+    issues = []
+    for m in ast.get("modules", []):
+        mid = m.get("id", "<module>")
+        comps = []
+
+        def collect(node):
+            if isinstance(node, dict):
+                t = node.get("type")
+                if t in ("WARMUP", "WOD", "SKILL", "STRENGTH"):
+                    comps.append(node)
+                elif t in ("MODULE_BODY", "BODY"):
+                    for ch in node.get("children", []):
+                        collect(ch)
+                else:
+                    for v in node.values():
+                        collect(v)
+            elif isinstance(node, list):
+                for v in node:
+                    collect(v)
+
+        collect(m.get("body"))
+        if not comps:
+            issues.append({"level": "warning", "code": "M101", "message": f"Module '{mid}' has no components"})
+        for c in comps:
+            ct = c.get("type")
+            if ct == "WOD":
+                if not (c.get("movements") or []):
+                    issues.append({"level": "warning", "code": "M102", "message": f"WOD in '{mid}' has no movements"})
+            elif ct == "WARMUP":
+                if not (c.get("blocks") or []):
+                    issues.append({"level": "warning", "code": "M103", "message": f"Warmup in '{mid}' has no blocks"})
+            elif ct in ("SKILL", "STRENGTH"):
+                if not ((c.get("work") or {}).get("lines") or []):
+                    issues.append({"level": "warning", "code": "M104",
+                                   "message": f"{ct.title()} in '{mid}' has no work lines"})
+    return {"kind": "modules", "issues": issues}
+
+
+def session_compiler(modules_path: str | Path = "modules",
+                     cache_dir: Optional[str | Path] = None) -> SessionCompiler:
+    """Build a SessionCompiler, backed by the on-disk cache when cache_dir or $WODCRAFT_CACHE_DIR is set.
+
+    modules_path is a modules directory or a ``.wodpack`` bundle (see ``build_bundle``).
+    """
+    from .bundle import open_resolver
+    directory = configured_cache_dir(cache_dir)
+    disk_cache = DiskCache(directory) if directory else None
+    return SessionCompiler(open_resolver(modules_path), disk_cache=disk_cache)
+
+
+def build_bundle(modules_path: str | Path, output: str | Path, asts: bool = True) -> Dict[str, Any]:
+    """Pack a modules directory into one ``.wodpack`` file (with parsed ASTs unless asts=False)."""
+    from .bundle import build_bundle as _build_bundle
+    return _build_bundle(modules_path, output, asts=asts)
+
+
+def compile_session(text: str, modules_path: str | Path = "modules",
+                    cache_dir: Optional[str | Path] = None) -> Dict[str, Any]:
     """Compile the first session in the given source. Raises if no session found."""
     ast = parse_vnext(text)
     sessions = ast.get("sessions") or []
     if not sessions:
         raise ValueError("No session found in source")
     session_ast = sessions[0]
-    resolver = FileSystemResolver(Path(modules_path))
-    compiler = SessionCompiler(resolver)
+    compiler = session_compiler(modules_path, cache_dir)
     return compiler.compile_session(session_ast)
 
 
+def compile_all(text: str, modules_path: str | Path = "modules", cache_dir: Optional[str | Path] = None,
+                jobs: int = 1, executor: str = "thread") -> List[Dict[str, Any]]:
+    """Compile every session in the source, in source order: ``[{"index", "title", "ok", "compiled"|"error"}]``.
+
+    A failing session gets an ``error`` record instead of aborting the others; shared imports are resolved once.
+    jobs > 1 (0 = all CPUs) compiles on a thread pool, or worker processes with executor="process".
+    """
+    ast = parse_vnext(text)
+    compiler = session_compiler(modules_path, cache_dir)
+    return compiler.compile_many(ast.get("sessions") or [], jobs=jobs, executor=executor)
+
+
+def parser_stats() -> Dict[str, Any]:
+    """Report how many grammar builds the shared parser registry performed."""
+    return PARSER_REGISTRY.stats()
+
+
+def profile():
+    """Context manager timing the parses inside it: phases (grammar, lex, parse, transform) and transformer methods.
+
+    Yields a ``core.ParseProfile``; read it with ``.format_table()`` or ``.as_dict()``.
+    """
+    return profile_parsing()
+
+
+def intern_stats() -> Dict[str, Any]:
+    """Report the shared AST string table: size, lookups and deduplicated strings."""
+    return STRING_TABLE.stats()
+
+
+def seed_interning(catalog_path: Optional[str] = None) -> int:
+    """Pre-load movement names from the bundled movements catalog (or ``catalog_path``)."""
+    return STRING_TABLE.seed_from_catalog(catalog_path)
+
+
 def export_ics(compiled_session: Dict[str, Any]) -> str:
     """Export an already compiled session to ICS string."""
     dummy = SessionCompiler(FileSystemResolver(Path(".")))
     return dummy.export_ics(compiled_session)
 
 
-def results(text: str, modules_path: str | Path = "modules") -> Dict[str, Any]:
+def results(text: str, modules_path: str | Path = "modules",
+            cache_dir: Optional[str | Path] = None) -> Dict[str, Any]:
     """Compile the session and aggregate team realized results if present."""
-    compiled = compile_session(text, modules_path)
+    compiled = compile_session(text, modules_path, cache_dir)
     session_obj = compiled.get("session", {})
     res = session_obj.get("results")
     if res:
@@ -145,9 +323,8 @@ def _infer_wod_form(form) -> tuple[str, Optional[int]]:
     return (ftype or "WOD", dur)
 
 
-def run(text: str, modules_path: str | Path = "modules") -> Dict[str, Any]:
-    """Produce a simple timeline summary from the first session in source."""
-    compiled = compile_session(text, modules_path)
+def timeline(compiled: Dict[str, Any]) -> Dict[str, Any]:
+    """Simple timeline summary of an already compiled session."""
     sess = compiled.get("session", {})
     comps = sess.get("components", {})
     t = 0
@@ -179,3 +356,8 @@ def run(text: str, modules_path: str | Path = "modules") -> Dict[str, Any]:
         "segments": segments,
     }
 
+
+def run(text: str, modules_path: str | Path = "modules",
+        cache_dir: Optional[str | Path] = None) -> Dict[str, Any]:
+    """Produce a simple timeline summary from the first session in source."""
+    return timeline(compile_session(text, modules_path, cache_dir))
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Long-lived WODCraft worker speaking newline-delimited JSON (``wodc serve``).
+
+One process keeps the parser, the module resolvers and their SessionCompilers
+warm, so callers (e.g. the MCP server) avoid paying interpreter start-up and
+parser construction on every call.
+
+Requests are one JSON object per line on stdin:
+
+  {"id": 1, "method": "parse", "params": {"text": "session \\"A\\" { ... }"}}
+
+``params`` takes ``text`` (or ``path``), plus ``modules_path`` for
+session/run/results (``path`` and ``modules_path`` are refused by workers
+built with ``local_files=False``, e.g. behind ``wodc http``), ``format`` ("json" or "ics") for session and
+``single_pass``/``lean`` flags for parse and ``all_errors`` for validate
+(every syntax error in one pass, under ``errors``).
+Methods: parse, validate, lint, session, run, results, stats, shutdown.
+
+Responses are one JSON object per line on stdout, echoing the request id:
+
+  {"id": 1, "ok": true, "result": {...}}
+  {"id": 1, "ok": false, "error": {"message": "...", "line": 3, "column": 5, "suggestion": "..."}}
+
+Anything the compiler prints (semantic warnings) is returned in a
+``warnings`` list instead of being written to the stream.
+
+``Metrics`` (request counts and latency percentiles) is shared by the
+front ends: ``wodc http`` and ``wodc lsp``.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, IO, List, Optional
+
+from . import sdk
+from .core import SessionCompiler, TeamRealizedAggregator, WODCraftError, parse_vnext, parse_vnext_recover
+
+LATENCY_WINDOW = 2048
+
+
+def error_payload(exc: BaseException) -> Dict[str, Any]:
+    """JSON-friendly description of an exception (with position for WODCraftError)"""
+    payload: Dict[str, Any] = {"type": type(exc).__name__, "message": str(exc)}
+    if isinstance(exc, WODCraftError):
+        payload.update(line=exc.line, column=exc.column, suggestion=exc.suggestion)
+    return payload
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of ``samples`` (None when empty)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, int(round(pct / 100.0 * len(ordered))))
+    return round(ordered[min(rank, len(ordered)) - 1], 3)
+
+
+class Metrics:
+    """Request counts and a sliding window of latencies per endpoint"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.requests: Dict[str, int] = {}
+        self.statuses: Dict[int, int] = {}
+
+    def observe(self, endpoint: str, status: int, seconds: float):
+        with self._lock:
+            self._latencies.setdefault(endpoint, deque(maxlen=self._window)).append(seconds * 1000.0)
+            self._latencies.setdefault("*", deque(maxlen=self._window)).append(seconds * 1000.0)
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Request and status counts plus latency percentiles, copied under one lock"""
+        with self._lock:
+            requests = dict(self.requests)
+            statuses = {str(k): v for k, v in self.statuses.items()}
+            windows = {name: list(samples) for name, samples in self._latencies.items()}
+        latency = {
+            name: {"count": len(samples), "p50_ms": percentile(samples, 50), "p99_ms": percentile(samples, 99)}
+            for name, samples in windows.items()
+        }
+        return {"requests": requests, "statuses": statuses, "latency": latency}
+
+
+class Worker:
+    """Dispatches requests against warm, per-modules-path SessionCompilers"""
+
+    def __init__(self, modules_path: str = "modules", cache_dir: Optional[str] = None, local_files: bool = True):
+        self.modules_path = modules_path
+        self.cache_dir = cache_dir
+        self.local_files = local_files  # False: callers may not name files or module roots
+        self._compilers: Dict[str, SessionCompiler] = {}
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "parse": self._parse,
+            "validate": self._validate,
+            "lint": self._lint,
+            "session": self._session,
+            "run": self._run,
+            "results": self._results,
+            "stats": self._stats,
+        }
+
+    def compiler(self, modules_path: Optional[str] = None) -> SessionCompiler:
+        """Warm compiler for ``modules_path`` (created on first use)"""
+        if modules_path is not None and not self.local_files:
+            raise ValueError("'modules_path' is not accepted by this service")
+        key = str(modules_path or self.modules_path)
+        compiler = self._compilers.get(key)
+        if compiler is None:
+            compiler = sdk.session_compiler(key, self.cache_dir)
+            self._compilers[key] = compiler
+        return compiler
+
+    def handle(self, request: Any) -> Dict[str, Any]:
+        """Answer one decoded request; never raises"""
+        self.requests += 1
+        if not isinstance(request, dict):
+            self.errors += 1
+            return {"id": None, "ok": False, "error": {"type": "InvalidRequest", "message": "Request must be a JSON object"}}
+        rid = request.get("id")
+        method = request.get("method")
+        params = request.get("params") or {}
+        handler = self.handlers.get(method)
+        if handler is None:
+            self.errors += 1
+            return {"id": rid, "ok": False,
+                    "error": {"type": "UnknownMethod", "message": f"Unknown method: {method!r}"}}
+        captured = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(captured):
+                response = {"id": rid, "ok": True, "result": handler(params)}
+        except Exception as e:
+            self.errors += 1
+            response = {"id": rid, "ok": False, "error": error_payload(e)}
+        warnings = [line for line in captured.getvalue().splitlines() if line.strip()]
+        if warnings:
+            response["warnings"] = warnings
+        return response
+
+    COUNTERS = ("cache_hits", "cache_misses", "module_cache_hits", "module_cache_misses",
+                "disk_cache_hits", "disk_cache_misses")
+
+    def cache_counters(self) -> Dict[str, int]:
+        """Request counts plus cache hit/miss counters summed over every compiler"""
+        totals = {"requests": self.requests, "errors": self.errors}
+        totals.update((name, 0) for name in self.COUNTERS)
+        for compiler in self._compilers.values():
+            stats = compiler.get_cache_stats()
+            for name in self.COUNTERS:
+                totals[name] += stats.get(name, 0)
+        return totals
+
+    # -- methods -------------------------------------------------------------
+
+    def _text(self, params: Dict[str, Any]) -> str:
+        if not self.local_files:
+            if "path" in params:
+                raise ValueError("'path' is not accepted by this service: send the source as 'text'")
+            if "text" not in params:
+                raise ValueError("Missing 'text' parameter")
+        if "text" in params:
+            return str(params["text"])
+        if "path" in params:
+            return Path(params["path"]).read_text()
+        raise ValueError("Missing 'text' or 'path' parameter")
+
+    def _first_session(self, params: Dict[str, Any]):
+        sessions = parse_vnext(self._text(params)).get("sessions") or []
+        if not sessions:
+            raise ValueError("No session found in source")
+        compiler = self.compiler(params.get("modules_path"))
+        return sessions[0], compiler, compiler.compile_session(sessions[0])
+
+    def _parse(self, params):
+        return parse_vnext(self._text(params), single_pass=bool(params.get("single_pass")),
+                           lean=bool(params.get("lean")))
+
+    def _validate(self, params):
+        if params.get("all_errors"):
+            _, errors = parse_vnext_recover(self._text(params))
+            return {"valid": not errors, "error": error_payload(errors[0]) if errors else None,
+                    "errors": [error_payload(e) for e in errors]}
+        try:
+            parse_vnext(self._text(params))
+        except WODCraftError as e:
+            return {"valid": False, "error": error_payload(e)}
+        return {"valid": True, "error": None}
+
+    def _lint(self, params):
+        return sdk.lint(self._text(params))
+
+    def _session(self, params):
+        _, compiler, compiled = self._first_session(params)
+        if params.get("format") == "ics":
+            return {"ics": compiler.export_ics(compiled)}
+        return compiled
+
+    def _run(self, params):
+        _, _, compiled = self._first_session(params)
+        return {"timeline": sdk.timeline(compiled)}
+
+    def _results(self, params):
+        session_ast, _, compiled = self._first_session(params)
+        results = compiled.get("session", {}).get("results")
+        if not results:
+            results = TeamRealizedAggregator().aggregate(session_ast, compiled.get("session", {})) or {}
+        return {"results": results}
+
+    def _stats(self, params):
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "parser": sdk.parser_stats(),
+            "interning": sdk.intern_stats(),
+            "compilers": {path: c.get_cache_stats() for path, c in self._compilers.items()},
+        }
+
+
+def serve(worker: Worker, stdin: Optional[IO[str]] = None, stdout: Optional[IO[str]] = None) -> int:
+    """Answer requests line by line until EOF or a ``shutdown`` request"""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            worker.requests += 1
+            worker.errors += 1
+            _write(stdout, {"id": None, "ok": False, "error": {"type": "InvalidJSON", "message": str(e)}})
+            continue
+        if isinstance(request, dict) and request.get("method") == "shutdown":
+            _write(stdout, {"id": request.get("id"), "ok": True, "result": {"shutdown": True}})
+            break
+        _write(stdout, worker.handle(request))
+    return 0
+
+
+def _write(stdout: IO[str], response: Dict[str, Any]):
+    stdout.write(json.dumps(response, separators=(",", ":"), ensure_ascii=False, default=str))
+    stdout.write("\n")
+    stdout.flush()
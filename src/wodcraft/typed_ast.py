@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Opt-in typed AST: compact ``__slots__`` node classes for large in-memory
+libraries, as an alternative to the nested dicts built by ``ToASTvNext``.
+
+  ast = sdk.parse(text, typed=True)       # or to_typed(parse_vnext(text))
+  ast.modules[0].body                     # Node / Wod / MovementLine ...
+  ast.to_dict() == parse_vnext(text)      # lossless, same key order
+
+Savings come from slots instead of per-node dicts, tuples instead of lists,
+and from not storing derived data twice: a MovementLine keeps only its parsed
+children and derives ``movement``/``quantity``/``load``/... on first access
+(with the same ToASTvNext code that builds the dict form, decoded once and
+kept on the line), and MOVEMENT_NAME nodes
+drop the joined ``name`` they can recompute. Nodes whose shape is not
+recognised stay plain dicts/lists, so conversion never loses data.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .core import ToASTvNext
+
+
+class _Absent:
+    """Marker for optional keys missing from the dict form"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "ABSENT"
+
+    def __bool__(self):
+        return False
+
+
+ABSENT = _Absent()
+
+_HELPER = ToASTvNext()
+
+
+def to_plain(value: Any) -> Any:
+    """Dict/list form of a typed value (plain values are returned as-is)"""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, (tuple, list)):
+        return [to_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: to_plain(v) for k, v in value.items()}
+    return value
+
+
+@dataclass
+class Node:
+    """Generic ``{"type": ..., "children": [...]}`` node"""
+    __slots__ = ("type", "children")
+    type: str
+    children: Tuple[Any, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.type == "MOVEMENT_NAME":
+            return {"type": self.type, "name": self.name, "children": to_plain(self.children)}
+        return {"type": self.type, "children": to_plain(self.children)}
+
+    @property
+    def name(self) -> str:
+        return "_".join(str(part) for part in self.children if part is not None)
+
+
+_QUANTITY_LAYOUTS = (
+    ("kind", "value", "raw"),
+    ("kind", "seconds", "raw"),
+    ("kind", "per_gender", "raw"),
+    ("kind", "value", "unit", "raw"),
+    ("kind", "raw"),
+    (),
+)
+
+
+@dataclass
+class Quantity:
+    """Movement/rest quantity (reps, duration, calories, distance, maxrep, raw)"""
+    __slots__ = ("kind", "value", "seconds", "unit", "per_gender", "raw", "layout")
+    kind: Optional[str]
+    value: Optional[float]
+    seconds: Optional[int]
+    unit: Optional[str]
+    per_gender: Optional[Dict[str, Any]]
+    raw: Optional[str]
+    layout: Tuple[str, ...]
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Optional["Quantity"]:
+        keys = tuple(d)
+        for layout in _QUANTITY_LAYOUTS:
+            if keys == layout:
+                return cls(d.get("kind"), d.get("value"), d.get("seconds"), d.get("unit"),
+                           d.get("per_gender"), d.get("raw"), layout)
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: to_plain(getattr(self, key)) for key in self.layout}
+
+
+_LOAD_LAYOUTS = {
+    "LOAD_VALUE": ("type", "value", "unit", "raw"),
+    "LOAD_DUAL": ("type", "per_gender", "raw"),
+    "LOAD_VARIANT": ("type", "label", "variants", "per_gender", "raw"),
+    "LOAD_LITERAL": ("type", "raw"),
+}
+
+
+@dataclass
+class Load:
+    """LOAD_VALUE / LOAD_DUAL / LOAD_VARIANT / LOAD_LITERAL"""
+    __slots__ = ("type", "value", "unit", "raw", "label", "variants", "per_gender")
+    type: str
+    value: Optional[float]
+    unit: Optional[str]
+    raw: Optional[str]
+    label: Optional[str]
+    variants: Optional[Dict[str, Any]]
+    per_gender: Optional[Dict[str, Any]]
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Optional["Load"]:
+        if tuple(d) != _LOAD_LAYOUTS.get(d.get("type")):
+            return None
+        return cls(d["type"], d.get("value"), d.get("unit"), d.get("raw"), d.get("label"),
+                   to_typed(d.get("variants")), to_typed(d.get("per_gender")))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self.type if key == "type" else to_plain(getattr(self, key))
+                for key in _LOAD_LAYOUTS[self.type]}
+
+
+@dataclass
+class Progression:
+    """PROGRESS("+15m/round") clause"""
+    __slots__ = ("increment_value", "increment_unit", "increment_raw", "cadence", "raw")
+    increment_value: Optional[float]
+    increment_unit: Optional[str]
+    increment_raw: str
+    cadence: Optional[str]
+    raw: str
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Optional["Progression"]:
+        inc = d.get("increment")
+        if tuple(d) != ("type", "increment", "cadence", "raw") or not isinstance(inc, dict):
+            return None
+        full = tuple(inc) == ("value", "unit", "raw")
+        if not (full or tuple(inc) == ("raw",)) or full != (d["cadence"] is not None):
+            return None
+        return cls(inc.get("value"), inc.get("unit"), inc["raw"], d["cadence"], d["raw"])
+
+    @property
+    def increment(self) -> Dict[str, Any]:
+        if self.cadence is None:
+            return {"raw": self.increment_raw}
+        return {"value": self.increment_value, "unit": self.increment_unit, "raw": self.increment_raw}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": "PROGRESSION", "increment": self.increment, "cadence": self.cadence, "raw": self.raw}
+
+
+@dataclass
+class MovementLine:
+    """One movement line; every field is derived from the parsed children"""
+    __slots__ = ("children", "_fields")
+    children: Tuple[Any, ...]
+
+    def __post_init__(self):
+        self._fields: Optional[Dict[str, Any]] = None  # not a dataclass field: out of eq/repr
+
+    def _decoded(self) -> Dict[str, Any]:
+        # Derived fields, decoded from the children on first access only
+        if self._fields is None:
+            self._fields = _HELPER.movement_line(to_plain(self.children))
+        return self._fields
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Optional["MovementLine"]:
+        keys = tuple(d)
+        if keys[:4] != ("type", "children", "movement", "quantity") or \
+                not set(keys[4:]) <= {"progression", "load", "tempo", "note"}:
+            return None
+        return cls(to_typed(d["children"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return _HELPER.movement_line(to_plain(self.children))
+
+    @property
+    def movement(self) -> str:
+        return self._decoded()["movement"]
+
+    @property
+    def quantity(self) -> Optional[Quantity]:
+        return Quantity.from_dict(self._decoded()["quantity"])
+
+    @property
+    def load(self) -> Optional[Load]:
+        load = self._decoded().get("load")
+        return to_typed(load) if load is not None else None
+
+    @property
+    def progression(self) -> Optional[Progression]:
+        progression = self._decoded().get("progression")
+        return to_typed(progression) if progression is not None else None
+
+    @property
+    def tempo(self) -> Optional[str]:
+        return self._decoded().get("tempo")
+
+    @property
+    def note(self) -> Optional[str]:
+        return self._decoded().get("note")
+
+
+@dataclass
+class Rest:
+    """REST between movements"""
+    __slots__ = ("duration", "raw")
+    duration: Quantity
+    raw: str
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Optional["Rest"]:
+        if tuple(d) != ("type", "duration", "seconds", "raw") or not isinstance(d["duration"], dict):
+            return None
+        duration = Quantity.from_dict(d["duration"])
+        if duration is None:
+            return None
+        rest = cls(duration, d["raw"])
+        return rest if rest.seconds == d["seconds"] else None
+
+    @property
+    def seconds(self) -> Optional[float]:
+        return self.duration.seconds or self.duration.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": "REST", "duration": self.duration.to_dict(), "seconds": self.seconds, "raw": self.raw}
+
+
+@dataclass
+class Wod:
+    """WOD component: form, movements and optional notes"""
+    __slots__ = ("form", "movements", "notes")
+    form: Any
+    movements: Tuple[Any, ...]
+    notes: Any
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Optional["Wod"]:
+        if tuple(d) not in (("type", "form", "movements"), ("type", "form", "movements", "notes")) \
+                or not isinstance(d["movements"], list):
+            return None
+        return cls(to_typed(d["form"]), to_typed(d["movements"]), to_typed(d.get("notes", ABSENT)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        node = {"type": "WOD", "form": to_plain(self.form), "movements": to_plain(self.movements)}
+        if self.notes is not ABSENT:
+            node["notes"] = to_plain(self.notes)
+        return node
+
+
+@dataclass
+class Module:
+    """``module ns.name vN { ... }``"""
+    __slots__ = ("id", "version", "body")
+    id: str
+    version: str
+    body: Any
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Optional["Module"]:
+        if tuple(d) != ("type", "id", "version", "body"):
+            return None
+        return cls(d["id"], d["version"], to_typed(d["body"]))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"type": "MODULE", "id": self.id, "version": self.version, "body": to_plain(self.body)}
+
+
+_SESSION_FIELDS = ("title", "components", "scoring", "meta", "exports", "team", "realized", "achievements")
+
+
+@dataclass
+class Session:
+    """``session "Title" { ... }``"""
+    __slots__ = _SESSION_FIELDS
+    title: str
+    components: Any
+    scoring: Any
+    meta: Any
+    exports: Any
+    team: Any
+    realized: Any
+    achievements: Any
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Optional["Session"]:
+        if tuple(d) != ("type",) + _SESSION_FIELDS:
+            return None
+        return cls(*(to_typed(d[key]) for key in _SESSION_FIELDS))
+
+    def to_dict(self) -> Dict[str, Any]:
+        node = {"type": "SESSION"}
+        node.update((key, to_plain(getattr(self, key))) for key in _SESSION_FIELDS)
+        return node
+
+
+@dataclass
+class Program:
+    """Top-level parse result: modules, sessions and optional programming blocks"""
+    __slots__ = ("modules", "sessions", "programming")
+    modules: Tuple[Any, ...]
+    sessions: Tuple[Any, ...]
+    programming: Any
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> Optional["Program"]:
+        if tuple(d) not in (("modules", "sessions"), ("modules", "sessions", "programming")):
+            return None
+        return cls(to_typed(d["modules"]), to_typed(d["sessions"]), to_typed(d.get("programming", ABSENT)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {"modules": to_plain(self.modules), "sessions": to_plain(self.sessions)}
+        if self.programming is not ABSENT:
+            result["programming"] = to_plain(self.programming)
+        return result
+
+
+_FACTORIES = {
+    "MODULE": Module.from_dict,
+    "SESSION": Session.from_dict,
+    "WOD": Wod.from_dict,
+    "MOVEMENT_LINE": MovementLine.from_dict,
+    "REST": Rest.from_dict,
+    "PROGRESSION": Progression.from_dict,
+    "LOAD_VALUE": Load.from_dict,
+    "LOAD_DUAL": Load.from_dict,
+    "LOAD_VARIANT": Load.from_dict,
+    "LOAD_LITERAL": Load.from_dict,
+}
+
+
+def to_typed(value: Any) -> Any:
+    """Typed form of a dict AST (or any sub-tree of one)"""
+    if isinstance(value, list):
+        return tuple(to_typed(v) for v in value)
+    if not isinstance(value, dict):
+        return value
+    node_type = value.get("type")
+    if isinstance(node_type, str):
+        factory = _FACTORIES.get(node_type)
+        typed = factory(value) if factory else None
+        if typed is not None:
+            return typed
+        keys = tuple(value)
+        children = value.get("children")
+        if isinstance(children, list) and (
+            keys == ("type", "children")
+            or (node_type == "MOVEMENT_NAME" and keys == ("type", "name", "children")
+                and value["name"] == Node(node_type, tuple(children)).name)
+        ):
+            return Node(node_type, to_typed(children))
+    elif "modules" in value and "sessions" in value:
+        program = Program.from_dict(value)
+        if program is not None:
+            return program
+    return {k: to_typed(v) for k, v in value.items()}
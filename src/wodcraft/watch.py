@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Watch a modules directory and keep compiled sessions fresh (``wodc watch``), standard library only.
+
+Two watchers report changed paths under a directory tree:
+
+  - ``InotifyWatcher`` (Linux): inotify through ``ctypes``, one watch per
+    directory; nothing is stat'ed while the tree is quiet;
+  - ``PollingWatcher`` (everywhere else): compares ``(mtime, size)`` of every
+    module file each ``interval`` seconds.
+
+``make_watcher`` picks inotify when it is available. ``SessionWatch`` ties a
+watcher to a ``FileSystemResolver(verify=False)`` and a ``SessionCompiler``
+without TTL: resolving never stats files, and when the watcher reports a
+change exactly the affected resolved modules, module ASTs and compiled
+sessions are invalidated, then the sessions importing those modules (found
+through the ``DependencyGraph``) are recompiled.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .core import (MODULE_SUFFIXES, DependencyGraph, FileSystemResolver, SessionCompiler, WODCraftError,
+                   parse_vnext)
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _module_files(root: str) -> Dict[str, Tuple[int, int]]:
+    """``{path: (mtime_ns, size)}`` of every module file under ``root``"""
+    files: Dict[str, Tuple[int, int]] = {}
+    stack = [root]
+    while stack:
+        try:
+            children = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for child in children:
+            try:
+                if child.is_dir():
+                    stack.append(child.path)
+                elif child.name.endswith(MODULE_SUFFIXES):
+                    st = child.stat()
+                    files[child.path] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+    return files
+
+
+class PollingWatcher:
+    """Changed module files under ``root``, found by comparing stats every ``interval`` seconds"""
+
+    backend = "poll"
+
+    def __init__(self, root, interval: float = 0.5):
+        self.root = os.path.normpath(str(root))
+        self.interval = interval
+        self._snapshot = _module_files(self.root)
+
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        """Paths added, modified or removed since the last call (waits up to ``timeout`` for one)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            current = _module_files(self.root)
+            changed = {path for path, stamp in current.items() if self._snapshot.get(path) != stamp}
+            changed.update(path for path in self._snapshot if path not in current)
+            self._snapshot = current
+            if changed:
+                return changed
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Changed module files and directories under ``root``, reported by inotify (Linux)"""
+
+    backend = "inotify"
+
+    def __init__(self, root, settle: float = 0.05):
+        self.root = os.path.normpath(str(root))
+        self.settle = settle  # editors save in several writes: collect events for this long
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: Dict[int, str] = {}  # wd -> directory
+        self._add_tree(self.root, None)
+
+    def _add_tree(self, directory: str, changed: Optional[Set[str]]) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _MASK)
+        if wd < 0:
+            return
+        self._watches[wd] = directory
+        try:
+            children = list(os.scandir(directory))
+        except OSError:
+            return
+        for child in children:
+            if child.is_dir():
+                self._add_tree(child.path, changed)
+            elif changed is not None and child.name.endswith(MODULE_SUFFIXES):
+                changed.add(child.path)  # created before its directory was watched
+
+    def _drop_tree(self, directory: str) -> None:
+        prefix = directory + os.sep
+        for wd, path in list(self._watches.items()):
+            if path == directory or path.startswith(prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def _read(self) -> bytes:
+        chunks = []
+        while True:
+            try:
+                chunk = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def changes(self, timeout: Optional[float] = None) -> Set[str]:
+        """Paths (files or directories) changed since the last call (waits up to ``timeout`` for one)"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        time.sleep(self.settle)
+        data = self._read()
+        changed: Set[str] = set()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:  # events were lost: report the whole tree
+                self._drop_tree(self.root)
+                self._add_tree(self.root, changed)
+                changed.add(self.root)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or mask & (IN_IGNORED | IN_DELETE_SELF):
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(path, changed)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    self._drop_tree(path)
+                else:
+                    continue
+                changed.add(path)
+            elif path.endswith(MODULE_SUFFIXES):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def make_watcher(root, backend: str = "auto", interval: float = 0.5):
+    """Watcher for ``root``: ``inotify``, ``poll``, or ``auto`` (inotify when available)"""
+    if backend not in ("auto", "inotify", "poll"):
+        raise ValueError(f"Unknown watch backend: {backend!r} (use 'auto', 'inotify' or 'poll')")
+    if backend != "poll":
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError, TypeError):
+            if backend == "inotify":
+                raise
+    return PollingWatcher(root, interval)
+
+
+class SessionWatch:
+    """
+    Keep the sessions of some files compiled while modules (and those files) change.
+
+    ``start`` compiles every session once; each ``step`` waits for changes,
+    invalidates the affected caches and returns the records (``compile_many``
+    records plus ``file``) of the sessions it recompiled. Session files are
+    stat'ed once per step; modules only when the watcher reports them.
+    """
+
+    def __init__(self, files: Iterable, modules_path, watcher=None, backend: str = "auto",
+                 interval: float = 0.5, jobs: int = 1):
+        self.files = [str(path) for path in files]
+        self.resolver = FileSystemResolver(Path(modules_path), verify=False)
+        self.compiler = SessionCompiler(self.resolver, cache_ttl=None)
+        self.watcher = watcher if watcher is not None else make_watcher(modules_path, backend, interval)
+        self.jobs = jobs
+        self.sessions: Dict[str, List[Dict]] = {}
+        self.errors: Dict[str, Exception] = {}  # files that could not be read or parsed
+        self.graph = DependencyGraph()
+        self.stats = {"steps": 0, "modules_changed": 0, "compiled_dropped": 0, "recompiled": 0}
+        self._stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def start(self) -> List[Dict]:
+        for path in self.files:
+            self._load(path)
+        self._rebuild_graph()
+        return self._compile({path: None for path in self.files})
+
+    def step(self, timeout: Optional[float] = None) -> List[Dict]:
+        """Apply pending changes; records of the recompiled sessions (empty if nothing changed)"""
+        paths = self.watcher.changes(timeout)
+        self.stats["steps"] += 1
+        affected: Dict[str, Optional[Set[int]]] = {}  # file -> session indexes (None: all)
+        for path in self.files:
+            if self._stamp(path) != self._stamps.get(path):
+                self._load(path)
+                affected[path] = None
+        if paths:
+            changes = self.resolver.invalidate(paths)
+            self.stats["modules_changed"] += len(changes)
+            self.stats["compiled_dropped"] += self.compiler.invalidate_modules(changes)
+            nodes = {session["id"]: (session["file"], session["index"]) for session in self.graph.sessions}
+            for source, target, _ in self.graph.edges:
+                path, index = nodes[source]
+                if target in changes and affected.get(path, set()) is not None:
+                    affected.setdefault(path, set()).add(index)
+        if not affected:
+            return []
+        self._rebuild_graph()
+        return self._compile(affected)
+
+    def close(self) -> None:
+        self.watcher.close()
+
+    def _stamp(self, path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load(self, path: str) -> None:
+        self._stamps[path] = self._stamp(path)
+        try:
+            self.sessions[path] = parse_vnext(Path(path).read_text(encoding="utf-8")).get("sessions") or []
+        except (OSError, WODCraftError) as e:
+            self.sessions[path] = []
+            self.errors[path] = e
+        else:
+            self.errors.pop(path, None)
+
+    def _rebuild_graph(self) -> None:
+        self.graph = DependencyGraph()
+        for path in self.files:
+            self.compiler.dependency_graph(self.sessions[path], self.graph, file=path)
+
+    def _compile(self, affected: Dict[str, Optional[Set[int]]]) -> List[Dict]:
+        records = []
+        for path, indexes in affected.items():
+            error = self.errors.get(path)
+            if error is not None:
+                records.append({"file": path, "index": None, "title": None, "ok": False,
+                                "error": {"type": type(error).__name__, "message": str(error)}})
+                continue
+            sessions = self.sessions[path]
+            chosen = sorted(indexes) if indexes is not None else list(range(len(sessions)))
+            for index, record in zip(chosen, self.compiler.compile_many([sessions[i] for i in chosen],
+                                                                        jobs=self.jobs)):
+                record.update(file=path, index=index)
+                records.append(record)
+        self.stats["recompiled"] += len(records)
+        return records
@@ -6,11 +6,14 @@ Tests pour les nouvelles fonctionnalités améliorées
 import pytest
 from src.wodcraft.core import (
     parse_vnext, WODCraftError, SessionCompiler, InMemoryResolver,
-    FileSystemResolver
+    FileSystemResolver, ModuleRef, DependencyGraph
 )
 from pathlib import Path
 import tempfile
 import json
+import os
+import subprocess
+import sys
 
 
 class TestEnhancedErrorMessages:
@@ -120,6 +123,257 @@ class TestIntelligentCache:
         assert stats["cache_misses"] == 0
 
 
+class TestModuleASTCache:
+    """Tests pour le cache des AST de modules"""
+
+    MODULE = 'module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }'
+
+    def _session(self, title):
+        return parse_vnext(f'session "{title}" {{ components {{ wod import wod.fran@v1 }} scoring {{ wod none }} }}')['sessions'][0]
+
+    def test_module_parsed_once_across_sessions(self):
+        """Le même module n'est parsé qu'une fois pour plusieurs sessions"""
+        resolver = InMemoryResolver()
+        resolver.register(ModuleRef("wod", "fran", "v1"), self.MODULE)
+        compiler = SessionCompiler(resolver)
+
+        first = compiler.compile_session(self._session("A"))
+        second = compiler.compile_session(self._session("B"))
+
+        stats = compiler.get_cache_stats()
+        assert stats["module_cache_misses"] == 1
+        assert stats["module_cache_hits"] == 1
+        assert stats["module_entries"] == 1
+        assert first["session"]["components"]["wod"] == second["session"]["components"]["wod"]
+
+    def test_ast_memoized_on_resolved_module(self, tmp_path):
+        """L'AST est mémorisé sur le ResolvedModule renvoyé par le resolver"""
+        (tmp_path / "wod").mkdir()
+        (tmp_path / "wod" / "fran.wod").write_text(self.MODULE)
+        resolver = FileSystemResolver(tmp_path)
+        compiler = SessionCompiler(resolver)
+
+        compiler.compile_session(self._session("A"))
+        resolved = resolver.resolve(ModuleRef("wod", "fran", "v1"))
+        assert resolved.ast is not None
+        assert resolved.ast["modules"][0]["id"] == "wod.fran"
+
+    def test_module_cache_is_bounded(self):
+        """Le cache des modules respecte sa taille maximale (LRU)"""
+        resolver = InMemoryResolver()
+        compiler = SessionCompiler(resolver, module_cache_size=1)
+        for i in range(3):
+            resolver.register(ModuleRef("wod", "fran", "v1"), self.MODULE.replace("21 Pull_ups", f"{i + 1} Pull_ups"))
+            compiler.compile_session(self._session(f"S{i}"))
+
+        stats = compiler.get_cache_stats()
+        assert stats["module_entries"] == 1
+        assert stats["module_cache_misses"] == 3
+
+        compiler.clear_cache()
+        assert compiler.get_cache_stats()["module_entries"] == 0
+
+
+class TestCompileCacheKey:
+    """Tests pour la clé de cache déterministe"""
+
+    MODULE = TestModuleASTCache.MODULE
+    SESSION = 'session "A" { components { wod import wod.fran@v1 } scoring { wod none } }'
+
+    def _compiler(self, module_source=None):
+        resolver = InMemoryResolver()
+        resolver.register(ModuleRef("wod", "fran", "v1"), module_source or self.MODULE)
+        return resolver, SessionCompiler(resolver)
+
+    def test_key_is_stable_across_processes(self):
+        """La clé ne dépend pas du sel de hash() du processus"""
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from src.wodcraft.core import *;"
+            "r = InMemoryResolver(); r.register(ModuleRef('wod', 'fran', 'v1'), sys.argv[2]);"
+            "c = SessionCompiler(r); s = parse_vnext(sys.argv[3])['sessions'][0];"
+            "print(c.compile_key(s, c._resolve_components(s)))"
+        )
+        root = str(Path(__file__).resolve().parents[1])
+        keys = set()
+        for seed in ("1", "2"):
+            out = subprocess.run(
+                [sys.executable, "-c", script, root, self.MODULE, self.SESSION],
+                env={**os.environ, "PYTHONHASHSEED": seed}, capture_output=True, text=True, check=True,
+            )
+            keys.add(out.stdout.strip())
+        assert len(keys) == 1
+
+    def test_module_change_invalidates_cache(self):
+        """Modifier un module importé change la clé et recompile la session"""
+        resolver, compiler = self._compiler()
+        session = parse_vnext(self.SESSION)['sessions'][0]
+        compiler.compile_session(session)
+        first_key = compiler.compile_key(session, compiler._resolve_components(session))
+
+        resolver.register(ModuleRef("wod", "fran", "v1"), self.MODULE.replace("21 Pull_ups", "15 Pull_ups"))
+        compiler.compile_session(session)
+        second_key = compiler.compile_key(session, compiler._resolve_components(session))
+
+        stats = compiler.get_cache_stats()
+        assert first_key != second_key
+        assert stats["cache_misses"] == 2
+        assert stats["module_cache_misses"] == 2
+
+    def test_fingerprint_computed_once_per_ast(self, monkeypatch):
+        """L'empreinte d'un AST est calculée une seule fois"""
+        from src.wodcraft import core
+        calls = []
+        original = core.ast_fingerprint
+        monkeypatch.setattr(core, "ast_fingerprint", lambda node: calls.append(1) or original(node))
+
+        _, compiler = self._compiler()
+        session = parse_vnext(self.SESSION)['sessions'][0]
+        for _ in range(3):
+            compiler.compile_session(session)
+        assert len(calls) == 1
+        assert compiler.get_cache_stats()["cache_hits"] == 2
+
+
+class TestCompileMany:
+    """Tests pour la compilation de toutes les sessions d'un fichier"""
+
+    MODULE = TestModuleASTCache.MODULE
+    WARMUP = 'module warmup.easy v1 { warmup "Easy" { block "A" { 10 Air_Squats } } }'
+    SOURCE = """
+session "Lundi" { components { wod import wod.fran@v1 } scoring { wod ForTime time } }
+session "Mardi" { components { wod import wod.absent@v1 } scoring { wod none } }
+session "Mercredi" { components { warmup import warmup.easy@v1 wod import wod.fran@v1 } scoring { wod none } }
+session "Lundi" { components { wod import wod.fran@v1 } scoring { wod ForTime time } }
+"""
+
+    class CountingResolver(InMemoryResolver):
+        def __init__(self):
+            super().__init__()
+            self.calls = []
+
+        def resolve(self, ref):
+            self.calls.append(ref.full_name)
+            return super().resolve(ref)
+
+    def _compiler(self):
+        resolver = self.CountingResolver()
+        resolver.register(ModuleRef("wod", "fran", "v1"), self.MODULE)
+        resolver.register(ModuleRef("warmup", "easy", "v1"), self.WARMUP)
+        return resolver, SessionCompiler(resolver)
+
+    def test_records_in_order_with_errors(self):
+        """Une session en erreur n'interrompt pas les autres; l'ordre source est conservé"""
+        sessions = parse_vnext(self.SOURCE)["sessions"]
+        resolver, compiler = self._compiler()
+        records = compiler.compile_many(sessions)
+
+        assert [(r["index"], r["title"], r["ok"]) for r in records] == [
+            (0, "Lundi", True), (1, "Mardi", False), (2, "Mercredi", True), (3, "Lundi", True)]
+        assert records[1]["error"] == {"type": "ValueError", "message": "Module not found: wod.absent@v1"}
+        _, reference = self._compiler()
+        assert records[2]["compiled"] == reference.compile_session(sessions[2])
+        # Each import is resolved once, each module parsed once, duplicate sessions compiled once
+        assert sorted(resolver.calls) == ["warmup.easy@v1", "wod.absent@v1", "wod.fran@v1"]
+        stats = compiler.get_cache_stats()
+        assert stats["module_cache_misses"] == 2
+        assert stats["total_entries"] == 2
+        assert records[3]["compiled"] is records[0]["compiled"]
+
+    def test_cached_sessions_are_not_recompiled(self):
+        """Un second lot réutilise les sessions déjà compilées"""
+        sessions = parse_vnext(self.SOURCE)["sessions"]
+        _, compiler = self._compiler()
+        compiler.compile_many(sessions)
+        compiler.compile_many(sessions)
+        assert compiler.get_cache_stats()["cache_hits"] == 3
+
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_parallel_matches_serial(self, executor):
+        """Les pools de threads et de processus donnent le même résultat"""
+        sessions = parse_vnext(self.SOURCE)["sessions"] * 3
+        serial = self._compiler()[1].compile_many(sessions)
+        parallel = self._compiler()[1].compile_many(sessions, jobs=4, executor=executor)
+        assert parallel == serial
+
+    def test_sdk_compile_all(self, tmp_path):
+        """sdk.compile_all compile toutes les sessions du texte"""
+        from src.wodcraft import sdk
+        (tmp_path / "wod").mkdir()
+        (tmp_path / "wod" / "fran.wod").write_text(self.MODULE)
+        (tmp_path / "warmup").mkdir()
+        (tmp_path / "warmup" / "easy.wod").write_text(self.WARMUP)
+        records = sdk.compile_all(self.SOURCE, modules_path=tmp_path)
+        assert [r["ok"] for r in records] == [True, False, True, True]
+        assert "Module file not found" in records[1]["error"]["message"]
+        with pytest.raises(ValueError):
+            SessionCompiler(InMemoryResolver()).compile_many([], executor="fork")
+
+
+class TestDependencyGraph:
+    """Tests pour le graphe des imports et le préchargement des modules"""
+
+    SOURCE = TestCompileMany.SOURCE
+
+    def _graph(self):
+        resolver, compiler = TestCompileMany()._compiler()
+        return resolver, compiler, compiler.dependency_graph(parse_vnext(self.SOURCE)["sessions"])
+
+    def test_graph_and_order(self):
+        """Chaque import devient une arête; les modules précèdent les sessions"""
+        _, _, graph = self._graph()
+        assert list(graph.modules) == ["wod.fran@v1", "wod.absent@v1", "warmup.easy@v1"]
+        assert ("session:2", "warmup.easy@v1", "warmup") in graph.edges
+        assert graph.dependencies("session:2") == ["warmup.easy@v1", "wod.fran@v1"]
+        order = graph.topological_order()
+        assert order[:3] == list(graph.modules)
+        assert order[3:] == ["session:0", "session:1", "session:2", "session:3"]
+
+    def test_prefetch_resolves_each_module_once(self):
+        """Le préchargement résout et parse chaque module une seule fois, en parallèle"""
+        resolver, compiler, graph = self._graph()
+        fetched = compiler.prefetch(graph, jobs=4)
+        assert sorted(resolver.calls) == ["warmup.easy@v1", "wod.absent@v1", "wod.fran@v1"]
+        assert fetched["wod.fran@v1"].ast["modules"][0]["id"] == "wod.fran"
+        assert isinstance(fetched["wod.absent@v1"], ValueError)
+        assert graph.status["wod.absent@v1"] == {
+            "status": "error", "error": {"type": "ValueError", "message": "Module not found: wod.absent@v1"}}
+        assert graph.status["wod.fran@v1"] == graph.status["warmup.easy@v1"] == {"status": "ok"}
+        assert compiler.get_cache_stats()["module_cache_misses"] == 2
+
+    def test_exports(self):
+        """Export JSON et Graphviz"""
+        _, compiler, graph = self._graph()
+        compiler.prefetch(graph)
+        data = json.loads(json.dumps(graph.to_dict()))
+        assert [(m["id"], m["used_by"], m["status"]) for m in data["modules"]] == [
+            ("wod.fran@v1", 3, "ok"), ("wod.absent@v1", 1, "error"), ("warmup.easy@v1", 1, "ok")]
+        assert data["edges"][0] == {"from": "session:0", "to": "wod.fran@v1", "component": "wod"}
+        dot = graph.to_dot()
+        assert dot.startswith("digraph wodcraft {")
+        assert '"session:0" -> "wod.fran@v1" [label="wod"];' in dot
+        assert '"wod.absent@v1" [shape=ellipse, style=dashed, color=red];' in dot
+
+    def test_cli(self, tmp_path):
+        """wodc deps sur plusieurs fichiers"""
+        (tmp_path / "modules" / "wod").mkdir(parents=True)
+        (tmp_path / "modules" / "wod" / "fran.wod").write_text(TestCompileMany.MODULE)
+        (tmp_path / "modules" / "warmup").mkdir()
+        (tmp_path / "modules" / "warmup" / "easy.wod").write_text(TestCompileMany.WARMUP)
+        for name in ("a.wod", "b.wod"):
+            (tmp_path / name).write_text(self.SOURCE)
+        root = Path(__file__).resolve().parents[1]
+        result = subprocess.run(
+            [sys.executable, "-m", "wodcraft.cli", "deps", str(tmp_path / "a.wod"), str(tmp_path / "b.wod"),
+             "--modules-path", str(tmp_path / "modules")],
+            cwd=root, env={**os.environ, "PYTHONPATH": str(root / "src")}, capture_output=True, text=True,
+        )
+        assert result.returncode == 1 and "wod.absent@v1" in result.stderr
+        data = json.loads(result.stdout)
+        assert len(data["sessions"]) == 8 and data["sessions"][0]["id"].endswith("a.wod#0")
+        assert [m["used_by"] for m in data["modules"]] == [6, 2, 2]
+
+
 class TestSemanticValidation:
     """Tests pour la validation sémantique enrichie"""
 
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test suite for batch validation/parsing of WOD libraries
+"""
+
+import pytest
+
+from src.wodcraft.batch import BatchSummary, check_file, expand_inputs, run_batch
+
+
+VALID = 'module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }'
+INVALID = 'session {'
+
+
+@pytest.fixture
+def library(tmp_path):
+    for group in ("girls", "heroes"):
+        (tmp_path / group).mkdir()
+        for i in range(3):
+            (tmp_path / group / f"{group}_{i}.wod").write_text(VALID)
+    (tmp_path / "heroes" / "broken.wod").write_text(INVALID)
+    (tmp_path / "notes.txt").write_text("not a wod")
+    return tmp_path
+
+
+class TestExpandInputs:
+    """Test input expansion"""
+
+    def test_directories_globs_and_duplicates(self, library):
+        from_dir = expand_inputs([str(library)])
+        assert len(from_dir) == 7
+        assert all(p.suffix == ".wod" for p in from_dir)
+
+        from_glob = expand_inputs([str(library / "girls" / "*.wod"), str(library / "girls")])
+        assert len(from_glob) == 3
+
+    def test_missing_file_is_kept_for_reporting(self, library):
+        files = expand_inputs([str(library / "missing.wod")])
+        assert check_file(str(files[0]))["status"] == "error"
+
+
+class TestRunBatch:
+    """Test the process pool and summaries"""
+
+    def test_pool_matches_sequential_order(self, library):
+        files = expand_inputs([str(library)])
+        sequential = list(run_batch(files, jobs=1))
+        pooled = list(run_batch(files, jobs=2))
+        assert pooled == sequential
+        unordered = list(run_batch(files, jobs=2, ordered=False))
+        assert sorted(r["file"] for r in unordered) == sorted(r["file"] for r in sequential)
+
+    def test_parse_records_carry_ast(self, library):
+        records = list(run_batch(expand_inputs([str(library / "girls")]), jobs=2, parse=True))
+        assert all(r["ast"]["modules"][0]["id"] == "wod.fran" for r in records)
+
+    def test_summary_reports_worst_exit_code(self, library):
+        summary = BatchSummary()
+        for record in run_batch(expand_inputs([str(library)]), jobs=2):
+            summary.add(record)
+        assert summary.exit_code == 1
+        data = summary.as_dict()
+        assert (data["valid"], data["invalid"], data["unreadable"]) == (6, 1, 0)
+        assert data["top_errors"] == [{"message": "Syntax error at '{'", "count": 1}]
+
+        summary.add(check_file(str(library / "missing.wod")))
+        assert summary.exit_code == 2
+        assert BatchSummary().exit_code == 0
+
+    def test_all_errors_lists_every_diagnostic(self, tmp_path):
+        path = tmp_path / "two.wod"
+        path.write_text("module wod.a v1 {\n wod ForTime {\n 1 A @@\n 2 B @@\n }\n}")
+        record = check_file(str(path), all_errors=True)
+        assert record["status"] == "invalid"
+        assert [e["line"] for e in record["errors"]] == [3, 4]
+        assert record["error"] == record["errors"][0]
+        assert "errors" not in check_file(str(path))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
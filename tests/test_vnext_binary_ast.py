@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test suite for the binary AST format and its memory-mapped reader
+"""
+
+import glob
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.wodcraft import binary_ast
+from src.wodcraft.binary_ast import ASTReader, dump_ast, dumps_ast, load_ast, loads_ast
+from src.wodcraft.core import WODCraftError, parse_vnext
+
+ROOT = Path(__file__).resolve().parents[1]
+
+LIBRARY = '''
+module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }
+module wod.fran v2 { wod ForTime { 15 Thrusters @43kg/30kg 15 Pull_ups } }
+module wod.cindy v1 { wod AMRAP 20:00 { 5 Pull_ups 10 Push_ups 15 Air_Squats } }
+session "Tuesday" { components { wod import wod.fran@v1 } scoring { wod ForTime time } }
+session "Thursday" { components { wod import wod.cindy@v1 } scoring { wod AMRAP rounds+reps } }
+'''
+
+
+def _corpus():
+    for name in sorted(glob.glob(str(ROOT / "**" / "*.wod"), recursive=True)):
+        try:
+            yield Path(name).name, parse_vnext(Path(name).read_text(encoding="utf-8"))
+        except WODCraftError:
+            continue
+
+
+@pytest.fixture
+def library(tmp_path):
+    ast = parse_vnext(LIBRARY)
+    return ast, dump_ast(ast, tmp_path / "library.wodast")
+
+
+class TestRoundTrip:
+    """loads_ast(dumps_ast(ast)) gives back the same document (values and key order)"""
+
+    @pytest.mark.parametrize("name,ast", list(_corpus()))
+    def test_corpus(self, name, ast):
+        assert json.dumps(loads_ast(dumps_ast(ast))) == json.dumps(ast)
+
+    def test_lean_ast(self):
+        ast = parse_vnext(LIBRARY, lean=True)
+        assert loads_ast(dumps_ast(ast)) == ast
+
+    def test_scalar_edge_cases(self):
+        values = [0, -1, 2 ** 27 - 1, -2 ** 27, 2 ** 27, -2 ** 27 - 1, 2 ** 40, -2 ** 40,
+                  1.5, -0.0, True, False, None, "", "é ✓", [], {}]
+        document = {"modules": [{"values": values}], "meta": {"nested": [[1, [2]], {"a": None}]}}
+        decoded = loads_ast(dumps_ast(document))
+        assert decoded == document
+        assert [type(v) for v in decoded["modules"][0]["values"]] == [type(v) for v in values]
+
+    def test_strings_and_shapes_are_stored_once(self):
+        ast = parse_vnext(LIBRARY)
+        many = {"modules": ast["modules"] * 20, "sessions": ast["sessions"] * 20}
+        assert len(dumps_ast(many)) < len(json.dumps(many, separators=(",", ":"))) / 2
+
+    def test_rejects_non_json_values(self):
+        with pytest.raises(TypeError):
+            dumps_ast({"modules": [object()]})
+        with pytest.raises(TypeError):
+            dumps_ast([1, 2])
+
+
+class TestReader:
+    """Test the memory-mapped reader"""
+
+    def test_single_nodes(self, library):
+        ast, path = library
+        with ASTReader(path) as reader:
+            assert [r["key"] for r in reader.roots()] == [
+                "wod.fran@v1", "wod.fran@v2", "wod.cindy@v1", "Tuesday", "Thursday"]
+            assert reader.module("wod.fran") == ast["modules"][0]
+            assert reader.module("wod.fran", "v2") == ast["modules"][1]
+            assert reader.module("wod.fran", "v3") is None
+            assert reader.session("Thursday") == ast["sessions"][1]
+            assert reader.get("modules", 2) == ast["modules"][2]
+            assert reader.document() == ast
+            with pytest.raises(KeyError):
+                reader.get("modules", 9)
+
+    def test_single_node_decodes_only_its_strings(self, library):
+        _, path = library
+        with ASTReader(path) as reader:
+            reader.session("Tuesday")
+            decoded = [s for s in reader._decoder._strings if s is not None]
+            assert "Tuesday" in decoded and "Air_Squats" not in decoded
+
+    def test_load_ast_matches_parse(self, library):
+        ast, path = library
+        assert load_ast(path) == ast
+
+    def test_grammar_mismatch_is_refused(self, tmp_path):
+        path = tmp_path / "old.wodast"
+        path.write_bytes(dumps_ast(parse_vnext(LIBRARY), grammar="start: program"))
+        with pytest.raises(WODCraftError) as exc:
+            ASTReader(path)
+        assert "different grammar" in str(exc.value)
+
+    @pytest.mark.parametrize("content", [b"", b"WODAST", b"NOTAST" + b"\0" * 100])
+    def test_invalid_files(self, tmp_path, content):
+        path = tmp_path / "bad.wodast"
+        path.write_bytes(content)
+        with pytest.raises(WODCraftError):
+            load_ast(path)
+
+    def test_truncated_file(self, tmp_path):
+        data = dumps_ast(parse_vnext(LIBRARY))
+        with pytest.raises(WODCraftError):
+            loads_ast(data[:-10])
+
+    def test_format_version_is_checked(self, monkeypatch):
+        data = dumps_ast(parse_vnext(LIBRARY))
+        monkeypatch.setattr(binary_ast, "BINARY_AST_FORMAT", binary_ast.BINARY_AST_FORMAT + 1)
+        with pytest.raises(WODCraftError):
+            loads_ast(data)
+
+    def test_wodcraft_version_is_checked(self, monkeypatch):
+        data = dumps_ast(parse_vnext(LIBRARY))
+        monkeypatch.setattr(binary_ast, "wodcraft_version", lambda: "0.0.1-other")
+        with pytest.raises(WODCraftError, match="written by wodcraft"):
+            loads_ast(data)
+
+
+class TestCLI:
+    """Test `wodc parse --format binary`"""
+
+    def test_parse_to_binary(self, tmp_path):
+        out = tmp_path / "fran.wodast"
+        source = ROOT / "examples" / "wods" / "girls" / "fran.wod"
+        result = subprocess.run(
+            [sys.executable, "-m", "wodcraft.cli", "parse", str(source), "--format", "binary", "-o", str(out)],
+            cwd=ROOT, env={"PYTHONPATH": str(ROOT / "src")}, capture_output=True, text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        assert load_ast(out) == parse_vnext(source.read_text())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test suite for .wodpack module bundles and BundleResolver
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.wodcraft import sdk
+from src.wodcraft.bundle import BundleResolver, build_bundle, open_resolver
+from src.wodcraft.core import FileSystemResolver, ModuleRef, SessionCompiler, parse_vnext
+
+ROOT = Path(__file__).resolve().parents[1]
+FRAN = 'module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }\n'
+FRAN_V2 = 'module wod.fran v2 { wod ForTime { 21 Thrusters @50kg/35kg 21 Pull_ups } }\n'
+EASY = 'module warmup.easy v1 { warmup "Easy" { block "Row" { 500m Row } } }\n'
+SOURCE = '''session "Lundi" { components { warmup import warmup.easy@v1 wod import wod.fran@v2 } scoring { wod ForTime time } }
+'''
+
+
+@pytest.fixture
+def modules(tmp_path):
+    (tmp_path / "modules" / "wod").mkdir(parents=True)
+    (tmp_path / "modules" / "warmup").mkdir()
+    (tmp_path / "modules" / "wod" / "fran.wod").write_text(FRAN + FRAN_V2)
+    (tmp_path / "modules" / "warmup" / "easy.wod").write_text(EASY)
+    (tmp_path / "modules" / "wod" / "broken.wod").write_text("module wod.broken v1 { wod ForTime { @@ } }")
+    return tmp_path / "modules"
+
+
+@pytest.fixture
+def bundle(modules, tmp_path):
+    stats = build_bundle(modules, tmp_path / "modules.wodpack")
+    assert (stats["modules"], stats["asts"], stats["failed"]) == (4, 3, ["wod.broken@v1"])
+    return tmp_path / "modules.wodpack"
+
+
+class TestBundleResolver:
+    """Test that a bundle serves what the directory serves"""
+
+    def test_same_modules_as_directory(self, modules, bundle):
+        directory = FileSystemResolver(modules)
+        compiler = SessionCompiler(directory)
+        with BundleResolver(bundle) as packed:
+            assert [r.full_name for r in packed.list()] == [r.full_name for r in directory.list()]
+            for ref in packed.list():
+                resolved, expected = packed.resolve(ref), directory.resolve(ref)
+                assert (resolved.source, resolved.content_hash) == (expected.source, expected.content_hash)
+                if ref.name != "broken":
+                    assert resolved.ast == compiler.module_ast(expected)
+            assert [r.name for r in packed.list("warmup")] == ["easy"]
+
+    def test_compiles_without_parsing_modules(self, modules, bundle):
+        session = parse_vnext(SOURCE)["sessions"][0]
+        compiler = SessionCompiler(BundleResolver(bundle))
+        assert compiler.compile_session(session) == SessionCompiler(FileSystemResolver(modules)).compile_session(session)
+        assert compiler.get_cache_stats()["module_cache_misses"] == 0
+
+    def test_missing_modules(self, bundle):
+        resolver = BundleResolver(bundle)
+        with pytest.raises(ValueError, match=r"wod.fran@v3 \(available: v1, v2\)"):
+            resolver.resolve(ModuleRef("wod", "fran", "v3"))
+        with pytest.raises(ValueError, match="Module not found: wod.cindy@v1"):
+            resolver.resolve(ModuleRef("wod", "cindy"))
+
+    @pytest.mark.parametrize("key", ["grammar_hash", "wodcraft_version", "ast_format"])
+    def test_asts_from_another_grammar_or_release_are_ignored(self, bundle, key):
+        db = sqlite3.connect(bundle)
+        db.execute("UPDATE meta SET value = 'other' WHERE key = ?", (key,))
+        db.commit()
+        db.close()
+        resolver = BundleResolver(bundle)
+        assert not resolver.use_asts
+        resolved = resolver.resolve(ModuleRef("wod", "fran"))
+        assert resolved.ast is None and "43kg" in resolved.source
+
+    def test_sources_only(self, modules, tmp_path):
+        stats = build_bundle(modules, tmp_path / "lean.wodpack", asts=False)
+        assert stats["asts"] == 0 and stats["failed"] == []
+        assert BundleResolver(tmp_path / "lean.wodpack").resolve(ModuleRef("warmup", "easy")).ast is None
+
+
+class TestEntryPoints:
+    """Test --modules-path routing and `wodc bundle build`"""
+
+    def test_open_resolver(self, modules, bundle, tmp_path):
+        assert isinstance(open_resolver(modules), FileSystemResolver)
+        assert isinstance(open_resolver(bundle), BundleResolver)
+        with pytest.raises(ValueError, match="Module bundle not found"):
+            open_resolver(tmp_path / "missing.wodpack")
+
+    def test_sdk(self, modules, bundle):
+        compiled = sdk.compile_session(SOURCE, modules_path=bundle)
+        assert compiled == sdk.compile_session(SOURCE, modules_path=modules)
+
+    def test_cli(self, modules, tmp_path):
+        env = {**os.environ, "PYTHONPATH": str(ROOT / "src")}
+        result = subprocess.run(
+            [sys.executable, "-m", "wodcraft.cli", "bundle", "build", str(modules), "-o", str(tmp_path / "m.wodpack")],
+            cwd=ROOT, env=env, capture_output=True, text=True,
+        )
+        assert result.returncode == 0 and "4 modules (3 with ASTs)" in result.stdout
+        assert "wod.broken@v1" in result.stderr
+        (tmp_path / "week.wod").write_text(SOURCE)
+        result = subprocess.run(
+            [sys.executable, "-m", "wodcraft.cli", "session", str(tmp_path / "week.wod"),
+             "--modules-path", str(tmp_path / "m.wodpack")],
+            cwd=ROOT, env=env, capture_output=True, text=True,
+        )
+        assert result.returncode == 0
+        assert json.loads(result.stdout)["session"]["title"] == "Lundi"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test suite for the on-disk compiled-session cache
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.wodcraft.cache import DiskCache, configured_cache_dir, CACHE_ENV
+from src.wodcraft.core import SessionCompiler, InMemoryResolver, ModuleRef, parse_vnext
+
+
+MODULE = 'module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }'
+SESSION = 'session "A" { components { wod import wod.fran@v1 } scoring { wod none } }'
+
+
+class TestDiskCache:
+    """Test DiskCache storage primitives"""
+
+    def test_put_get_round_trip(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        key = cache.key("abc")
+        assert cache.get(key) is None
+        cache.put(key, {"session": {"title": "A"}})
+        assert cache.get(key) == {"session": {"title": "A"}}
+        assert (cache.hits, cache.misses, cache.writes) == (1, 1, 1)
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        key = cache.key("abc")
+        cache.put(key, {"x": 1})
+        cache._path(key).write_text("{not json")
+        assert cache.get(key) is None
+
+    def test_prune_evicts_least_recently_used(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        keys = [cache.key(str(i)) for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.put(key, {"payload": "x" * 100})
+            past = time.time() - 100 + i
+            os.utime(cache._path(key), (past, past))
+        cache.get(keys[0])  # refresh the oldest entry
+
+        entry_size = cache._path(keys[0]).stat().st_size
+        removed = cache.prune(max_bytes=entry_size * 3)
+
+        assert removed == 2
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None and cache.get(keys[2]) is None
+        assert cache.get(keys[3]) is not None
+
+    def test_put_enforces_size_budget(self, tmp_path):
+        cache = DiskCache(tmp_path, max_bytes=1000)
+        for i in range(20):
+            cache.put(cache.key(str(i)), {"payload": "x" * 100})
+        assert cache.stats()["bytes"] <= 1000
+
+    def test_concurrent_writers_never_expose_partial_entries(self, tmp_path):
+        cache = DiskCache(tmp_path)
+        key = cache.key("shared")
+        value = {"events": list(range(2000))}
+
+        def work(_):
+            cache.put(key, value)
+            got = cache.get(key)
+            return got is None or got == value
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert all(pool.map(work, range(32)))
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_clear_and_configured_dir(self, tmp_path, monkeypatch):
+        cache = DiskCache(tmp_path)
+        cache.put(cache.key("a"), {"a": 1})
+        cache.put(cache.key("b"), {"b": 1})
+        assert cache.clear() == 2
+        assert cache.stats()["entries"] == 0
+
+        monkeypatch.delenv(CACHE_ENV, raising=False)
+        assert configured_cache_dir() is None
+        monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+        assert configured_cache_dir() == tmp_path
+
+
+class TestCompilerWithDiskCache:
+    """Test SessionCompiler sharing results through the disk cache"""
+
+    def _compiler(self, directory, module=MODULE):
+        resolver = InMemoryResolver()
+        resolver.register(ModuleRef("wod", "fran", "v1"), module)
+        return SessionCompiler(resolver, disk_cache=DiskCache(directory))
+
+    def test_fresh_compiler_reuses_disk_entry(self, tmp_path):
+        first = self._compiler(tmp_path)
+        compiled = first.compile_session(parse_vnext(SESSION)["sessions"][0])
+
+        # A new compiler (as in a new CLI process) with an empty in-memory cache
+        second = self._compiler(tmp_path)
+        again = second.compile_session(parse_vnext(SESSION)["sessions"][0])
+
+        assert again == compiled
+        assert second.get_cache_stats()["disk_cache_hits"] == 1
+
+    def test_disk_hit_replays_compiler_messages(self, tmp_path, capsys, monkeypatch):
+        build = SessionCompiler._build
+
+        def noisy_build(self, session_ast, modules):
+            self._note("WARNING: Very short time cap (30s) - might be unrealistic")
+            return build(self, session_ast, modules)
+
+        monkeypatch.setattr(SessionCompiler, "_build", noisy_build)
+        self._compiler(tmp_path).compile_session(parse_vnext(SESSION)["sessions"][0])
+        printed = capsys.readouterr().out
+        assert printed == "WARNING: Very short time cap (30s) - might be unrealistic\n"
+
+        monkeypatch.setattr(SessionCompiler, "_build", build)
+        second = self._compiler(tmp_path)
+        second.compile_session(parse_vnext(SESSION)["sessions"][0])
+        assert second.get_cache_stats()["disk_cache_hits"] == 1
+        assert capsys.readouterr().out == printed
+
+    def test_changed_module_misses_disk_cache(self, tmp_path):
+        self._compiler(tmp_path).compile_session(parse_vnext(SESSION)["sessions"][0])
+        changed = self._compiler(tmp_path, MODULE.replace("21 Pull_ups", "15 Pull_ups"))
+        changed.compile_session(parse_vnext(SESSION)["sessions"][0])
+        stats = changed.get_cache_stats()
+        assert stats["disk_cache_hits"] == 0
+        assert stats["disk_cache_misses"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test suite for the HTTP compile service behind `wodc http`
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.wodcraft.http_service import CompileHTTPServer, WorkerPool
+from src.wodcraft.service import percentile
+
+
+MODULE = 'module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }'
+SESSION = 'session "A" { components { wod import wod.fran@v1 } scoring { wod none } }'
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    modules = tmp_path_factory.mktemp("modules")
+    (modules / "wod").mkdir()
+    (modules / "wod" / "fran.wod").write_text(MODULE)
+    pool = WorkerPool(2, str(modules))
+    server = CompileHTTPServer(("127.0.0.1", 0), pool)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    pool.close()
+
+
+def _request(server, path, body=None, json_body=None, content_type=None):
+    url = f"http://127.0.0.1:{server.server_address[1]}{path}"
+    headers = {"Content-Type": content_type} if content_type else {}
+    data = None
+    if json_body is not None:
+        data = json.dumps(json_body).encode("utf-8")
+        headers["Content-Type"] = "application/json"
+    elif body is not None:
+        data = body.encode("utf-8")
+    req = urllib.request.Request(url, data=data, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class TestEndpoints:
+    """Test the HTTP routes"""
+
+    def test_raw_body_parse_and_validate(self, service):
+        status, payload = _request(service, "/parse", body=MODULE)
+        assert status == 200 and payload["result"]["modules"][0]["id"] == "wod.fran"
+
+        status, payload = _request(service, "/validate", body="session {")
+        assert status == 200 and payload["result"]["valid"] is False
+
+    def test_syntax_error_is_400(self, service):
+        status, payload = _request(service, "/parse", body="session {")
+        assert status == 400
+        assert payload["error"]["line"] == 1
+
+    def test_compile_run_results(self, service):
+        status, payload = _request(service, "/compile", json_body={"text": SESSION})
+        assert status == 200 and payload["result"]["session"]["title"] == "A"
+        assert "timeline" in _request(service, "/run", json_body={"text": SESSION})[1]["result"]
+        assert "results" in _request(service, "/results", json_body={"text": SESSION})[1]["result"]
+
+    def test_unknown_route_and_bad_json(self, service):
+        assert _request(service, "/nope", body="x")[0] == 404
+        status, payload = _request(service, "/compile", json_body=[1, 2])
+        assert status == 400 and payload["error"]["type"] == "InvalidRequest"
+
+    def test_only_inline_sources(self, service, tmp_path):
+        (tmp_path / "a.wod").write_text(SESSION)
+        status, payload = _request(service, "/parse", json_body={"path": str(tmp_path / "a.wod")})
+        assert status == 400 and "'path' is not accepted" in payload["error"]["message"]
+        status, payload = _request(service, "/compile", json_body={"text": SESSION, "modules_path": str(tmp_path)})
+        assert status == 400 and "'modules_path' is not accepted" in payload["error"]["message"]
+
+    def test_json_media_type(self, service):
+        body = json.dumps({"text": MODULE})
+        status, payload = _request(service, "/parse", body=body, content_type="Application/JSON; charset=utf-8")
+        assert status == 200 and payload["result"]["modules"][0]["id"] == "wod.fran"
+        status, payload = _request(service, "/parse", body=body, content_type="text/x-json-ish")
+        assert status == 400 and payload["error"]["type"] == "WODCraftError"  # parsed as a raw source
+
+    def test_metrics(self, service):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: _request(service, "/compile", json_body={"text": SESSION}), range(8)))
+        status, metrics = _request(service, "/metrics")
+        assert status == 200
+        assert metrics["workers"] == 2 and metrics["queue_depth"] == 0
+        assert metrics["latency"]["/compile"]["p99_ms"] >= metrics["latency"]["/compile"]["p50_ms"]
+        assert metrics["cache"]["cache_hits"] > 0
+
+
+class TestWorkerPool:
+    """Test pool behaviour"""
+
+    def test_crashed_worker_is_replaced(self, tmp_path):
+        pool = WorkerPool(1, str(tmp_path))
+        try:
+            pool._slots[0].process.kill()
+            pool._slots[0].process.join(5)
+            crashed = pool.call("validate", {"text": MODULE}, timeout=5)
+            assert crashed["error"]["type"] == "WorkerCrashed"
+            assert pool.call("validate", {"text": MODULE}, timeout=5)["result"]["valid"]
+            assert pool.restarts == 1
+        finally:
+            pool.close()
+
+    def test_percentile(self):
+        samples = [float(i) for i in range(1, 101)]
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile([], 50) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
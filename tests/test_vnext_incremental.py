@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test suite for incremental (per top-level block) parsing
+"""
+
+import glob
+from pathlib import Path
+
+import pytest
+
+from src.wodcraft.core import WODCraftError, parse_vnext
+from src.wodcraft.incremental import IncrementalParser, split_blocks
+
+ROOT = Path(__file__).resolve().parents[1]
+
+DOCUMENT = '''// Library
+module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }
+
+/* a "}" in a comment */
+module wod.cindy v1 {
+  wod AMRAP 20:00 { 5 Pull_ups 10 Push_ups 15 Air_Squats }
+}
+session "Tuesday {braces}" { components { wod import wod.fran@v1 } scoring { wod ForTime time } }
+programming { macrocycle: { name: "Block {A}", weeks: 4 } }
+'''
+
+
+def _parseable(pattern="**/*.wod"):
+    for name in sorted(glob.glob(str(ROOT / pattern), recursive=True)):
+        text = Path(name).read_text(encoding="utf-8")
+        try:
+            parse_vnext(text)
+        except WODCraftError:
+            continue
+        yield Path(name).name, text
+
+
+class TestSplitBlocks:
+    """Test brace scanning"""
+
+    def test_blocks_skip_strings_and_comments(self):
+        blocks = split_blocks(DOCUMENT)
+        assert [b.text.split()[0] for b in blocks] == ["module", "module", "session", "programming"]
+        assert [b.line for b in blocks] == [2, 5, 8, 9]
+        assert all(DOCUMENT[b.offset:b.offset + len(b.text)] == b.text for b in blocks)
+        assert blocks[1].text.endswith("Air_Squats }\n}")
+
+    def test_unbalanced_block_runs_to_end(self):
+        blocks = split_blocks('module a.b v1 { wod ForTime { 5 Burpees }\n')
+        assert len(blocks) == 1 and blocks[0].text.endswith("\n")
+        assert split_blocks("  // nothing\n") == []
+
+
+class TestIncrementalParser:
+    """Test per-block caching"""
+
+    @pytest.mark.parametrize("name,text", list(_parseable()))
+    def test_matches_full_parse(self, name, text):
+        parser = IncrementalParser()
+        assert parser.parse(text) == parse_vnext(text)
+        assert parser.parse(text) == parse_vnext(text)
+        assert parser.stats()["parsed"] == 0
+
+    def test_only_changed_blocks_are_reparsed(self):
+        parser = IncrementalParser()
+        parser.parse(DOCUMENT)
+        assert parser.stats()["parsed"] == 4
+        edited = DOCUMENT.replace("5 Pull_ups", "7 Pull_ups")
+        ast = parser.parse(edited)
+        assert ast == parse_vnext(edited)
+        assert (parser.stats()["parsed"], parser.stats()["reused"]) == (1, 3)
+        # Moving blocks around does not re-parse them
+        blocks = split_blocks(edited)
+        parser.parse("\n".join(b.text for b in reversed(blocks)))
+        assert parser.stats()["parsed"] == 0
+
+    def test_lean(self):
+        assert IncrementalParser(lean=True).parse(DOCUMENT) == parse_vnext(DOCUMENT, lean=True)
+
+    def test_errors_have_full_text_positions(self):
+        parser = IncrementalParser()
+        parser.parse(DOCUMENT)
+        broken = DOCUMENT.replace("10 Push_ups", "10 Push_ups @@")
+        with pytest.raises(WODCraftError) as exc:
+            parser.parse(broken)
+        with pytest.raises(WODCraftError) as full:
+            parse_vnext(broken)
+        assert str(exc.value) == str(full.value) and exc.value.line == 6
+        # Blocks cached before the error are still reused afterwards
+        parser.parse(DOCUMENT)
+        assert parser.stats()["reused"] == 4
+        assert parser.stats()["full_parses"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test suite for streamed / compact / JSON-lines output
+"""
+
+import io
+import json
+
+import pytest
+
+from src.wodcraft import jsonio
+from src.wodcraft.core import InMemoryResolver, SessionCompiler, parse_vnext
+
+
+SESSION = '''session "Relay – Demo" {
+  components {}
+  scoring { wod AMRAP rounds+reps }
+  realized {
+    scoring: "amrap_reps",
+    unit: "event",
+    events: [
+      { at: "00:20", athlete: "ath#a", movement: "row_cal", value: 12 },
+      { at: "00:45", athlete: "ath#b", movement: "row_cal", value: 10 }
+    ]
+  }
+}
+module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }
+'''
+
+
+@pytest.fixture
+def ast():
+    return parse_vnext(SESSION)
+
+
+@pytest.fixture
+def compiled(ast):
+    return SessionCompiler(InMemoryResolver()).compile_session(ast["sessions"][0])
+
+
+class TestWriters:
+    """Test JSON writers"""
+
+    def test_streamed_pretty_output_is_unchanged(self, compiled, monkeypatch):
+        monkeypatch.setattr(jsonio, "CHUNK_SIZE", 16)
+        out = io.StringIO()
+        jsonio.write_json(compiled, out)
+        assert out.getvalue() == json.dumps(compiled, indent=2) + "\n"
+
+    @pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+    def test_compact_backends(self, ast, backend, monkeypatch):
+        if backend == "orjson" and jsonio._orjson is None:
+            pytest.skip("orjson not installed")
+        monkeypatch.setenv(jsonio.JSON_BACKEND_ENV, backend)
+        assert jsonio.backend_name() == backend
+        out = io.StringIO()
+        jsonio.write_json(ast, out, compact=True)
+        text = out.getvalue()
+        assert text.count("\n") == 1
+        assert json.loads(text) == ast
+
+    def test_export_json_compact(self, compiled):
+        compiler = SessionCompiler(InMemoryResolver())
+        text = compiler.export_json(compiled, compact=True)
+        assert "\n" not in text and json.loads(text) == compiled
+
+
+class TestRecords:
+    """Test JSON-lines splitting"""
+
+    def test_realized_events_get_their_own_records(self, compiled):
+        records = list(jsonio.iter_records(compiled))
+        assert [r["section"] for r in records] == ["session", "realized_event", "realized_event"]
+        assert records[0]["realized_events"] == 2
+        assert records[0]["node"]["realized"]["data"]["events"] == []
+        assert compiled["session"]["realized"]["data"]["events"]  # input untouched
+
+    @pytest.mark.parametrize("which", ["ast", "compiled"])
+    def test_round_trip(self, which, request):
+        document = request.getfixturevalue(which)
+        out = io.StringIO()
+        jsonio.write_jsonl(jsonio.iter_records(document), out)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert jsonio.merge_records(records) == json.loads(json.dumps(document))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
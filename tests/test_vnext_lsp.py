@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test suite for the language server behind `wodc lsp`
+"""
+
+import io
+import json
+
+import pytest
+
+from src.wodcraft.lsp import LanguageServer, MovementIndex, read_message, serve_lsp, write_message
+
+
+MODULE = 'module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }'
+URI = "file:///workspace/today.wod"
+TEXT = '''module wod.today v1 {
+  wod ForTime {
+    21 Thrusters @@
+    15 Pull_ups
+    9 Burpees @@
+  }
+}
+session "Today" { components { wod import wod.missing@v1 } scoring { wod ForTime time } }
+'''
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / "modules" / "wod").mkdir(parents=True)
+    (tmp_path / "modules" / "wod" / "fran.wod").write_text(MODULE)
+    server = LanguageServer(debounce=0.05)
+    server.handle({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {"rootUri": tmp_path.as_uri()}})
+    return server
+
+
+def _open(server, text, uri=URI):
+    server.handle({"jsonrpc": "2.0", "method": "textDocument/didOpen",
+                   "params": {"textDocument": {"uri": uri, "languageId": "wodcraft", "version": 1, "text": text}}})
+
+
+def _change(server, text, version=2, uri=URI):
+    server.handle({"jsonrpc": "2.0", "method": "textDocument/didChange",
+                   "params": {"textDocument": {"uri": uri, "version": version}, "contentChanges": [{"text": text}]}})
+
+
+def _complete(server, line, character, uri=URI):
+    response = server.handle({"jsonrpc": "2.0", "id": 9, "method": "textDocument/completion",
+                              "params": {"textDocument": {"uri": uri}, "position": {"line": line, "character": character}}})
+    return response["result"]
+
+
+class TestDiagnostics:
+    """Test diagnostics publishing"""
+
+    def test_all_syntax_errors_and_session_errors(self, server):
+        _open(server, TEXT)
+        [message] = server.flush()
+        assert message["method"] == "textDocument/publishDiagnostics"
+        diagnostics = message["params"]["diagnostics"]
+        assert [(d["code"], d["range"]["start"]["line"]) for d in diagnostics] == [
+            ("syntax", 2), ("syntax", 4), ("compile", 7)]
+        assert "Module file not found" in diagnostics[2]["message"]
+
+    def test_error_on_closing_brace_keeps_following_blocks(self, server):
+        _open(server, "module wod.a v1 { wod ForTime { 21 Thrusters @ } }\n" + MODULE)
+        [message] = server.flush()
+        [diagnostic] = message["params"]["diagnostics"]
+        assert diagnostic["code"] == "syntax" and diagnostic["range"]["start"] == {"line": 0, "character": 47}
+        assert [m["id"] for m in server.documents[URI].ast["modules"]] == ["wod.a", "wod.fran"]
+
+    def test_columns_are_utf16(self, server):
+        _open(server, 'module warmup.a v1 { warmup "🔥🔥" { block "Row" { 500m Row @@ } } }')
+        [diagnostic] = server.flush()[0]["params"]["diagnostics"]
+        assert diagnostic["range"]["start"]["character"] == 61  # code point 59, after two surrogate pairs
+
+    def test_changes_are_debounced_and_unchanged_results_not_republished(self, server):
+        _open(server, MODULE)
+        assert server.flush()[0]["params"]["diagnostics"] == []
+        _change(server, MODULE.replace("21 Pull_ups", "21 Pull_ups @@"))
+        _change(server, MODULE.replace("21 Pull_ups", "21 Pull_ups @@ "), version=3)
+        assert server.flush() == []  # still within the debounce window
+        due = server.next_due()
+        [message] = server.flush(now=due)
+        assert message["params"]["version"] == 3 and len(message["params"]["diagnostics"]) == 1
+        _change(server, MODULE.replace("21 Pull_ups", "21 Pull_ups @@"), version=4)
+        assert server.flush(force=True) == []  # same diagnostics as before
+
+    def test_close_clears_diagnostics(self, server):
+        _open(server, TEXT)
+        server.flush()
+        server.handle({"jsonrpc": "2.0", "method": "textDocument/didClose", "params": {"textDocument": {"uri": URI}}})
+        assert server.flush() == [{"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics",
+                                   "params": {"uri": URI, "diagnostics": []}}]
+        assert server.documents == {}
+
+
+class TestCompletion:
+    """Test completion from the in-memory indexes"""
+
+    def test_movements(self, server):
+        _open(server, "module wod.x v1 {\n  wod ForTime {\n    10 Pull\n  }\n}")
+        result = _complete(server, 2, 11)
+        labels = [item["label"] for item in result["items"]]
+        assert "Pull Ups" in labels
+        assert all(item["insertText"] for item in result["items"])
+
+    def test_module_refs_from_disk_and_open_documents(self, server):
+        _open(server, 'session "S" { components { wod import wod.', uri="file:///workspace/s.wod")
+        _open(server, "module wod.local v2 { wod ForTime { 5 Burpees } }", uri="file:///workspace/m.wod")
+        server.flush(force=True)
+        result = _complete(server, 0, 44, uri="file:///workspace/s.wod")
+        assert [item["label"] for item in result["items"]] == ["wod.fran@v1", "wod.local@v2"]
+
+    def test_missing_catalog_falls_back_to_the_bundled_one(self, tmp_path):
+        log = io.StringIO()
+        server = LanguageServer(catalog_path="missing.json", log=log)
+        server.handle({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {"rootUri": tmp_path.as_uri()}})
+        assert server.movements().movements > 0
+        assert f"no movements in {tmp_path / 'missing.json'}, using the bundled catalog" in log.getvalue()
+
+    def test_prefix_index(self):
+        index = MovementIndex()
+        items, truncated = index.complete("du")
+        assert any(item["insertText"] == "double_unders" for item in items) and not truncated
+        items, truncated = index.complete("", limit=5)
+        assert len(items) == 5 and truncated
+
+
+class TestServe:
+    """Test the stdio loop and instrumentation"""
+
+    def test_round_trip(self, server):
+        stdin = io.BytesIO()
+        for message in [
+            {"jsonrpc": "2.0", "method": "textDocument/didOpen",
+             "params": {"textDocument": {"uri": URI, "version": 1, "text": TEXT}}},
+            {"jsonrpc": "2.0", "id": 1, "method": "wodcraft/stats"},
+            {"jsonrpc": "2.0", "id": 2, "method": "nope"},
+            {"jsonrpc": "2.0", "id": 3, "method": "shutdown"},
+            {"jsonrpc": "2.0", "method": "exit"},
+        ]:
+            write_message(stdin, message)
+        stdin.seek(0)
+        stdout = io.BytesIO()
+        assert serve_lsp(server, stdin, stdout) == 0
+        stdout.seek(0)
+        messages = []
+        while True:
+            message = read_message(stdout)
+            if message is None:
+                break
+            messages.append(message)
+        assert messages[0]["method"] == "textDocument/publishDiagnostics"
+        stats = messages[1]["result"]
+        assert stats["latency"]["diagnostics"]["count"] == 1
+        assert stats["latency"]["textDocument/didOpen"]["p99_ms"] is not None
+        assert messages[2]["error"]["code"] == -32601
+        assert messages[3] == {"jsonrpc": "2.0", "id": 3, "result": None}
+        json.dumps(messages)  # everything is JSON-serializable
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
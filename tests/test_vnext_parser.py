@@ -5,7 +5,14 @@ Test suite for WODCraft vNext parser and grammar
 
 import pytest
 import json
-from src.wodcraft.core import parse_vnext, ToASTvNext, ModuleRef, InMemoryResolver, FileSystemResolver, WODCraftError
+from concurrent.futures import ThreadPoolExecutor
+from src.wodcraft.core import (
+    parse_vnext, ToASTvNext, ModuleRef, InMemoryResolver, FileSystemResolver, WODCraftError,
+    PARSER_REGISTRY, ParserRegistry, SessionCompiler, GRAMMAR_VNEXT,
+    save_parser_artifact, load_parser_artifact, raw_text, StringTable, STRING_TABLE, MOVEMENTS_CATALOG_PATH,
+    parse_vnext_recover, GRAMMAR_LEGACY, get_parser, parse_legacy, profile_parsing, ParseProfile,
+)
+from lark import Lark
 from pathlib import Path
 
 
@@ -315,5 +322,365 @@ class TestTransformerMethods:
         assert result == {"version": "v2.1"}
 
 
+class TestParserRegistry:
+    """Test the process-wide parser registry"""
+
+    def test_parse_reuses_shared_parser(self):
+        """Repeated parses must not rebuild the grammar"""
+        parse_vnext('module a.b v1 { wod AMRAP 5:00 { 10 Air_Squats } }')
+        before = PARSER_REGISTRY.stats()
+        before = before["grammar_builds"] + before["artifact_loads"]
+        for _ in range(3):
+            parse_vnext('module a.b v1 { wod AMRAP 5:00 { 10 Air_Squats } }')
+        SessionCompiler(InMemoryResolver())
+        stats = PARSER_REGISTRY.stats()
+        assert stats["grammar_builds"] + stats["artifact_loads"] == before
+        assert stats["cache_hits"] >= 4
+
+    def test_concurrent_first_use_builds_once(self):
+        """Concurrent callers share a single grammar build"""
+        registry = ParserRegistry(artifact_path=None)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            parsers = list(pool.map(lambda _: registry.get(), range(16)))
+        assert all(p is parsers[0] for p in parsers)
+        assert registry.stats()["grammar_builds"] == 1
+        assert registry.stats()["cache_hits"] == 15
+
+    def test_options_are_part_of_the_key(self):
+        """Different parser options yield distinct parsers"""
+        registry = ParserRegistry(artifact_path=None)
+        lalr = registry.get()
+        earley = registry.get(parser="earley")
+        assert lalr is not earley
+        assert registry.stats()["parsers"] == 2
+
+
+class TestParserArtifact:
+    """Test the pre-serialized parser artifact"""
+
+    SOURCE = 'module a.b v1 { wod AMRAP 5:00 { 10 Air_Squats @43kg/30kg } }'
+
+    def test_artifact_round_trip(self, tmp_path):
+        """A registry backed by a fresh artifact skips the grammar build"""
+        path = save_parser_artifact(tmp_path / "grammar.lalr")
+        registry = ParserRegistry(artifact_path=path)
+        parser = registry.get()
+        stats = registry.stats()
+        assert stats["artifact_loads"] == 1
+        assert stats["grammar_builds"] == 0
+        assert registry.origin()["source"] == "artifact"
+        expected = ToASTvNext().transform(Lark(GRAMMAR_VNEXT, parser="lalr").parse(self.SOURCE))
+        assert ToASTvNext().transform(parser.parse(self.SOURCE)) == expected
+
+    def test_stale_artifact_falls_back_to_grammar(self, tmp_path):
+        """An artifact built from another grammar is ignored"""
+        path = save_parser_artifact(tmp_path / "grammar.lalr", grammar='start: "a"')
+        parser, status = load_parser_artifact(GRAMMAR_VNEXT, path)
+        assert parser is None and status == "stale"
+
+        registry = ParserRegistry(artifact_path=path)
+        registry.get()
+        assert registry.stats()["grammar_builds"] == 1
+        assert registry.origin() == {**registry.origin(), "source": "grammar", "artifact_status": "stale"}
+
+    def test_missing_and_corrupt_artifacts(self, tmp_path):
+        """Missing or corrupt artifacts are reported, never raised"""
+        assert load_parser_artifact(GRAMMAR_VNEXT, tmp_path / "nope.lalr") == (None, "missing")
+        corrupt = tmp_path / "corrupt.lalr"
+        corrupt.write_bytes(b"not a pickle")
+        assert load_parser_artifact(GRAMMAR_VNEXT, corrupt) == (None, "unreadable")
+
+
+class TestLegacyGrammar:
+    """Test the legacy grammar split out of the hot grammar"""
+
+    def test_hot_grammar_has_no_legacy_rules(self):
+        """The core grammar compiles to the same lexer as before the split"""
+        for name in ("legacy_wod", "legacy_block", "workmode", "partition", "tiebreak", "track_block",
+                     "LOADDUAL", "REPDUAL", "TIMEQ"):
+            assert f"{name}:" not in GRAMMAR_VNEXT and f"{name}:" in GRAMMAR_LEGACY
+        combined = Lark(GRAMMAR_VNEXT + GRAMMAR_LEGACY, parser="lalr")
+        assert {t.name for t in get_parser().terminals} == {t.name for t in combined.terminals}
+
+    def test_parse_legacy(self):
+        """Legacy syntax parses to a generic tree"""
+        tree = parse_legacy('WOD "Fran"\nCAP 10:00\nBLOCK FT {\n21 thrusters @43kg\n21 pull_ups\n}\n')
+        assert tree["type"] == "legacy_wod"
+        title, cap, block = tree["children"]
+        assert title == {"type": "title", "children": ['"Fran"']}
+        assert [c["type"] for c in block["children"]] == ["block_head", "line", "line"]
+        assert block["children"][1]["children"][2] == {"type": "load", "children": ["43kg"]}
+
+    def test_legacy_errors(self):
+        with pytest.raises(WODCraftError) as exc:
+            parse_legacy('WOD "Fran"\nBLOCK FT {\n21 thrusters @@\n}\n')
+        assert (exc.value.line, exc.value.column) == (3, 15)
+
+
+class TestSinglePassParse:
+    """Test the inline (tree-less) transformer mode"""
+
+    ROOT = Path(__file__).resolve().parents[1]
+
+    @pytest.mark.parametrize("relpath", [
+        "examples/wods/girls/fran.wod",
+        "examples/wods/heroes/dt.wod",
+        "examples/language/team_realized_session.wod",
+        "examples/language/programming_plan.wod",
+        "modules/skill/snatch_technique.wod",
+        "modules/warmup/full_body_10m.wod",
+        "sessions/tuesday_moderate.wod",
+    ])
+    def test_matches_two_pass_output(self, relpath):
+        """Single-pass AST is identical to the two-pass AST"""
+        text = (self.ROOT / relpath).read_text()
+        expected = parse_vnext(text)
+        actual = parse_vnext(text, single_pass=True)
+        assert json.dumps(actual, sort_keys=True) == json.dumps(expected, sort_keys=True)
+
+    def test_errors_keep_line_and_column(self):
+        """Syntax errors carry the same location in both modes"""
+        source = 'module a v1 {\n  wod ForTime {\n    20 Push_ups #\n  }\n}'
+        with pytest.raises(WODCraftError) as two_pass:
+            parse_vnext(source)
+        with pytest.raises(WODCraftError) as single_pass:
+            parse_vnext(source, single_pass=True)
+        assert (single_pass.value.line, single_pass.value.column) == (two_pass.value.line, two_pass.value.column)
+        assert str(single_pass.value) == str(two_pass.value)
+
+
+class TestLeanParse:
+    """Test the lean AST mode"""
+
+    ROOT = Path(__file__).resolve().parents[1]
+    SOURCE = """module wod.lean v1 {
+  wod AMRAP 12:00 {
+    20/16 cal Row
+    15m Farmer_Carry PROGRESS("+15m/round") @24kg/16kg
+    10 Kettlebell_Swings @RX(M:24kg, F:16kg)
+    5 Deadlift @100.0kg
+    REST 2:00
+  }
+}"""
+
+    def _movements(self, ast):
+        body = ast["modules"][0]["body"]["children"][0]
+        return body["children"][0]["movements"]
+
+    def test_drops_derivable_fields(self):
+        full = self._movements(parse_vnext(self.SOURCE))
+        lean = self._movements(parse_vnext(self.SOURCE, lean=True))
+        assert [line.keys() - {"children"} for line in full[:4]] == [line.keys() for line in lean[:4]]
+        assert [line.get("movement") for line in full] == [line.get("movement") for line in lean]
+        assert lean[0]["quantity"] == full[0]["quantity"]
+        assert "raw" not in lean[1]["load"] and "raw" not in lean[2]["load"]
+        assert lean[4] == {"type": "REST", "duration": full[4]["duration"], "seconds": 120}
+
+    def test_raw_text_recomputes_dropped_raw(self):
+        full = self._movements(parse_vnext(self.SOURCE))
+        lean = self._movements(parse_vnext(self.SOURCE, lean=True))
+        for full_line, lean_line in zip(full[1:4], lean[1:4]):
+            assert raw_text(lean_line["load"]) == full_line["load"]["raw"]
+        assert raw_text(lean[4]) == full[4]["raw"]
+        # "100.0kg" cannot be rebuilt from value/unit ("100kg"), so it is kept
+        assert lean[3]["load"]["raw"] == "100.0kg"
+
+    @pytest.mark.parametrize("relpath", [
+        "examples/wods/girls/fran.wod",
+        "examples/language/team_realized_session.wod",
+        "modules/warmup/full_body_10m.wod",
+        "sessions/tuesday_moderate.wod",
+    ])
+    def test_single_pass_and_size(self, relpath):
+        text = (self.ROOT / relpath).read_text()
+        lean = parse_vnext(text, lean=True)
+        assert parse_vnext(text, lean=True, single_pass=True) == lean
+        assert len(json.dumps(lean)) <= len(json.dumps(parse_vnext(text)))
+
+    def test_compiles_like_full_ast(self):
+        text = (self.ROOT / "examples/language/team_realized_session.wod").read_text()
+        compiler = SessionCompiler(FileSystemResolver(self.ROOT / "modules"))
+        full = compiler.compile_session(parse_vnext(text)["sessions"][0])
+        lean = compiler.compile_session(parse_vnext(text, lean=True)["sessions"][0])
+        assert lean == full
+
+
+class TestErrorRecovery:
+    """Test the error-recovering parse (every syntax error in one pass)"""
+
+    ROOT = Path(__file__).resolve().parents[1]
+    BROKEN = """module wod.a v1 {
+  wod ForTime {
+    20 Push_ups @@
+    10 Pull_ups
+    ??? x
+    5 Air_Squats
+  }
+}
+module wod.b v1 {
+  wod ForTim3 $ {
+    10 Burpees
+  }
+}
+session "S" {
+  components { wod import wod.a@v1 }
+  scoring { wod ForTime time }
+}"""
+
+    def _movements(self, module):
+        return [line["movement"] for line in module["body"]["children"][0]["children"][0]["movements"]]
+
+    def test_valid_input_matches_parse(self):
+        for relpath in ["examples/wods/girls/fran.wod", "examples/language/team_realized_session.wod"]:
+            text = (self.ROOT / relpath).read_text()
+            assert parse_vnext_recover(text) == (parse_vnext(text), [])
+
+    def test_reports_every_error_once(self):
+        _, errors = parse_vnext_recover(self.BROKEN)
+        assert [(e.line, e.column) for e in errors] == [(3, 18), (5, 5), (10, 15)]
+        assert errors[0].suggestion == "Expected an identifier (e.g., Movement_Name)"
+        assert "> 20 Push_ups @@" in str(errors[0])
+
+    def test_first_error_matches_parse_vnext(self):
+        with pytest.raises(WODCraftError) as exc:
+            parse_vnext(self.BROKEN)
+        first = parse_vnext_recover(self.BROKEN)[1][0]
+        assert str(first) == str(exc.value)
+
+    def test_keeps_what_parsed(self):
+        ast, _ = parse_vnext_recover(self.BROKEN)
+        assert [m["id"] for m in ast["modules"]] == ["wod.a", "wod.b"]
+        # Broken lines (and the block opened by a broken header) are dropped
+        assert self._movements(ast["modules"][0]) == ["Pull_ups", "Air_Squats"]
+        assert [s["title"] for s in ast["sessions"]] == ["S"]
+
+    def test_unclosed_blocks_and_stray_braces(self):
+        ast, errors = parse_vnext_recover("module wod.a v1 {\n  wod ForTime {\n    20 Push_ups\n")
+        assert self._movements(ast["modules"][0]) == ["Push_ups"]
+        assert len(errors) == 1 and errors[0].line == 3
+
+        ast, errors = parse_vnext_recover(
+            "module wod.a v1 { wod ForTime { 20 Push_ups } } }\nmodule wod.b v1 { wod ForTime { 5 Burpees } }")
+        assert [m["id"] for m in ast["modules"]] == ["wod.a", "wod.b"]
+        assert [(e.line, e.column) for e in errors] == [(1, 49)]
+
+    def test_error_on_closing_brace(self):
+        valid = "module wod.b v1 { wod ForTime { 21 Thrusters } }\n"
+        for broken, kept in [
+            ("module wod.a v1 { wod ForTime { 21 Thrusters @ } }\n", ["wod.a", "wod.b"]),
+            ("module wod.a v1 {\n  wod ForTime {\n    21 Thrusters @\n  }\n}\n", ["wod.a", "wod.b"]),
+            ('session "S" { components { wod import } }\n', ["wod.b"]),
+        ]:
+            ast, errors = parse_vnext_recover(broken + valid)
+            assert [m["id"] for m in ast["modules"]] == kept
+            assert len(errors) == 1 and "'}'" in str(errors[0])
+
+    def test_max_errors(self):
+        text = "module wod.a v1 {\n wod ForTime {\n" + "".join(f" {i} A @@\n" for i in range(1, 6)) + " }\n}"
+        assert len(parse_vnext_recover(text)[1]) == 5
+        assert [e.line for e in parse_vnext_recover(text, max_errors=2)[1]] == [3, 4]
+
+
+class TestParseProfile:
+    """Test per-phase and per-method parse profiling"""
+
+    SOURCE = 'module a.b v1 { wod AMRAP 12:00 { 10 Air_Squats @43kg/30kg 200m Run 5 Burpees } }'
+
+    def test_same_ast_and_counts(self):
+        with profile_parsing() as profile:
+            ast = parse_vnext(self.SOURCE)
+            lean = parse_vnext(self.SOURCE, lean=True, single_pass=True)
+        assert ast == parse_vnext(self.SOURCE)
+        assert lean == parse_vnext(self.SOURCE, lean=True)
+        report = profile.as_dict()
+        assert report["files"] == 2
+        assert {name: phase["calls"] for name, phase in report["phases"].items()} == {
+            "grammar": 2, "lex": 2, "parse": 2, "transform": 2}
+        calls = {method["name"]: method["calls"] for method in report["methods"]}
+        assert calls["movement_line"] == 6 and calls["_quantity_to_dict"] >= 6
+        assert "movement_line" in profile.format_table()
+
+    def test_errors_match_unprofiled_parse(self):
+        for source in ('module a.b v1 { wod ForTime { 5 x @@ } }', 'module a.b v1 { wod ForTime { 5 Burpees }'):
+            with pytest.raises(WODCraftError) as plain:
+                parse_vnext(source)
+            with profile_parsing(), pytest.raises(WODCraftError) as profiled:
+                parse_vnext(source)
+            assert str(profiled.value) == str(plain.value)
+
+    def test_profile_is_scoped(self):
+        profile = ParseProfile()
+        with profile_parsing(profile):
+            with profile_parsing() as inner:
+                parse_vnext(self.SOURCE)
+            parse_vnext(self.SOURCE)
+        parse_vnext(self.SOURCE)
+        assert (profile.files, inner.files) == (1, 1)
+
+
+class TestStringTable:
+    """Test string interning in the AST transformer"""
+
+    SOURCE = 'module wod.a v1 {{ wod ForTime {{ {n} Pull_ups @24kg {n} Thrusters @43kg/30kg }} }}'
+
+    def _lines(self, ast):
+        return ast["modules"][0]["body"]["children"][0]["children"][0]["movements"]
+
+    def test_parses_share_strings(self):
+        first = self._lines(parse_vnext(self.SOURCE.format(n=21)))
+        second = self._lines(parse_vnext(self.SOURCE.format(n=15), single_pass=True))
+        assert first[0]["movement"] is second[0]["movement"]
+        assert first[0]["load"]["unit"] is second[0]["load"]["unit"]
+        assert first[0]["children"][0]["type"] is second[0]["children"][0]["type"]
+
+    def test_stats_count_deduplicated_strings(self):
+        table = StringTable()
+        first = "".join(["Pull", "_ups"])
+        second = "".join(["Pull", "_ups"])
+        assert first is not second
+        assert table.intern(first) is first
+        assert table.intern(second) is first
+        assert table.stats() == {"strings": 1, "lookups": 2, "deduplicated": 1, "seeded": 0,
+                                 "max_length": 64, "max_size": 100_000}
+
+    def test_concurrent_interning_keeps_one_instance(self):
+        table = StringTable()
+        values = ["".join(["Move", str(i % 50)]) for i in range(4000)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            interned = list(pool.map(table.intern, values))
+        for value, canonical in zip(values, interned):
+            assert canonical is table.intern(value)
+        stats = table.stats()
+        assert stats["strings"] == 50 and stats["lookups"] == 8000
+
+    def test_table_is_bounded(self):
+        table = StringTable(max_length=4, max_size=2)
+        table.intern("a long note")
+        table.intern("kg")
+        table.intern("lb")
+        table.intern("m")
+        assert table.stats()["strings"] == 2
+
+    def test_catalog_ships_with_the_package(self):
+        assert MOVEMENTS_CATALOG_PATH.parent == Path(__file__).resolve().parents[1] / "src" / "wodcraft"
+        repo_copy = Path(__file__).resolve().parents[1] / "data" / "movements_catalog.json"
+        assert MOVEMENTS_CATALOG_PATH.read_text(encoding="utf-8") == repo_copy.read_text(encoding="utf-8")
+
+    def test_seed_from_catalog(self):
+        table = StringTable()
+        assert table.seed_from_catalog() > 0
+        assert table.seed_from_catalog() == 0
+        assert table.intern("".join(["Thrus", "ters"])) is not None
+        assert table.stats()["deduplicated"] == 1
+        assert StringTable().seed_from_catalog("missing.json") == 0
+
+    def test_parser_info_reports_interning(self):
+        from src.wodcraft.core import parser_info
+        before = STRING_TABLE.stats()["deduplicated"]
+        parse_vnext(self.SOURCE.format(n=9))
+        parse_vnext(self.SOURCE.format(n=9))
+        assert parser_info()["interning"]["deduplicated"] > before
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
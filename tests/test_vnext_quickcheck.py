@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test suite for the fast pre-check behind `wodc validate --fast`
+"""
+
+import glob
+import random
+from pathlib import Path
+
+import pytest
+
+from src.wodcraft import sdk
+from src.wodcraft.batch import check_file
+from src.wodcraft.core import WODCraftError, parse_vnext
+from src.wodcraft.quickcheck import quick_check
+
+ROOT = Path(__file__).resolve().parents[1]
+MODULE = 'module wod.fran v1 {\n  wod ForTime {\n    21 Thrusters @43kg/30kg\n    21 Pull_ups\n  }\n}\n'
+
+
+def _parses(text):
+    try:
+        parse_vnext(text)
+        return True
+    except WODCraftError:
+        return False
+
+
+def _corpus():
+    for name in sorted(glob.glob(str(ROOT / "**/*.wod"), recursive=True)):
+        yield Path(name).name, Path(name).read_text(encoding="utf-8")
+
+
+class TestQuickCheck:
+    """Test what the pre-check rejects, and that it never rejects valid input"""
+
+    @pytest.mark.parametrize("name,text", list(_corpus()))
+    def test_never_rejects_parseable_files(self, name, text):
+        if _parses(text):
+            assert quick_check(text) is None
+
+    def test_chat_text(self):
+        error = quick_check(f"Sure! Here is your workout:\n```\n{MODULE}```")
+        assert (error.line, error.column) == (1, 1)
+        assert "Sure!" in str(error) and "top-level block" in error.suggestion
+
+    def test_unclosed_brace(self):
+        error = quick_check(MODULE.rstrip()[:-1])
+        assert "never closed" in str(error) and error.line == 5
+
+    def test_stray_closing_brace(self):
+        error = quick_check(MODULE + "}\n")
+        assert (error.line, error.column) == (7, 1) and "'}'" in str(error)
+
+    def test_characters_outside_the_grammar(self):
+        error = quick_check(MODULE.replace("21 Pull_ups", "21 Pull_ups #rx"))
+        assert (error.line, error.column) == (4, 17)
+        error = quick_check(MODULE.replace("wod ForTime", 'wod ForTime "oops'))
+        assert "Unterminated string" in error.suggestion
+
+    def test_text_between_blocks(self):
+        error = quick_check(MODULE + "then rest 2 minutes\n" + MODULE)
+        assert error.line == 7 and "then" in str(error)
+
+    def test_mutations_are_rejected_only_when_the_parser_rejects_them(self):
+        rng = random.Random(7)
+        texts = [text for _, text in _corpus() if text.strip() and _parses(text)]
+        caught = 0
+        for _ in range(300):
+            text = rng.choice(texts)
+            i = rng.randrange(len(text))
+            mutant = text[:i] + rng.choice(["{", "}", '"', "#", "@", "x", "\n", ""]) + text[i + rng.randrange(2):]
+            if quick_check(mutant) is not None:
+                assert not _parses(mutant), mutant
+                caught += 1
+        assert caught > 0
+
+
+class TestFastValidate:
+    """Test the SDK and batch entry points"""
+
+    def test_sdk(self):
+        assert sdk.quick_check(MODULE) == (True, None)
+        ok, err = sdk.quick_check("hello")
+        assert not ok and "Syntax error" in err
+
+    def test_batch_record(self, tmp_path):
+        path = tmp_path / "notes.wod"
+        path.write_text("Warm-up: 5 min row\n")
+        record = check_file(str(path), fast=True)
+        assert record["status"] == "invalid" and record["error"]["line"] == 1
+        path.write_text(MODULE)
+        assert check_file(str(path), fast=True)["status"] == "valid"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
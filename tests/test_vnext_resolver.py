@@ -209,6 +209,63 @@ class TestFileSystemResolver:
             assert "warmup.mobility.shoulder" in resolved.source
 
 
+class TestModuleIndex:
+    """Test the version-aware index behind FileSystemResolver"""
+
+    V1 = 'module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg } }\n'
+    V2 = 'module wod.fran v2 { wod ForTime { 21 Thrusters @50kg/35kg } }\n'
+
+    def _resolver(self, tmp_path, text):
+        (tmp_path / "wod").mkdir(exist_ok=True)
+        (tmp_path / "wod" / "fran.wod").write_text(text)
+        return FileSystemResolver(tmp_path)
+
+    def test_versions_in_one_file(self, tmp_path):
+        """Test that every module block of a file is a distinct version"""
+        resolver = self._resolver(tmp_path, self.V1 + "\n" + self.V2)
+        assert "43kg" in resolver.resolve(ModuleRef("wod", "fran", "v1")).source
+        v2 = resolver.resolve(ModuleRef("wod", "fran", "v2"))
+        assert "50kg" in v2.source and "v1" not in v2.source
+        entry = resolver.index.entries["wod.fran@v2"]
+        assert (entry.path, entry.offset) == (str(tmp_path / "wod" / "fran.wod"), len(self.V1) + 1)
+        assert entry.content_hash == v2.content_hash
+
+    def test_unknown_version_lists_available_ones(self, tmp_path):
+        """Test that a missing version is an error listing the known versions"""
+        resolver = self._resolver(tmp_path, self.V2)
+        with pytest.raises(ValueError, match=r"wod.fran@v1 \(available: v2\)"):
+            resolver.resolve(ModuleRef("wod", "fran"))
+
+    def test_list_does_not_read_files(self, tmp_path):
+        """Test that list() answers from the index without reading files"""
+        resolver = self._resolver(tmp_path, self.V1 + self.V2)
+        assert [ref.full_name for ref in resolver.list()] == ["wod.fran@v1", "wod.fran@v2"]
+        reads = resolver.index.files_read
+        resolver.list()
+        resolver.resolve(ModuleRef("wod", "fran", "v2"))
+        assert resolver.index.files_read == reads == 1
+
+    def test_refresh_picks_up_added_and_removed_files(self, tmp_path):
+        """Test that only directories with a new mtime are reindexed"""
+        resolver = self._resolver(tmp_path, self.V1)
+        resolver.list()
+        (tmp_path / "warmup").mkdir()
+        (tmp_path / "warmup" / "easy.wod").write_text("module warmup.easy v1 {}")
+        assert resolver.resolve(ModuleRef("warmup", "easy")).source == "module warmup.easy v1 {}"
+        assert resolver.index.files_read == 2  # fran.wod was not read again
+        (tmp_path / "wod" / "fran.wod").unlink()
+        assert [ref.full_name for ref in resolver.list()] == ["warmup.easy@v1"]
+
+    def test_wod_file_wins_over_wodcraft(self, tmp_path):
+        """Test that name.wod is preferred over name.wodcraft for the same version"""
+        resolver = self._resolver(tmp_path, self.V1)
+        (tmp_path / "wod" / "fran.wodcraft").write_text(self.V1.replace("43kg", "40kg"))
+        assert "43kg" in resolver.resolve(ModuleRef("wod", "fran")).source
+        (tmp_path / "wod" / "fran.wod").unlink()
+        resolver.index.refresh()
+        assert "40kg" in resolver.resolve(ModuleRef("wod", "fran")).source
+
+
 class TestResolvedModule:
     """Test ResolvedModule functionality"""
     
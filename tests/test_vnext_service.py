@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test suite for the JSON-lines worker behind `wodc serve`
+"""
+
+import io
+import json
+
+import pytest
+
+from src.wodcraft.service import Worker, serve
+
+
+MODULE = 'module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }'
+SESSION = 'session "A" { components { wod import wod.fran@v1 } scoring { wod none } }'
+
+
+@pytest.fixture
+def modules_dir(tmp_path):
+    (tmp_path / "wod").mkdir()
+    (tmp_path / "wod" / "fran.wod").write_text(MODULE)
+    return tmp_path
+
+
+def _serve(worker, *requests):
+    lines = [r if isinstance(r, str) else json.dumps(r) for r in requests]
+    out = io.StringIO()
+    serve(worker, io.StringIO("\n".join(lines) + "\n"), out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestWorker:
+    """Test request dispatch"""
+
+    def test_parse_and_validate(self):
+        worker = Worker()
+        parsed = worker.handle({"id": 1, "method": "parse", "params": {"text": MODULE}})
+        assert parsed["ok"] and parsed["id"] == 1
+        assert parsed["result"]["modules"][0]["id"] == "wod.fran"
+
+        invalid = worker.handle({"id": "b", "method": "validate", "params": {"text": "session {"}})
+        assert invalid["ok"] and invalid["result"]["valid"] is False
+        assert invalid["result"]["error"]["line"] == 1
+
+        params = {"text": "module wod.a v1 {\n wod ForTime {\n 1 A @@\n 2 B @@\n }\n}", "all_errors": True}
+        result = worker.handle({"id": 2, "method": "validate", "params": params})["result"]
+        assert result["valid"] is False
+        assert [e["line"] for e in result["errors"]] == [3, 4]
+
+    def test_errors_are_structured(self):
+        worker = Worker()
+        bad = worker.handle({"id": 2, "method": "parse", "params": {"text": "session {"}})
+        assert not bad["ok"]
+        assert bad["error"]["type"] == "WODCraftError"
+        assert (bad["error"]["line"], bad["error"]["column"]) == (1, 9)
+        assert bad["error"]["suggestion"]
+
+        unknown = worker.handle({"id": 3, "method": "nope"})
+        assert unknown["error"]["type"] == "UnknownMethod"
+        assert worker.errors == 2
+
+    def test_session_run_results_share_one_compiler(self, modules_dir):
+        worker = Worker(str(modules_dir))
+        params = {"text": SESSION}
+        session = worker.handle({"id": 1, "method": "session", "params": params})
+        assert session["ok"] and session["result"]["session"]["title"] == "A"
+        assert "timeline" in worker.handle({"id": 2, "method": "run", "params": params})["result"]
+        assert "results" in worker.handle({"id": 3, "method": "results", "params": params})["result"]
+
+        stats = worker.handle({"id": 4, "method": "stats"})["result"]
+        compiler_stats = stats["compilers"][str(modules_dir)]
+        assert compiler_stats["cache_misses"] == 1
+        assert compiler_stats["cache_hits"] == 2
+
+    def test_printed_output_becomes_warnings(self):
+        worker = Worker()
+        worker.handlers["parse"] = lambda params: print("WARNING: noisy") or {}
+        response = worker.handle({"id": 1, "method": "parse", "params": {}})
+        assert response["warnings"] == ["WARNING: noisy"]
+
+
+class TestServe:
+    """Test the stdin/stdout loop"""
+
+    def test_one_response_per_line_in_order(self, modules_dir):
+        responses = _serve(
+            Worker(str(modules_dir)),
+            {"id": 1, "method": "validate", "params": {"text": MODULE}},
+            "{not json",
+            {"id": 2, "method": "lint", "params": {"text": MODULE}},
+            {"id": 3, "method": "session", "params": {"text": SESSION, "format": "json"}},
+        )
+        assert [r["id"] for r in responses] == [1, None, 2, 3]
+        assert responses[1]["error"]["type"] == "InvalidJSON"
+        assert responses[2]["result"]["kind"] == "modules"
+        assert responses[3]["result"]["session"]["title"] == "A"
+
+    def test_shutdown_stops_the_loop(self):
+        responses = _serve(
+            Worker(),
+            {"id": 1, "method": "shutdown"},
+            {"id": 2, "method": "stats"},
+        )
+        assert responses == [{"id": 1, "ok": True, "result": {"shutdown": True}}]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test suite for the opt-in slotted (typed) AST
+"""
+
+import glob
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.wodcraft.core import WODCraftError, parse_vnext
+from src.wodcraft.typed_ast import (
+    ABSENT, Load, Module, MovementLine, Node, Program, Progression, Quantity, Rest, Session, Wod, to_typed,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+EVERY_NODE = '''
+module wod.every v1 {
+  notes: { stimulus: "Mixed" }
+  wod AMRAP 12:00 {
+    notes: ["Pace", "Breathe"]
+    20/16 cal Row
+    15m Farmer_Carry PROGRESS("+15m/round") @24kg/16kg
+    10 Kettlebell_Swings @RX(M:24kg, F:16kg)
+    5 Clean @bodyweight
+    MAXREP Pull_ups
+    REST 2:00
+  }
+}
+session "Relay" {
+  components { wod import wod.every@v1 }
+  scoring { wod AMRAP rounds+reps }
+  realized { events: [ { at: "00:20", athlete: "a", value: 12 } ] }
+}
+'''
+
+
+def _find(node, cls):
+    if isinstance(node, cls):
+        return node
+    children = node.children if isinstance(node, Node) else node if isinstance(node, tuple) else ()
+    for child in children:
+        found = _find(child, cls)
+        if found is not None:
+            return found
+    return None
+
+
+def _corpus():
+    for name in sorted(glob.glob(str(ROOT / "**" / "*.wod"), recursive=True)):
+        try:
+            yield Path(name).name, parse_vnext(Path(name).read_text(encoding="utf-8"))
+        except WODCraftError:
+            continue
+
+
+class TestLossless:
+    """to_dict() reproduces today's JSON exactly (values and key order)"""
+
+    @pytest.mark.parametrize("name,ast", list(_corpus()))
+    def test_corpus_round_trip(self, name, ast):
+        assert json.dumps(to_typed(ast).to_dict()) == json.dumps(ast)
+
+    def test_every_node_kind_round_trip(self):
+        ast = parse_vnext(EVERY_NODE)
+        typed = to_typed(ast)
+        assert json.dumps(typed.to_dict()) == json.dumps(ast)
+
+
+class TestTypedNodes:
+    """Test the typed node classes"""
+
+    def test_node_classes(self):
+        typed = to_typed(parse_vnext(EVERY_NODE))
+        assert isinstance(typed, Program) and typed.programming is ABSENT
+        module = typed.modules[0]
+        assert isinstance(module, Module) and module.id == "wod.every"
+        assert isinstance(typed.sessions[0], Session)
+
+        wod = _find(module.body, Wod)
+        assert wod.notes == ("Pace", "Breathe")
+        row, carry, swings, clean, maxrep, rest = wod.movements
+        assert all(isinstance(m, MovementLine) for m in (row, carry, swings, clean, maxrep))
+
+        assert row.quantity.kind == "calories" and row.quantity.per_gender["male"]["value"] == 20.0
+        assert carry.movement == "Farmer_Carry"
+        assert isinstance(carry.progression, Progression) and carry.progression.cadence == "round"
+        assert carry.progression.increment == {"value": 15.0, "unit": "m", "raw": "+15m"}
+        assert isinstance(carry.load, Load) and carry.load.type == "LOAD_DUAL"
+        assert swings.load.type == "LOAD_VARIANT" and swings.load.label == "RX"
+        assert clean.load.type == "LOAD_LITERAL"
+        assert isinstance(rest, Rest) and rest.seconds == 120
+        assert maxrep.quantity == Quantity("maxrep", None, None, None, None, "MAXREP", ("kind", "raw"))
+
+    def test_movement_name_is_not_stored_twice(self):
+        typed = to_typed(parse_vnext(EVERY_NODE))
+        line = _find(typed.modules[0].body, Wod).movements[1]
+        name = next(c for c in line.children if isinstance(c, Node) and c.type == "MOVEMENT_NAME")
+        assert not hasattr(name, "__dict__")
+        assert name.children == ("Farmer_Carry",) and name.name == "Farmer_Carry"
+
+    def test_movement_line_is_decoded_once(self, monkeypatch):
+        from src.wodcraft import typed_ast
+        line = _find(to_typed(parse_vnext(EVERY_NODE)).modules[0].body, Wod).movements[1]
+        calls = []
+        decode = typed_ast._HELPER.movement_line
+        monkeypatch.setattr(typed_ast._HELPER, "movement_line", lambda d: calls.append(1) or decode(d))
+        assert (line.movement, line.load.type, line.progression.cadence) == ("Farmer_Carry", "LOAD_DUAL", "round")
+        assert line.quantity.value == 15.0 and line.tempo is None and len(calls) == 1
+        assert line == MovementLine(line.children) and "_fields" not in repr(line)
+
+    def test_unknown_shapes_stay_plain(self):
+        odd = {"type": "MODULE", "id": "x", "extra": 1}
+        assert to_typed(odd) == odd
+        assert to_typed({"type": "WOD", "form": None, "movements": "not a list"})["type"] == "WOD"
+
+    def test_typed_form_is_smaller(self):
+        ast = parse_vnext(EVERY_NODE)
+
+        def size(obj, seen=None):
+            seen = set() if seen is None else seen
+            if id(obj) in seen:
+                return 0
+            seen.add(id(obj))
+            total = sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                total += sum(size(k, seen) + size(v, seen) for k, v in obj.items())
+            elif isinstance(obj, (list, tuple)):
+                total += sum(size(v, seen) for v in obj)
+            elif hasattr(obj, "__slots__"):
+                total += sum(size(getattr(obj, s), seen) for s in obj.__slots__)
+            return total
+
+        assert size(to_typed(ast)) < 0.8 * size(ast)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
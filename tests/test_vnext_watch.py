@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test suite for the module watcher behind `wodc watch`
+"""
+
+import os
+import time
+
+import pytest
+
+from src.wodcraft.core import FileSystemResolver, ModuleRef, SessionCompiler, parse_vnext
+from src.wodcraft.watch import InotifyWatcher, PollingWatcher, SessionWatch, make_watcher
+
+FRAN = 'module wod.fran v1 { wod ForTime { 21 Thrusters @43kg/30kg 21 Pull_ups } }\n'
+EASY = 'module warmup.easy v1 { warmup "Easy" { block "Row" { 500m Row } } }\n'
+SOURCE = '''session "Lundi" { components { wod import wod.fran@v1 } scoring { wod ForTime time } }
+session "Mardi" { components { warmup import warmup.easy@v1 } scoring { wod ForTime time } }
+'''
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "modules" / "wod").mkdir(parents=True)
+    (tmp_path / "modules" / "warmup").mkdir()
+    (tmp_path / "modules" / "wod" / "fran.wod").write_text(FRAN)
+    (tmp_path / "modules" / "warmup" / "easy.wod").write_text(EASY)
+    (tmp_path / "week.wod").write_text(SOURCE)
+    return tmp_path
+
+
+def _edit(path, text):
+    # Make sure the change is visible even on coarse mtime clocks
+    path.write_text(text)
+    stamp = time.time_ns() + 10_000_000
+    os.utime(path, ns=(stamp, stamp))
+
+
+class _Changes:
+    """Watcher double fed by the test"""
+
+    backend = "test"
+
+    def __init__(self):
+        self.pending = set()
+
+    def changes(self, timeout=None):
+        pending, self.pending = self.pending, set()
+        return pending
+
+    def close(self):
+        pass
+
+
+class TestInvalidation:
+    """Test resolver and compiler invalidation"""
+
+    def test_resolver_without_verify_does_not_see_edits_until_invalidated(self, tree):
+        resolver = FileSystemResolver(tree / "modules", verify=False)
+        ref = ModuleRef("wod", "fran")
+        before = resolver.resolve(ref)
+        path = tree / "modules" / "wod" / "fran.wod"
+        _edit(path, FRAN.replace("43kg", "50kg"))
+        assert resolver.resolve(ref) is before
+        changes = resolver.invalidate([path])
+        assert changes == {"wod.fran@v1": before.content_hash}
+        assert "50kg" in resolver.resolve(ref).source
+
+    def test_invalidate_reports_added_and_removed_modules(self, tree):
+        resolver = FileSystemResolver(tree / "modules", verify=False)
+        resolver.resolve(ModuleRef("wod", "fran"))
+        (tree / "modules" / "skill").mkdir()
+        (tree / "modules" / "skill" / "snatch.wod").write_text("module skill.snatch v1 {}")
+        (tree / "modules" / "warmup" / "easy.wod").unlink()
+        changes = resolver.invalidate([tree / "modules" / "skill", tree / "modules" / "warmup" / "easy.wod"])
+        assert changes["skill.snatch@v1"] is None and changes["warmup.easy@v1"] is not None
+        assert "wod.fran@v1" not in changes
+
+    def test_compiler_drops_only_dependent_sessions(self, tree):
+        resolver = FileSystemResolver(tree / "modules", verify=False)
+        compiler = SessionCompiler(resolver, cache_ttl=None)
+        sessions = parse_vnext(SOURCE)["sessions"]
+        compiler.compile_many(sessions)
+        fran = resolver.resolve(ModuleRef("wod", "fran"))
+        assert compiler.invalidate_modules({"wod.fran@v1": fran.content_hash}) == 1
+        assert compiler.get_cache_stats()["total_entries"] == 1
+        assert fran.content_hash not in compiler._module_cache
+
+
+class TestWatchers:
+    """Test change detection"""
+
+    def test_polling(self, tree):
+        watcher = PollingWatcher(tree / "modules", interval=0.01)
+        assert watcher.changes(timeout=0) == set()
+        path = tree / "modules" / "wod" / "fran.wod"
+        _edit(path, FRAN.replace("43kg", "50kg"))
+        (tree / "modules" / "warmup" / "easy.wod").unlink()
+        assert watcher.changes(timeout=1) == {str(path), str(tree / "modules" / "warmup" / "easy.wod")}
+
+    def test_inotify(self, tree):
+        try:
+            watcher = InotifyWatcher(tree / "modules", settle=0.01)
+        except (OSError, AttributeError, TypeError):
+            pytest.skip("inotify not available")
+        try:
+            assert watcher.changes(timeout=0) == set()
+            path = tree / "modules" / "wod" / "fran.wod"
+            path.write_text(FRAN.replace("43kg", "50kg"))
+            assert watcher.changes(timeout=1) == {str(path)}
+            (tree / "modules" / "skill").mkdir()
+            (tree / "modules" / "skill" / "snatch.wod").write_text("module skill.snatch v1 {}")
+            changed = watcher.changes(timeout=1)
+            assert str(tree / "modules" / "skill") in changed
+            (tree / "modules" / "skill" / "clean.wod").write_text("module skill.clean v1 {}")
+            assert str(tree / "modules" / "skill" / "clean.wod") in watcher.changes(timeout=1)
+        finally:
+            watcher.close()
+
+    def test_unknown_backend(self, tree):
+        with pytest.raises(ValueError, match="Unknown watch backend"):
+            make_watcher(tree, backend="fsevents")
+
+
+class TestSessionWatch:
+    """Test live recompilation"""
+
+    def test_recompiles_only_affected_sessions(self, tree):
+        changes = _Changes()
+        watch = SessionWatch([tree / "week.wod"], tree / "modules", watcher=changes)
+        assert [(r["title"], r["ok"]) for r in watch.start()] == [("Lundi", True), ("Mardi", True)]
+        assert watch.step() == []
+
+        path = tree / "modules" / "wod" / "fran.wod"
+        _edit(path, FRAN.replace("21 Pull_ups", "21 Pull_ups @@"))
+        changes.pending = {str(path)}
+        [record] = watch.step()
+        assert (record["file"], record["index"], record["ok"]) == (str(tree / "week.wod"), 0, False)
+
+        _edit(path, FRAN)
+        changes.pending = {str(path)}
+        [record] = watch.step()
+        assert record["ok"] and record["title"] == "Lundi"
+        assert watch.stats["modules_changed"] == 2
+
+    def test_edited_session_file_is_reloaded(self, tree):
+        watch = SessionWatch([tree / "week.wod"], tree / "modules", watcher=_Changes())
+        watch.start()
+        _edit(tree / "week.wod", SOURCE.replace("Mardi", "Mercredi"))
+        records = watch.step()
+        assert [r["title"] for r in records] == ["Lundi", "Mercredi"]
+        assert watch.compiler.get_cache_stats()["cache_hits"] == 1  # Lundi did not change
+        _edit(tree / "week.wod", "session {")
+        [record] = watch.step()
+        assert not record["ok"] and record["index"] is None
+
+    def test_text_report(self, tree, capsys):
+        from types import SimpleNamespace
+        from src.wodcraft.cli import _report_watch
+        error = {"type": "WODCraftError", "message": "Syntax error\nsession {"}
+        _report_watch([{"file": "week.wod", "index": 0, "title": "Lundi", "ok": True},
+                       {"file": "week.wod", "index": None, "title": None, "ok": False, "error": error}],
+                      SimpleNamespace(format="text"))
+        first, second = capsys.readouterr().out.splitlines()
+        assert first.endswith("✓ week.wod#0 (Lundi)")
+        assert second.endswith("✗ week.wod: Syntax error")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])